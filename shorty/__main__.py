@@ -1,16 +1,55 @@
 import logging
+from contextlib import asynccontextmanager
 
 import uvicorn
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
+from shorty.config import config
 from shorty.endpoints import routers
+from shorty.services.cache_invalidation import cache_invalidator
+from shorty.services.capacity import reservation_counter
+from shorty.services.click_ingestor import click_ingestor
+from shorty.services.hash_filter import hash_filter
+from shorty.services.hash_pool import hash_pool_refiller
+from shorty.services.partitions import redirect_partition_manager
+from shorty.services.rate_limit import rate_limiter
+from shorty.services.reaper import expiry_reaper
+from shorty.services.top_links import top_links_tracker
+from shorty.utils.enums import HashStrategy
 from shorty.utils.exceptions import BaseAPIException
 
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Shorty")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await redirect_partition_manager.start()
+    await cache_invalidator.start()
+    await rate_limiter.start()
+    if config.app.hash_filter_enabled:
+        await hash_filter.start()
+    await click_ingestor.start()
+    await top_links_tracker.start()
+    if config.app.hash_strategy == HashStrategy.pool:
+        await hash_pool_refiller.start()
+    await reservation_counter.start()
+    if config.app.reaper_in_process:
+        await expiry_reaper.start()
+    yield
+    await expiry_reaper.stop()
+    await reservation_counter.stop()
+    await hash_pool_refiller.stop()
+    await top_links_tracker.stop()
+    await click_ingestor.stop()
+    await hash_filter.stop()
+    await rate_limiter.stop()
+    await cache_invalidator.stop()
+    await redirect_partition_manager.stop()
+
+
+app = FastAPI(title="Shorty", lifespan=lifespan)
 
 app.include_router(routers)
 app.add_middleware(
@@ -24,12 +63,32 @@ app.add_middleware(
 
 @app.exception_handler(BaseAPIException)
 async def unicorn_exception_handler(request: Request, exc: BaseAPIException):
-    logger.error(str(exc))
+    # client errors such as scanners probing random hashes are not worth an
+    # error line each
+    if exc.status_code >= 500:
+        logger.error(str(exc))
+    else:
+        logger.debug(str(exc))
     return JSONResponse(
         status_code=exc.status_code,
         content={"message": exc.__repr__()},
+        headers=exc.headers,
+    )
+
+
+def run() -> None:
+    # an import string, so that uvicorn can import the app in every worker
+    uvicorn.run(
+        "shorty.__main__:app",
+        host=config.app.host,
+        port=config.app.port,
+        workers=config.app.workers,
+        loop=config.app.loop,
+        http=config.app.http,
+        proxy_headers=True,
+        forwarded_allow_ips=config.app.forwarded_allow_ips,
     )
 
 
 if __name__ == "__main__":
-    uvicorn.run(app, port=8000, host="0.0.0.0")
+    run()
@@ -1,11 +1,14 @@
 import os
 import time
 from typing import Literal
+from uuid import UUID
 
 from pydantic import SecretStr
 from pydantic_settings import BaseSettings as _BaseSettings
 from pydantic_settings import SettingsConfigDict
 
+from shorty.utils.enums import HashStrategy, PartitionInterval, RateLimitBackend
+
 os.environ["TZ"] = "UTC"
 time.tzset()
 
@@ -27,6 +30,77 @@ class APPConfig(BaseConfig, env_prefix="APP_"):
     secret_key: str
     access_token_expire: int
     refresh_token_expire: int
+    url_cache_size: int = 10000
+    url_cache_ttl: int = 60
+    redirect_batch_size: int = 500
+    redirect_batch_delay: float = 1.0
+    redirect_queue_size: int = 100000
+    redirect_drain_timeout: float = 10.0
+    geoip_path: str | None = None
+    click_dimension_cache_size: int = 10000
+    top_links_capacity: int = 1000
+    top_links_user_capacity: int = 50
+    top_links_max_users: int = 10000
+    top_links_snapshot_interval: float = 60.0
+    top_links_result_ttl: float = 1.0
+    statistic_max_buckets: int = 10000
+    export_batch_size: int = 1000
+    hash_strategy: HashStrategy = HashStrategy.pool
+    hash_pool_size: int = 10000
+    hash_pool_batch_size: int = 1000
+    hash_pool_refill_interval: float = 5.0
+    hash_counter_block_size: int = 1000
+    hash_counter_key: str | None = None
+    hash_counter_recheck_interval: float = 300.0
+    capacity_refresh_interval: float = 60.0
+    bulk_create_max_size: int = 1000
+    reaper_in_process: bool = False
+    reaper_interval: float = 60.0
+    reaper_batch_size: int = 500
+    reaper_batch_pause: float = 0.5
+    reaper_url_grace: int = 604800
+    reaper_redirect_retention: int = 0
+    redirect_partition_interval: PartitionInterval = PartitionInterval.month
+    redirect_partitions_ahead: int = 2
+    redirect_partition_check_interval: float = 3600.0
+    stateless_auth: bool = False
+    # json list of the user ids allowed to use /api/admin/
+    admin_user_ids: list[UUID] = []
+    user_cache_size: int = 10000
+    user_cache_ttl: int = 30
+    argon2_time_cost: int = 2
+    argon2_memory_cost: int = 102400
+    argon2_parallelism: int = 8
+    password_hash_workers: int = 2
+    password_hash_queue_size: int = 32
+    host: str = "0.0.0.0"
+    port: int = 8000
+    workers: int = 1
+    loop: Literal["auto", "asyncio", "uvloop"] = "auto"
+    http: Literal["auto", "h11", "httptools"] = "auto"
+    # comma separated proxy addresses whose X-Forwarded-For is trusted, "*"
+    # trusts any, needed for per client rate limits behind a proxy
+    forwarded_allow_ips: str = "127.0.0.1"
+    cache_invalidation_channel: str = "shorty_cache"
+    cache_listener_min_backoff: float = 0.5
+    cache_listener_max_backoff: float = 30.0
+    cache_listener_ping_interval: float = 10.0
+    hash_filter_enabled: bool = True
+    hash_filter_fp_rate: float = 0.01
+    hash_filter_min_capacity: int = 100000
+    hash_filter_rebuild_interval: float = 3600.0
+    hash_filter_batch_size: int = 10000
+    rate_limit_enabled: bool = True
+    rate_limit_backend: RateLimitBackend = RateLimitBackend.memory
+    rate_limit_max_keys: int = 100000
+    rate_limit_purge_interval: float = 60.0
+    # requests per second and burst per client, a rate of 0 disables a limit
+    rate_limit_url_create_rate: float = 1.0
+    rate_limit_url_create_burst: int = 60
+    rate_limit_token_rate: float = 0.2
+    rate_limit_token_burst: int = 10
+    rate_limit_redirect_rate: float = 50.0
+    rate_limit_redirect_burst: int = 200
 
     @property
     def get_combinations_count(self):
@@ -40,11 +114,37 @@ class PostgresConfig(BaseConfig, env_prefix="DB_"):
     name: str
     port: int
     debug: bool
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30.0
+    pool_recycle: int = -1
+    pool_pre_ping: bool = False
+    statement_cache_size: int = 100
+    prepared_statement_cache_size: int = 100
+
+    @property
+    def get_engine_options(self) -> dict:
+        # statement caches must be disabled (0) behind pgbouncer in transaction mode
+        return {
+            "pool_size": self.pool_size,
+            "max_overflow": self.max_overflow,
+            "pool_timeout": self.pool_timeout,
+            "pool_recycle": self.pool_recycle,
+            "pool_pre_ping": self.pool_pre_ping,
+            "connect_args": {
+                "statement_cache_size": self.statement_cache_size,
+                "prepared_statement_cache_size": self.prepared_statement_cache_size,
+            },
+        }
 
     @property
     def get_dsn(self) -> str:
         return f"postgresql+asyncpg://{self.user}:{self.password.get_secret_value()}@{self.host}:{self.port}/{self.name}"
 
+    @property
+    def get_dsn_plain(self) -> str:
+        return f"postgresql://{self.user}:{self.password.get_secret_value()}@{self.host}:{self.port}/{self.name}"
+
     @property
     def get_dsn_psycopg(self) -> str:
         return f"postgresql+psycopg://{self.user}:{self.password.get_secret_value()}@{self.host}:{self.port}/{self.name}"
@@ -1,4 +1,5 @@
 import asyncio
+import re
 from logging.config import fileConfig
 
 from alembic import context
@@ -39,6 +40,13 @@ config.set_main_option("sqlalchemy.url", settings.postgres.get_dsn)
 # asyncio.run(test())
 
 
+def include_name(name, type_, parent_names) -> bool:
+    # url_redirect partitions are created and dropped at runtime
+    if type_ == "table":
+        return not re.fullmatch(r"url_redirect_(default|p\d+)", name)
+    return True
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
 
@@ -55,6 +63,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_name=include_name,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -64,7 +73,11 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection: Connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_name=include_name,
+    )
 
     with context.begin_transaction():
         context.run_migrations()
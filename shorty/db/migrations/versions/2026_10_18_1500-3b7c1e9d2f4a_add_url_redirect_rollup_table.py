@@ -0,0 +1,46 @@
+"""add url_redirect_rollup table
+
+Revision ID: 3b7c1e9d2f4a
+Revises: 498b9697ea3a
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3b7c1e9d2f4a"
+down_revision: Union[str, None] = "498b9697ea3a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "url_redirect_rollup",
+        sa.Column("url_id", sa.UUID(), nullable=False),
+        sa.Column("granularity", sa.String(length=6), nullable=False),
+        sa.Column("bucket", sa.DateTime(), nullable=False),
+        sa.Column("count", sa.BigInteger(), nullable=False),
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.ForeignKeyConstraint(["url_id"], ["url.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("url_id", "granularity", "bucket"),
+    )
+    for granularity in ("minute", "hour", "day"):
+        op.execute(
+            f"""
+            INSERT INTO url_redirect_rollup (id, url_id, granularity, bucket, count)
+            SELECT gen_random_uuid(), url_id, '{granularity}',
+                   date_trunc('{granularity}', created_at), count(*)
+            FROM url_redirect
+            GROUP BY url_id, date_trunc('{granularity}', created_at)
+            """
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("url_redirect_rollup")
@@ -0,0 +1,32 @@
+"""add hash_pool table
+
+Revision ID: a41d5c2e8b90
+Revises: 3b7c1e9d2f4a
+Create Date: 2026-10-18 15:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a41d5c2e8b90"
+down_revision: Union[str, None] = "3b7c1e9d2f4a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "hash_pool",
+        sa.Column("hash", sa.String(length=5), nullable=False),
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("hash"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("hash_pool")
@@ -0,0 +1,28 @@
+"""add url hash sequence
+
+Revision ID: c5e2f7a9d3b1
+Revises: a41d5c2e8b90
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c5e2f7a9d3b1"
+down_revision: Union[str, None] = "a41d5c2e8b90"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        sa.schema.CreateSequence(sa.Sequence("url_hash_seq", start=0, minvalue=0))
+    )
+
+
+def downgrade() -> None:
+    op.execute(sa.schema.DropSequence(sa.Sequence("url_hash_seq")))
@@ -0,0 +1,29 @@
+"""add user token version
+
+Revision ID: d7a3e91b4c62
+Revises: c5e2f7a9d3b1
+Create Date: 2026-10-18 16:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d7a3e91b4c62"
+down_revision: Union[str, None] = "c5e2f7a9d3b1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "usr",
+        sa.Column("token_version", sa.Integer(), server_default="0", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("usr", "token_version")
@@ -0,0 +1,31 @@
+"""add url user pagination index
+
+Revision ID: e2b8f4c61a93
+Revises: d7a3e91b4c62
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e2b8f4c61a93"
+down_revision: Union[str, None] = "d7a3e91b4c62"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_url_user_id_updated_at",
+        "url",
+        ["user_id", sa.text("updated_at DESC"), sa.text("id DESC")],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_url_user_id_updated_at", table_name="url")
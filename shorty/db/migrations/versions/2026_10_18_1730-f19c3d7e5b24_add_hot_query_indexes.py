@@ -0,0 +1,69 @@
+"""add hot query indexes
+
+Revision ID: f19c3d7e5b24
+Revises: e2b8f4c61a93
+Create Date: 2026-10-18 17:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f19c3d7e5b24"
+down_revision: Union[str, None] = "e2b8f4c61a93"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_url_expired_at",
+        "url",
+        ["expired_at"],
+        unique=False,
+        postgresql_where=sa.text("expired_at IS NOT NULL"),
+    )
+    op.create_index(
+        "ix_url_redirect_url_id_created_at",
+        "url_redirect",
+        ["url_id", "created_at"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_url_redirect_created_at", "url_redirect", ["created_at"], unique=False
+    )
+    op.create_index(
+        "ix_auth_refresh_token",
+        "auth",
+        ["refresh_token"],
+        unique=False,
+        postgresql_where=sa.text("NOT revoked"),
+    )
+    op.create_index(
+        "ix_auth_user_id",
+        "auth",
+        ["user_id"],
+        unique=False,
+        postgresql_where=sa.text("NOT revoked"),
+    )
+    op.create_index("ix_auth_expired_at", "auth", ["expired_at"], unique=False)
+    op.create_index(
+        "ix_auth_revoked",
+        "auth",
+        ["id"],
+        unique=False,
+        postgresql_where=sa.text("revoked"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_auth_revoked", table_name="auth")
+    op.drop_index("ix_auth_expired_at", table_name="auth")
+    op.drop_index("ix_auth_user_id", table_name="auth")
+    op.drop_index("ix_auth_refresh_token", table_name="auth")
+    op.drop_index("ix_url_redirect_created_at", table_name="url_redirect")
+    op.drop_index("ix_url_redirect_url_id_created_at", table_name="url_redirect")
+    op.drop_index("ix_url_expired_at", table_name="url")
@@ -0,0 +1,110 @@
+"""partition url_redirect
+
+Revision ID: 0a6e2d9c7f15
+Revises: f19c3d7e5b24
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0a6e2d9c7f15"
+down_revision: Union[str, None] = "f19c3d7e5b24"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _rename_old_table() -> None:
+    op.execute("ALTER TABLE url_redirect RENAME TO url_redirect_old")
+    op.execute(
+        "ALTER TABLE url_redirect_old "
+        "RENAME CONSTRAINT url_redirect_pkey TO url_redirect_old_pkey"
+    )
+    op.execute("DROP INDEX ix_url_redirect_url_id_created_at")
+    op.execute("DROP INDEX ix_url_redirect_created_at")
+
+
+def _create_indexes() -> None:
+    op.create_index(
+        "ix_url_redirect_url_id_created_at",
+        "url_redirect",
+        ["url_id", "created_at"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_url_redirect_created_at", "url_redirect", ["created_at"], unique=False
+    )
+
+
+def upgrade() -> None:
+    _rename_old_table()
+    op.execute(
+        """
+        CREATE TABLE url_redirect (
+            created_at TIMESTAMP WITHOUT TIME ZONE DEFAULT now() NOT NULL,
+            url_id UUID NOT NULL,
+            id UUID NOT NULL,
+            updated_at TIMESTAMP WITHOUT TIME ZONE DEFAULT now() NOT NULL,
+            PRIMARY KEY (id, created_at),
+            CONSTRAINT url_redirect_url_id_fkey
+                FOREIGN KEY (url_id) REFERENCES url (id) ON DELETE CASCADE
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+    op.execute("CREATE TABLE url_redirect_default PARTITION OF url_redirect DEFAULT")
+    # monthly partitions for the existing rows and the next two months, the
+    # application keeps creating new ones from there
+    op.execute(
+        """
+        DO $$
+        DECLARE
+            start_at TIMESTAMP;
+        BEGIN
+            SELECT date_trunc('month', coalesce(min(created_at), localtimestamp))
+            INTO start_at FROM url_redirect_old;
+            WHILE start_at <= date_trunc('month', localtimestamp) + interval '2 months'
+            LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF url_redirect '
+                    'FOR VALUES FROM (%L) TO (%L)',
+                    'url_redirect_p' || to_char(start_at, 'YYYYMM'),
+                    start_at,
+                    start_at + interval '1 month'
+                );
+                start_at := start_at + interval '1 month';
+            END LOOP;
+        END $$
+        """
+    )
+    op.execute(
+        "INSERT INTO url_redirect (created_at, url_id, id, updated_at) "
+        "SELECT created_at, url_id, id, updated_at FROM url_redirect_old"
+    )
+    op.drop_table("url_redirect_old")
+    _create_indexes()
+
+
+def downgrade() -> None:
+    _rename_old_table()
+    op.execute(
+        """
+        CREATE TABLE url_redirect (
+            url_id UUID NOT NULL,
+            id UUID NOT NULL PRIMARY KEY,
+            created_at TIMESTAMP WITHOUT TIME ZONE DEFAULT now() NOT NULL,
+            updated_at TIMESTAMP WITHOUT TIME ZONE DEFAULT now() NOT NULL,
+            CONSTRAINT url_redirect_url_id_fkey
+                FOREIGN KEY (url_id) REFERENCES url (id) ON DELETE CASCADE
+        )
+        """
+    )
+    op.execute(
+        "INSERT INTO url_redirect (url_id, id, created_at, updated_at) "
+        "SELECT url_id, id, created_at, updated_at FROM url_redirect_old"
+    )
+    # dropping the partitioned table drops all of its partitions
+    op.drop_table("url_redirect_old")
+    _create_indexes()
@@ -0,0 +1,68 @@
+"""add click dimensions
+
+Revision ID: 6c3f1a8e2d47
+Revises: 0a6e2d9c7f15
+Create Date: 2026-10-18 18:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "6c3f1a8e2d47"
+down_revision: Union[str, None] = "0a6e2d9c7f15"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "user_agent_family",
+        sa.Column("id", sa.SmallInteger(), sa.Identity(), nullable=False),
+        sa.Column("name", sa.String(length=32), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("name"),
+    )
+    op.create_table(
+        "referrer_domain",
+        sa.Column("id", sa.Integer(), sa.Identity(), nullable=False),
+        sa.Column("name", sa.String(length=255), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("name"),
+    )
+    op.add_column("url_redirect", sa.Column("user_agent_family_id", sa.SmallInteger()))
+    op.add_column("url_redirect", sa.Column("referrer_domain_id", sa.Integer()))
+    op.add_column("url_redirect", sa.Column("country", sa.String(length=2)))
+    op.add_column("url_redirect", sa.Column("ip_hash", sa.BigInteger()))
+    op.create_foreign_key(
+        "url_redirect_user_agent_family_id_fkey",
+        "url_redirect",
+        "user_agent_family",
+        ["user_agent_family_id"],
+        ["id"],
+    )
+    op.create_foreign_key(
+        "url_redirect_referrer_domain_id_fkey",
+        "url_redirect",
+        "referrer_domain",
+        ["referrer_domain_id"],
+        ["id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint(
+        "url_redirect_referrer_domain_id_fkey", "url_redirect", type_="foreignkey"
+    )
+    op.drop_constraint(
+        "url_redirect_user_agent_family_id_fkey", "url_redirect", type_="foreignkey"
+    )
+    op.drop_column("url_redirect", "ip_hash")
+    op.drop_column("url_redirect", "country")
+    op.drop_column("url_redirect", "referrer_domain_id")
+    op.drop_column("url_redirect", "user_agent_family_id")
+    op.drop_table("referrer_domain")
+    op.drop_table("user_agent_family")
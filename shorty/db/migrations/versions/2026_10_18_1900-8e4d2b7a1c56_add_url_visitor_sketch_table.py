@@ -0,0 +1,35 @@
+"""add url_visitor_sketch table
+
+Revision ID: 8e4d2b7a1c56
+Revises: 6c3f1a8e2d47
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8e4d2b7a1c56"
+down_revision: Union[str, None] = "6c3f1a8e2d47"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "url_visitor_sketch",
+        sa.Column("url_id", sa.UUID(), nullable=False),
+        sa.Column("day", sa.DateTime(), nullable=False),
+        sa.Column("sketch", sa.LargeBinary(), nullable=False),
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.ForeignKeyConstraint(["url_id"], ["url.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("url_id", "day"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("url_visitor_sketch")
@@ -0,0 +1,34 @@
+"""add top_link_snapshot table
+
+Revision ID: b5a9c3e7f281
+Revises: 8e4d2b7a1c56
+Create Date: 2026-10-18 19:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b5a9c3e7f281"
+down_revision: Union[str, None] = "8e4d2b7a1c56"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "top_link_snapshot",
+        sa.Column("user_id", sa.UUID(), nullable=True),
+        sa.Column("window", sa.String(length=3), nullable=False),
+        sa.Column("data", sa.LargeBinary(), nullable=False),
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["usr.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("top_link_snapshot")
@@ -0,0 +1,42 @@
+"""add url_changed trigger
+
+Revision ID: c7e1d4a9b362
+Revises: b5a9c3e7f281
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c7e1d4a9b362"
+down_revision: Union[str, None] = "b5a9c3e7f281"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION notify_url_changed() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('url_changed', OLD.hash);
+            IF TG_OP = 'UPDATE' AND NEW.hash IS DISTINCT FROM OLD.hash THEN
+                PERFORM pg_notify('url_changed', NEW.hash);
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        "CREATE TRIGGER url_changed AFTER UPDATE OR DELETE ON url "
+        "FOR EACH ROW EXECUTE FUNCTION notify_url_changed()"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER url_changed ON url")
+    op.execute("DROP FUNCTION notify_url_changed()")
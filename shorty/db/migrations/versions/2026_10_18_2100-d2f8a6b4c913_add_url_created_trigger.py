@@ -0,0 +1,39 @@
+"""add url_created trigger
+
+Revision ID: d2f8a6b4c913
+Revises: c7e1d4a9b362
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d2f8a6b4c913"
+down_revision: Union[str, None] = "c7e1d4a9b362"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION notify_url_created() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('url_created', NEW.hash);
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        "CREATE TRIGGER url_created AFTER INSERT ON url "
+        "FOR EACH ROW EXECUTE FUNCTION notify_url_created()"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER url_created ON url")
+    op.execute("DROP FUNCTION notify_url_created()")
@@ -0,0 +1,32 @@
+"""add rate_limit table
+
+Revision ID: e9b3c5d7a104
+Revises: d2f8a6b4c913
+Create Date: 2026-10-18 22:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e9b3c5d7a104"
+down_revision: Union[str, None] = "d2f8a6b4c913"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "rate_limit",
+        sa.Column("id", sa.String(length=128), nullable=False),
+        sa.Column("tat", sa.Double(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        prefixes=["UNLOGGED"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("rate_limit")
@@ -0,0 +1,59 @@
+"""add top_link_snapshot instance
+
+Revision ID: f4a2c8e6b517
+Revises: e9b3c5d7a104
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f4a2c8e6b517"
+down_revision: Union[str, None] = "e9b3c5d7a104"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # existing rows become released so that the next process to start adopts
+    # them exactly once
+    op.add_column(
+        "top_link_snapshot",
+        sa.Column(
+            "instance_id",
+            sa.UUID(),
+            nullable=False,
+            server_default=sa.text("gen_random_uuid()"),
+        ),
+    )
+    op.add_column(
+        "top_link_snapshot",
+        sa.Column("released", sa.Boolean(), nullable=False, server_default="true"),
+    )
+    op.add_column(
+        "top_link_snapshot",
+        sa.Column(
+            "taken_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False
+        ),
+    )
+    op.alter_column("top_link_snapshot", "instance_id", server_default=None)
+    op.alter_column("top_link_snapshot", "released", server_default=None)
+    op.create_index(
+        op.f("ix_top_link_snapshot_instance_id"),
+        "top_link_snapshot",
+        ["instance_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        op.f("ix_top_link_snapshot_instance_id"), table_name="top_link_snapshot"
+    )
+    op.drop_column("top_link_snapshot", "taken_at")
+    op.drop_column("top_link_snapshot", "released")
+    op.drop_column("top_link_snapshot", "instance_id")
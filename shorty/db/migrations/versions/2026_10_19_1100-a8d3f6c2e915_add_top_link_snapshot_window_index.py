@@ -0,0 +1,30 @@
+"""add top_link_snapshot window index
+
+Revision ID: a8d3f6c2e915
+Revises: f4a2c8e6b517
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a8d3f6c2e915"
+down_revision: Union[str, None] = "f4a2c8e6b517"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_top_link_snapshot_user_id_window",
+        "top_link_snapshot",
+        ["user_id", "window"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_top_link_snapshot_user_id_window", table_name="top_link_snapshot")
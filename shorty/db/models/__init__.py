@@ -1,7 +1,27 @@
-__all__ = ("Base", "Url", "User", "Auth", "UrlRedirect")
+__all__ = (
+    "Base",
+    "Url",
+    "User",
+    "Auth",
+    "UrlRedirect",
+    "UrlRedirectRollup",
+    "HashPool",
+    "UserAgentFamily",
+    "ReferrerDomain",
+    "UrlVisitorSketch",
+    "TopLinkSnapshot",
+    "RateLimit",
+)
 
 from shorty.db.models.auth import Auth
 from shorty.db.models.base import Base
+from shorty.db.models.hash_pool import HashPool
+from shorty.db.models.rate_limit import RateLimit
+from shorty.db.models.referrer_domain import ReferrerDomain
+from shorty.db.models.top_link_snapshot import TopLinkSnapshot
 from shorty.db.models.url import Url
 from shorty.db.models.url_redirect import UrlRedirect
+from shorty.db.models.url_redirect_rollup import UrlRedirectRollup
+from shorty.db.models.url_visitor_sketch import UrlVisitorSketch
 from shorty.db.models.user import User
+from shorty.db.models.user_agent_family import UserAgentFamily
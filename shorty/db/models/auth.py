@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -34,3 +34,9 @@ class Auth(Base, TimeStampMixin):
 
     class Config:
         orm_mode = True
+
+
+Index("ix_auth_refresh_token", Auth.refresh_token, postgresql_where=~Auth.revoked)
+Index("ix_auth_user_id", Auth.user_id, postgresql_where=~Auth.revoked)
+Index("ix_auth_expired_at", Auth.expired_at)
+Index("ix_auth_revoked", Auth.id, postgresql_where=Auth.revoked)
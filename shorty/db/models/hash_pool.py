@@ -0,0 +1,21 @@
+from sqlalchemy import String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from shorty.db.models.base import Base
+
+
+class HashPool(Base):
+    __tablename__ = "hash_pool"
+
+    hash: Mapped[str] = mapped_column(String(length=5), nullable=False, unique=True)
+
+    def __repr__(self) -> str:
+        attrs = ", ".join(
+            f"{key}={value!r}"
+            for key, value in self.__dict__.items()
+            if not key.startswith("_")
+        )
+        return f"HashPool({attrs})"
+
+    class Config:
+        orm_mode = True
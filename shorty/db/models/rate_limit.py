@@ -0,0 +1,26 @@
+from sqlalchemy import Double, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from shorty.db.models.base import Base
+
+
+class RateLimit(Base):
+    __tablename__ = "rate_limit"
+    # losing the limits on a crash is fine, skipping the WAL is not free
+    __table_args__ = {"prefixes": ["UNLOGGED"]}
+
+    # "<scope>:<client>" key of the limit
+    id: Mapped[str] = mapped_column(String(length=128), primary_key=True)
+    # GCRA theoretical arrival time, in epoch seconds of the database clock
+    tat: Mapped[float] = mapped_column(Double, nullable=False)
+
+    def __repr__(self) -> str:
+        attrs = ", ".join(
+            f"{key}={value!r}"
+            for key, value in self.__dict__.items()
+            if not key.startswith("_")
+        )
+        return f"RateLimit({attrs})"
+
+    class Config:
+        orm_mode = True
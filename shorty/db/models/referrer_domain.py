@@ -0,0 +1,23 @@
+from sqlalchemy import Identity, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from shorty.db.models.base import Base
+
+
+class ReferrerDomain(Base):
+    __tablename__ = "referrer_domain"
+
+    # dictionary table: url_redirect stores the small id instead of the domain
+    id: Mapped[int] = mapped_column(Integer, Identity(), primary_key=True)
+    name: Mapped[str] = mapped_column(String(length=255), nullable=False, unique=True)
+
+    def __repr__(self) -> str:
+        attrs = ", ".join(
+            f"{key}={value!r}"
+            for key, value in self.__dict__.items()
+            if not key.startswith("_")
+        )
+        return f"ReferrerDomain({attrs})"
+
+    class Config:
+        orm_mode = True
@@ -0,0 +1,46 @@
+from datetime import datetime
+
+from sqlalchemy import ForeignKey, Index, LargeBinary, String, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from shorty.db.models.base import Base
+
+
+class TopLinkSnapshot(Base):
+    __tablename__ = "top_link_snapshot"
+
+    # null for the global leaderboard
+    user_id: Mapped[UUID | None] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("usr.id", ondelete="CASCADE")
+    )
+    window: Mapped[str] = mapped_column(String(length=3), nullable=False)
+    # json encoded {slot: {url_id: count}} of a SlidingTopK
+    data: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    # every process writes its own counters, the rows of a process that has
+    # stopped (released) or stopped writing are merged into another one
+    instance_id: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True), nullable=False, index=True
+    )
+    released: Mapped[bool] = mapped_column(nullable=False, default=False)
+    taken_at: Mapped[datetime] = mapped_column(
+        nullable=False, server_default=func.now()
+    )
+
+    def __repr__(self) -> str:
+        attrs = ", ".join(
+            f"{key}={value!r}"
+            for key, value in self.__dict__.items()
+            if not key.startswith("_")
+        )
+        return f"TopLinkSnapshot({attrs})"
+
+    class Config:
+        orm_mode = True
+
+
+Index(
+    "ix_top_link_snapshot_user_id_window",
+    TopLinkSnapshot.user_id,
+    TopLinkSnapshot.window,
+)
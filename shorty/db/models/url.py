@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import ForeignKey, String
+from sqlalchemy import DDL, ForeignKey, Index, Sequence, String, event
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -9,9 +9,14 @@ from shorty.db.models.base import Base, TimeStampMixin
 
 if TYPE_CHECKING:
     from shorty.db.models.url_redirect import UrlRedirect
+    from shorty.db.models.url_redirect_rollup import UrlRedirectRollup
+    from shorty.db.models.url_visitor_sketch import UrlVisitorSketch
     from shorty.db.models.user import User
 
 
+url_hash_seq = Sequence("url_hash_seq", start=0, minvalue=0, metadata=Base.metadata)
+
+
 class Url(Base, TimeStampMixin):
     __tablename__ = "url"
 
@@ -34,6 +39,14 @@ class Url(Base, TimeStampMixin):
         "UrlRedirect", back_populates="url"
     )
 
+    url_redirect_rollups: Mapped[list["UrlRedirectRollup"]] = relationship(
+        "UrlRedirectRollup", back_populates="url"
+    )
+
+    url_visitor_sketches: Mapped[list["UrlVisitorSketch"]] = relationship(
+        "UrlVisitorSketch", back_populates="url"
+    )
+
     def __repr__(self) -> str:
         attrs = ", ".join(
             f"{key}={value!r}"
@@ -44,3 +57,66 @@ class Url(Base, TimeStampMixin):
 
     class Config:
         orm_mode = True
+
+
+# keyset pagination of a user's urls, newest first
+Index("ix_url_user_id_updated_at", Url.user_id, Url.updated_at.desc(), Url.id.desc())
+Index("ix_url_expired_at", Url.expired_at, postgresql_where=Url.expired_at.isnot(None))
+
+
+URL_CHANGED_CHANNEL = "url_changed"
+
+# every writer, not only this app, announces changed hashes so that the
+# redirect caches of all processes can drop them
+event.listen(
+    Url.__table__,
+    "after_create",
+    DDL(
+        f"""
+        CREATE OR REPLACE FUNCTION notify_url_changed() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('{URL_CHANGED_CHANNEL}', OLD.hash);
+            IF TG_OP = 'UPDATE' AND NEW.hash IS DISTINCT FROM OLD.hash THEN
+                PERFORM pg_notify('{URL_CHANGED_CHANNEL}', NEW.hash);
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    ),
+)
+event.listen(
+    Url.__table__,
+    "after_create",
+    DDL(
+        "CREATE TRIGGER url_changed AFTER UPDATE OR DELETE ON url "
+        "FOR EACH ROW EXECUTE FUNCTION notify_url_changed()"
+    ),
+)
+
+
+URL_CREATED_CHANNEL = "url_created"
+
+# feeds the hash filters of all processes
+event.listen(
+    Url.__table__,
+    "after_create",
+    DDL(
+        f"""
+        CREATE OR REPLACE FUNCTION notify_url_created() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('{URL_CREATED_CHANNEL}', NEW.hash);
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    ),
+)
+event.listen(
+    Url.__table__,
+    "after_create",
+    DDL(
+        "CREATE TRIGGER url_created AFTER INSERT ON url "
+        "FOR EACH ROW EXECUTE FUNCTION notify_url_created()"
+    ),
+)
@@ -1,6 +1,17 @@
+from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import (
+    DDL,
+    BigInteger,
+    ForeignKey,
+    Index,
+    Integer,
+    SmallInteger,
+    String,
+    event,
+    func,
+)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -12,10 +23,24 @@ if TYPE_CHECKING:
 
 class UrlRedirect(Base, TimeStampMixin):
     __tablename__ = "url_redirect"
+    __table_args__ = {"postgresql_partition_by": "RANGE (created_at)"}
 
+    # the partition key has to be part of the primary key
+    created_at: Mapped[datetime] = mapped_column(
+        primary_key=True, server_default=func.now()
+    )
     url_id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("url.id", ondelete="CASCADE"), nullable=False
     )
+    # filled in by ClickEnricher, dictionary encoded to keep rows narrow
+    user_agent_family_id: Mapped[int | None] = mapped_column(
+        SmallInteger, ForeignKey("user_agent_family.id")
+    )
+    referrer_domain_id: Mapped[int | None] = mapped_column(
+        Integer, ForeignKey("referrer_domain.id")
+    )
+    country: Mapped[str | None] = mapped_column(String(length=2))
+    ip_hash: Mapped[int | None] = mapped_column(BigInteger)
 
     url: Mapped["Url"] = relationship("Url", back_populates="url_redirects")
 
@@ -29,3 +54,15 @@ class UrlRedirect(Base, TimeStampMixin):
 
     class Config:
         orm_mode = True
+
+
+Index("ix_url_redirect_url_id_created_at", UrlRedirect.url_id, UrlRedirect.created_at)
+Index("ix_url_redirect_created_at", UrlRedirect.created_at)
+
+
+# catches rows outside of the partitions maintained by RedirectPartitionManager
+event.listen(
+    UrlRedirect.__table__,
+    "after_create",
+    DDL("CREATE TABLE url_redirect_default PARTITION OF url_redirect DEFAULT"),
+)
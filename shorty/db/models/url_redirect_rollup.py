@@ -0,0 +1,36 @@
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from sqlalchemy import BigInteger, ForeignKey, String, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from shorty.db.models.base import Base
+
+if TYPE_CHECKING:
+    from shorty.db.models.url import Url
+
+
+class UrlRedirectRollup(Base):
+    __tablename__ = "url_redirect_rollup"
+    __table_args__ = (UniqueConstraint("url_id", "granularity", "bucket"),)
+
+    url_id: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("url.id", ondelete="CASCADE"), nullable=False
+    )
+    granularity: Mapped[str] = mapped_column(String(length=6), nullable=False)
+    bucket: Mapped[datetime] = mapped_column(nullable=False)
+    count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+    url: Mapped["Url"] = relationship("Url", back_populates="url_redirect_rollups")
+
+    def __repr__(self) -> str:
+        attrs = ", ".join(
+            f"{key}={value!r}"
+            for key, value in self.__dict__.items()
+            if not key.startswith("_")
+        )
+        return f"UrlRedirectRollup({attrs})"
+
+    class Config:
+        orm_mode = True
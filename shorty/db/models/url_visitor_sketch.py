@@ -0,0 +1,36 @@
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from sqlalchemy import ForeignKey, LargeBinary, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from shorty.db.models.base import Base
+
+if TYPE_CHECKING:
+    from shorty.db.models.url import Url
+
+
+class UrlVisitorSketch(Base):
+    __tablename__ = "url_visitor_sketch"
+    __table_args__ = (UniqueConstraint("url_id", "day"),)
+
+    url_id: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("url.id", ondelete="CASCADE"), nullable=False
+    )
+    day: Mapped[datetime] = mapped_column(nullable=False)
+    # serialized HyperLogLog of the hashed client ips seen that day
+    sketch: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+
+    url: Mapped["Url"] = relationship("Url", back_populates="url_visitor_sketches")
+
+    def __repr__(self) -> str:
+        attrs = ", ".join(
+            f"{key}={value!r}"
+            for key, value in self.__dict__.items()
+            if not key.startswith("_")
+        )
+        return f"UrlVisitorSketch({attrs})"
+
+    class Config:
+        orm_mode = True
@@ -15,6 +15,9 @@ class User(Base, TimeStampMixin):
     name: Mapped[str] = mapped_column(nullable=False)
     password: Mapped[str] = mapped_column(nullable=False)
     email: Mapped[str] = mapped_column(nullable=False, unique=True, index=True)
+    token_version: Mapped[int] = mapped_column(
+        nullable=False, default=0, server_default="0"
+    )
 
     urls: Mapped[list["Url"]] = relationship(back_populates="user")
     auths: Mapped[list["Auth"]] = relationship(back_populates="user")
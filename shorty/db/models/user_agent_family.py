@@ -0,0 +1,23 @@
+from sqlalchemy import Identity, SmallInteger, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from shorty.db.models.base import Base
+
+
+class UserAgentFamily(Base):
+    __tablename__ = "user_agent_family"
+
+    # dictionary table: url_redirect stores the small id instead of the name
+    id: Mapped[int] = mapped_column(SmallInteger, Identity(), primary_key=True)
+    name: Mapped[str] = mapped_column(String(length=32), nullable=False, unique=True)
+
+    def __repr__(self) -> str:
+        attrs = ", ".join(
+            f"{key}={value!r}"
+            for key, value in self.__dict__.items()
+            if not key.startswith("_")
+        )
+        return f"UserAgentFamily({attrs})"
+
+    class Config:
+        orm_mode = True
@@ -0,0 +1,10 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class CapacitySchema(BaseModel):
+    reserved_count: int
+    total_count: int
+    utilisation: float
+    refreshed_at: datetime | None
@@ -0,0 +1,78 @@
+from pydantic import BaseModel
+
+
+class PoolStatsSchema(BaseModel):
+    size: int
+    checked_out: int
+    overflow: int
+    checked_in: int
+    checkouts: int
+    timeouts: int
+    wait_time_total: float
+    wait_time_max: float
+
+
+class CacheStatsSchema(BaseModel):
+    size: int
+    maxsize: int
+    hits: int
+    misses: int
+    evictions: int
+
+
+class ClickIngestorStatsSchema(BaseModel):
+    queued: int
+    flushed: int
+    dropped: int
+    failed: int
+
+
+class PasswordHashStatsSchema(BaseModel):
+    pending: int
+    max_pending: int
+    rejected: int
+
+
+class TopLinksStatsSchema(BaseModel):
+    tracked_users: int
+    tracked_urls: int
+    snapshots: int
+    snapshot_failures: int
+    peer_failures: int
+
+
+class CacheInvalidatorStatsSchema(BaseModel):
+    connected: bool
+    received: int
+    reconnects: int
+    resyncs: int
+
+
+class HashFilterStatsSchema(BaseModel):
+    active: bool
+    items: int
+    capacity: int
+    size_bytes: int
+    estimated_fp_rate: float
+    rejected: int
+    false_positives: int
+    rebuilds: int
+
+
+class RateLimiterStatsSchema(BaseModel):
+    allowed: int
+    rejected: int
+    errors: int
+    keys: int
+
+
+class MetricsSchema(BaseModel):
+    pool: PoolStatsSchema
+    url_cache: CacheStatsSchema
+    user_cache: CacheStatsSchema
+    click_ingestor: ClickIngestorStatsSchema
+    password_hash: PasswordHashStatsSchema
+    top_links: TopLinksStatsSchema
+    cache_invalidation: CacheInvalidatorStatsSchema
+    hash_filter: HashFilterStatsSchema
+    rate_limit: RateLimiterStatsSchema
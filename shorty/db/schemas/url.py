@@ -26,7 +26,8 @@ class UrlSchema(UrlBaseSchema):
 
 class UrlPaginatedSchema(BaseModel):
     urls: list[UrlSchema]
-    total_count: int
+    total_count: int | None = None
+    next_cursor: str | None = None
 
 
 class UrlCreateSchema(BaseModel):
@@ -49,6 +50,22 @@ class UrlCreateSchema(BaseModel):
         return value
 
 
+class UrlBulkCreateSchema(BaseModel):
+    urls: list[UrlCreateSchema] = Field(
+        min_length=1, max_length=config.app.bulk_create_max_size
+    )
+
+
+class UrlBulkErrorSchema(BaseModel):
+    index: int
+    detail: str
+
+
+class UrlBulkCreateResultSchema(BaseModel):
+    urls: list[UrlSchema]
+    errors: list[UrlBulkErrorSchema]
+
+
 class UrlUpdateSchema(BaseModel):
     url: AnyUrl
     expired_at: datetime | None
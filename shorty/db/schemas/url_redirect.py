@@ -3,12 +3,18 @@ from uuid import UUID
 
 from pydantic import BaseModel, field_validator
 
+from shorty.utils.enums import RollupGranularity, TopWindow
+
 
 class UrlRedirectBaseSchema(BaseModel):
     url_id: UUID
 
 
-class UrlRedirectCreateSchema(UrlRedirectBaseSchema): ...
+class UrlRedirectCreateSchema(UrlRedirectBaseSchema):
+    # raw request data, turned into compact columns by ClickEnricher
+    referrer: str | None = None
+    user_agent: str | None = None
+    client_ip: str | None = None
 
 
 class UrlRedirectSchema(UrlRedirectBaseSchema):
@@ -31,3 +37,38 @@ class UrlRedirectRequestSchema(BaseModel):
         if value:
             return value.replace(tzinfo=None)
         return value
+
+
+class UrlRedirectBucketRequestSchema(UrlRedirectRequestSchema):
+    granularity: RollupGranularity = RollupGranularity.hour
+
+
+class UrlRedirectBucketSchema(BaseModel):
+    bucket: datetime
+    count: int
+
+
+class UrlRedirectBucketStatisticSchema(BaseModel):
+    granularity: RollupGranularity
+    buckets: list[UrlRedirectBucketSchema]
+    count: int
+
+
+class UrlVisitorDaySchema(BaseModel):
+    day: datetime
+    unique_visitors: int
+
+
+class UrlVisitorStatisticSchema(BaseModel):
+    days: list[UrlVisitorDaySchema]
+    unique_visitors: int
+
+
+class UrlTopItemSchema(BaseModel):
+    url_id: UUID
+    count: int
+
+
+class UrlTopSchema(BaseModel):
+    window: TopWindow
+    urls: list[UrlTopItemSchema]
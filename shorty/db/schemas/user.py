@@ -15,6 +15,13 @@ class UserSchema(UserBaseSchema):
     updated_at: datetime
 
 
+class UserInDB(UserBaseSchema):
+    id: UUID
+    created_at: datetime
+    updated_at: datetime
+    token_version: int
+
+
 class UserCreateSchema(UserBaseSchema):
     password: str
 
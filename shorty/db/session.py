@@ -1,35 +1,87 @@
 import logging
+import time
 from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
 from typing import AsyncGenerator, Generator, Literal
 
 from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from shorty.config import config
 
 logger = logging.getLogger(__name__)
 
+IsolationLevel = Literal[
+    "READ COMMITTED", "REPEATABLE READ", "SERIALIZABLE", "AUTOCOMMIT"
+]
+
+
+@dataclass
+class PoolStats:
+    size: int
+    checked_out: int
+    overflow: int
+    checked_in: int
+    checkouts: int
+    timeouts: int
+    wait_time_total: float
+    wait_time_max: float
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long checkouts wait for a free connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    def _do_get(self):
+        started_at = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.timeouts += 1
+            raise
+        wait_time = time.perf_counter() - started_at
+        self.checkouts += 1
+        self.wait_time_total += wait_time
+        self.wait_time_max = max(self.wait_time_max, wait_time)
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.checkouts = self.checkouts
+        pool.timeouts = self.timeouts
+        pool.wait_time_total = self.wait_time_total
+        pool.wait_time_max = self.wait_time_max
+        return pool
+
 
 class SessionManager:
-    def __init__(self, db_dsn: str, echo: bool = False, is_async=True):
+    def __init__(
+        self, db_dsn: str, echo: bool = False, is_async=True, **engine_options
+    ):
         self.is_async = is_async
+        self._isolated_session_factories: dict[IsolationLevel, async_sessionmaker] = {}
         if is_async:
             self._engine = create_async_engine(
                 url=db_dsn,
                 echo=echo,
+                poolclass=TimedQueuePool,
+                **engine_options,
             )
-            self._session_factory = async_sessionmaker(
-                self._engine,
-                autoflush=False,
-                autocommit=False,
-                expire_on_commit=False,
-                class_=AsyncSession,
-            )
+            self._session_factory = self._make_session_factory(self._engine)
         else:
             self._engine = create_engine(
                 url=db_dsn,
                 echo=echo,
+                **engine_options,
             )
             self._session_factory = sessionmaker(
                 self._engine,
@@ -39,13 +91,50 @@ class SessionManager:
                 class_=Session,
             )
 
+    @staticmethod
+    def _make_session_factory(engine) -> async_sessionmaker:
+        return async_sessionmaker(
+            engine,
+            autoflush=False,
+            autocommit=False,
+            expire_on_commit=False,
+            class_=AsyncSession,
+        )
+
+    def _get_session_factory(
+        self, isolation_level: IsolationLevel | None
+    ) -> async_sessionmaker:
+        if isolation_level is None:
+            return self._session_factory
+        factory = self._isolated_session_factories.get(isolation_level)
+        if factory is None:
+            # execution_options returns a proxy engine that shares the pool
+            factory = self._make_session_factory(
+                self._engine.execution_options(isolation_level=isolation_level)
+            )
+            self._isolated_session_factories[isolation_level] = factory
+        return factory
+
+    def pool_stats(self) -> PoolStats:
+        pool = self._engine.pool
+        return PoolStats(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            overflow=max(pool.overflow(), 0),
+            checked_in=pool.checkedin(),
+            checkouts=getattr(pool, "checkouts", 0),
+            timeouts=getattr(pool, "timeouts", 0),
+            wait_time_total=getattr(pool, "wait_time_total", 0.0),
+            wait_time_max=getattr(pool, "wait_time_max", 0.0),
+        )
+
     @asynccontextmanager
     async def session(
-        self,
+        self, isolation_level: IsolationLevel | None = None
     ) -> AsyncGenerator[AsyncSession, None]:
         if not self.is_async:
             raise Exception("you are using async context manager via sync engine")
-        session: AsyncSession = self._session_factory()
+        session: AsyncSession = self._get_session_factory(isolation_level)()
 
         try:
             yield session
@@ -75,4 +164,6 @@ class SessionManager:
             session.close()
 
 
-session_manager = SessionManager(config.postgres.get_dsn, config.postgres.debug)
+session_manager = SessionManager(
+    config.postgres.get_dsn, config.postgres.debug, **config.postgres.get_engine_options
+)
@@ -0,0 +1,25 @@
+import logging
+
+from fastapi import APIRouter, Depends, status
+
+from shorty.db.schemas.capacity import CapacitySchema
+from shorty.db.schemas.metrics import MetricsSchema
+from shorty.endpoints.dependencies import AdminOAuth, get_session
+from shorty.services.capacity import CapacityService
+from shorty.services.metrics import MetricsService
+
+router = APIRouter(prefix="/admin")
+
+logger = logging.getLogger(__name__)
+
+
+@router.get("/capacity/", response_model=CapacitySchema, status_code=status.HTTP_200_OK)
+async def get_capacity(auth: AdminOAuth, session=Depends(get_session)):
+    capacity_service = CapacityService(session)
+    return await capacity_service.get_capacity()
+
+
+@router.get("/metrics/", response_model=MetricsSchema, status_code=status.HTTP_200_OK)
+async def get_metrics(auth: AdminOAuth):
+    metrics_service = MetricsService()
+    return metrics_service.get_metrics()
@@ -6,16 +6,22 @@ from fastapi.security import OAuth2PasswordRequestForm
 
 from shorty.db.schemas.auth import RevokedTokensSchema
 from shorty.db.schemas.user import UserSchema
-from shorty.endpoints.dependencies import OAuth, get_session
+from shorty.endpoints.dependencies import OAuth, get_session, limit_by_client
 from shorty.services.auth import AuthService
 from shorty.services.user import UserService
+from shorty.utils.enums import RateLimitScope
 
 router = APIRouter(prefix="/token")
 
 logger = logging.getLogger(__name__)
 
 
-@router.post("/", status_code=status.HTTP_201_CREATED, response_model=UserSchema)
+@router.post(
+    "/",
+    status_code=status.HTTP_201_CREATED,
+    response_model=UserSchema,
+    dependencies=[limit_by_client(RateLimitScope.token)],
+)
 async def login_for_access_token(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
     resp: Response,
@@ -42,7 +48,11 @@ async def login_for_access_token(
     return user
 
 
-@router.post("/refresh/", status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/refresh/",
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[limit_by_client(RateLimitScope.token)],
+)
 async def refresh_tokens(
     response: Response,
     request: Request,
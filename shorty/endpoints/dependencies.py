@@ -6,8 +6,9 @@ from shorty.config import config
 from shorty.db.schemas.user import UserSchema
 from shorty.db.session import session_manager
 from shorty.services.auth import AuthService
-from shorty.utils.enums import TokenType
-from shorty.utils.exceptions import UnauthorizedError
+from shorty.services.rate_limit import rate_limiter
+from shorty.utils.enums import RateLimitScope, TokenType
+from shorty.utils.exceptions import ForbiddenError, UnauthorizedError
 
 hash_len = config.app.hash_len
 
@@ -17,20 +18,29 @@ HashType = Annotated[
 
 
 async def get_session():
+    # the session checks out a connection only when its first query runs, and
+    # FastAPI caches this dependency, so all dependencies of a request share it
+    # and requests served from memory never touch the pool
     async with session_manager.session() as session:
         yield session
 
 
-async def get_session_repeatable_read():
-    async with session_manager.session(isolation_level="REPEATABLE READ") as session:
-        yield session
+async def get_session_repeatable_read(session=Depends(get_session)):
+    await session.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+    yield session
 
 
 async def check_auth(request: Request, session=Depends(get_session)) -> UserSchema:
     access_token = request.cookies.get("access_token")
     if not access_token:
         raise UnauthorizedError("token not provided")
-    return await AuthService(session).validate_token(access_token, TokenType.access)
+    owns_transaction = not session.in_transaction()
+    user = await AuthService(session).validate_token(access_token, TokenType.access)
+    if owns_transaction:
+        # return the connection to the pool instead of keeping it idle in a
+        # read-only transaction until the endpoint runs its own queries
+        await session.rollback()
+    return user
 
 
 async def res_check_auth(
@@ -42,5 +52,33 @@ async def res_check_auth(
         return None
 
 
+async def check_admin(user: Annotated[UserSchema, Depends(check_auth)]) -> UserSchema:
+    if user.id not in config.app.admin_user_ids:
+        raise ForbiddenError("admin access required")
+    return user
+
+
 OAuth = Annotated[UserSchema, Depends(check_auth)]
 UnstrictedOAuth = Annotated[UserSchema | None, Depends(res_check_auth)]
+AdminOAuth = Annotated[UserSchema, Depends(check_admin)]
+
+
+def get_client_key(request: Request, user: UserSchema | None = None) -> str:
+    if user is not None:
+        return f"user:{user.id}"
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+
+def limit_by_client(scope: RateLimitScope):
+    async def check_rate_limit(request: Request) -> None:
+        await rate_limiter.check(scope, get_client_key(request))
+
+    return Depends(check_rate_limit)
+
+
+def limit_by_user(scope: RateLimitScope):
+    # anonymous requests are limited by client ip
+    async def check_rate_limit(request: Request, user: UnstrictedOAuth) -> None:
+        await rate_limiter.check(scope, get_client_key(request, user))
+
+    return Depends(check_rate_limit)
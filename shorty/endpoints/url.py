@@ -1,29 +1,40 @@
 import logging
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query, status
-from fastapi.responses import RedirectResponse
+from fastapi import APIRouter, Depends, Query, Request, status
+from fastapi.responses import RedirectResponse, StreamingResponse
 
 from shorty.db.schemas.url import (
+    UrlBulkCreateResultSchema,
+    UrlBulkCreateSchema,
     UrlCreateSchema,
     UrlPaginatedSchema,
     UrlSchema,
     UrlUpdateSchema,
 )
 from shorty.db.schemas.url_redirect import (
-    UrlRedirectCreateSchema,
+    UrlRedirectBucketRequestSchema,
+    UrlRedirectBucketStatisticSchema,
     UrlRedirectRequestSchema,
     UrlRedirectStatisticSchema,
+    UrlTopSchema,
+    UrlVisitorStatisticSchema,
 )
 from shorty.endpoints.dependencies import (
     HashType,
     OAuth,
     UnstrictedOAuth,
+    get_client_key,
     get_session,
     get_session_repeatable_read,
+    limit_by_client,
+    limit_by_user,
 )
+from shorty.services.rate_limit import rate_limiter
+from shorty.services.top_links import TopLinksService
 from shorty.services.url import UrlService
 from shorty.services.url_redirect import UrlRedirectService
+from shorty.utils.enums import ExportFormat, RateLimitScope, TopWindow
 
 router = APIRouter(prefix="/url")
 hash_router = APIRouter()
@@ -31,7 +42,12 @@ hash_router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
-@router.post("/", response_model=UrlSchema, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/",
+    response_model=UrlSchema,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[limit_by_user(RateLimitScope.url_create)],
+)
 async def create_short_url(
     data: UrlCreateSchema, user: UnstrictedOAuth, session=Depends(get_session)
 ):
@@ -39,6 +55,48 @@ async def create_short_url(
     return await url_service.create_url(data, user)
 
 
+@router.post(
+    "/bulk",
+    response_model=UrlBulkCreateResultSchema,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_short_urls(
+    data: UrlBulkCreateSchema,
+    user: UnstrictedOAuth,
+    request: Request,
+    session=Depends(get_session),
+):
+    # every url of the batch counts, a batch over the burst is rejected
+    await rate_limiter.check(
+        RateLimitScope.url_create, get_client_key(request, user), cost=len(data.urls)
+    )
+    url_service = UrlService(session)
+    return await url_service.create_urls(data.urls, user)
+
+
+@router.get("/top/", response_model=UrlTopSchema, status_code=status.HTTP_200_OK)
+async def get_top_urls(
+    auth: OAuth,
+    window: TopWindow = Query(TopWindow.hour),
+    size: int = Query(10, ge=1, le=100),
+):
+    return await TopLinksService().get_top(window, size)
+
+
+@router.get(
+    "/user/{user_id}/top/",
+    response_model=UrlTopSchema,
+    status_code=status.HTTP_200_OK,
+)
+async def get_top_urls_by_user(
+    user_id: UUID,
+    auth: OAuth,
+    window: TopWindow = Query(TopWindow.hour),
+    size: int = Query(10, ge=1, le=100),
+):
+    return await TopLinksService().get_top(window, size, user_id)
+
+
 @router.get("/{hash}/", response_model=UrlSchema, status_code=status.HTTP_200_OK)
 async def get_hash_url(
     hash: HashType,
@@ -46,14 +104,7 @@ async def get_hash_url(
     session=Depends(get_session),
 ):
     url_service = UrlService(session)
-    url_redirect_service = UrlRedirectService(session)
-
-    url = await url_service.get_url_by_hash(hash)
-    await url_redirect_service.create_redirection(
-        UrlRedirectCreateSchema(url_id=url.id)
-    )
-
-    return await url_service.get_url_by_hash(hash)
+    return await url_service.resolve_redirect(hash)
 
 
 @router.get(
@@ -66,27 +117,36 @@ async def get_urls_by_user(
     auth: OAuth,
     page: int = Query(1, ge=1),
     size: int = Query(10, ge=1, le=100),
+    cursor: str | None = Query(None),
+    with_total: bool = Query(False),
     session=Depends(get_session_repeatable_read),
 ):
     url_service = UrlService(session)
+    if cursor is not None:
+        return await url_service.get_urls_by_user_after(
+            user_id, cursor, size, with_total
+        )
     return await url_service.get_paginated_urls_by_user(user_id, page, size)
 
 
 @hash_router.get(
-    "/{hash}/", response_model=None, status_code=status.HTTP_307_TEMPORARY_REDIRECT
+    "/{hash}/",
+    response_model=None,
+    status_code=status.HTTP_307_TEMPORARY_REDIRECT,
+    dependencies=[limit_by_client(RateLimitScope.redirect)],
 )
 async def redirect_on_url(
     hash: HashType,
+    request: Request,
     session=Depends(get_session),
 ):
     url_service = UrlService(session)
-    url_redirect_service = UrlRedirectService(session)
-
-    url = await url_service.get_url_by_hash(hash)
-    await url_redirect_service.create_redirection(
-        UrlRedirectCreateSchema(url_id=url.id)
+    url = await url_service.resolve_redirect(
+        hash,
+        referrer=request.headers.get("referer"),
+        user_agent=request.headers.get("user-agent"),
+        client_ip=request.client.host if request.client else None,
     )
-
     return RedirectResponse(url.url)
 
 
@@ -99,10 +159,94 @@ async def get_statistic_by_url(
     url_id: UUID,
     data: UrlRedirectRequestSchema,
     auth: OAuth,
+    include_redirections: bool = Query(False),
+    page: int = Query(1, ge=1),
+    size: int = Query(100, ge=1, le=1000),
     session=Depends(get_session_repeatable_read),
 ):
     url_redirect_service = UrlRedirectService(session)
-    return await url_redirect_service.get_redirects_by_url_id(url_id, data)
+    if not include_redirections:
+        return await url_redirect_service.get_redirects_by_url_id(url_id, data)
+    return await url_redirect_service.get_redirects_by_url_id(url_id, data, page, size)
+
+
+@router.post(
+    "/statistic/{url_id}/buckets",
+    response_model=UrlRedirectBucketStatisticSchema,
+    status_code=status.HTTP_200_OK,
+)
+async def get_bucket_statistic_by_url(
+    url_id: UUID,
+    data: UrlRedirectBucketRequestSchema,
+    auth: OAuth,
+    session=Depends(get_session),
+):
+    url_redirect_service = UrlRedirectService(session)
+    return await url_redirect_service.get_redirect_buckets_by_url_id(url_id, data)
+
+
+@router.post(
+    "/statistic/{url_id}/visitors",
+    response_model=UrlVisitorStatisticSchema,
+    status_code=status.HTTP_200_OK,
+)
+async def get_visitor_statistic_by_url(
+    url_id: UUID,
+    data: UrlRedirectRequestSchema,
+    auth: OAuth,
+    session=Depends(get_session),
+):
+    url_redirect_service = UrlRedirectService(session)
+    return await url_redirect_service.get_unique_visitors_by_url_id(url_id, data)
+
+
+@router.post(
+    "/statistic/{url_id}/export",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def export_statistic_by_url(
+    url_id: UUID,
+    data: UrlRedirectRequestSchema,
+    auth: OAuth,
+    format: ExportFormat = Query(ExportFormat.ndjson),
+    compress: bool = Query(False),
+    session=Depends(get_session),
+):
+    url_redirect_service = UrlRedirectService(session)
+    chunks = await url_redirect_service.export_redirects(
+        data, format, compress, url_id=url_id
+    )
+    return _export_response(chunks, f"redirects-{url_id}", format, compress)
+
+
+@router.post(
+    "/user/{user_id}/statistic/export",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def export_statistic_by_user(
+    user_id: UUID,
+    data: UrlRedirectRequestSchema,
+    auth: OAuth,
+    format: ExportFormat = Query(ExportFormat.ndjson),
+    compress: bool = Query(False),
+    session=Depends(get_session),
+):
+    url_redirect_service = UrlRedirectService(session)
+    chunks = await url_redirect_service.export_redirects(
+        data, format, compress, user_id=user_id
+    )
+    return _export_response(chunks, f"redirects-{user_id}", format, compress)
+
+
+def _export_response(
+    chunks, filename: str, format: ExportFormat, compress: bool
+) -> StreamingResponse:
+    headers = {"Content-Disposition": f'attachment; filename="{filename}.{format}"'}
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(chunks, media_type=format.media_type, headers=headers)
 
 
 @router.put("/{url_id}/", response_model=UrlSchema, status_code=status.HTTP_200_OK)
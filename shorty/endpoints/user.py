@@ -23,7 +23,7 @@ async def create_user(
 
     user = await user_service.create_user(data)
 
-    access_token = auth_service.emit_access_token(user.email)
+    access_token = auth_service.emit_access_token(user.email, user.id)
     refresh_token = await auth_service.emit_refresh_token(user.email, user.id)
 
     response.set_cookie("access_token", access_token, httponly=True)
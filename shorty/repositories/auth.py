@@ -1,6 +1,7 @@
+from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy import func, select, update
+from sqlalchemy import delete, func, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from shorty.db.models.auth import Auth
@@ -44,7 +45,25 @@ class AuthRepository(SQLAlchemyRepository):
         stmt = (
             update(self.model)
             .where(self.model.refresh_token == token)
+            .where(self.model.revoked == False)
             .values(revoked=True)
         )
         await self._session.execute(stmt)
         await self._session.commit()
+
+    async def delete_stale(self, expired_before: datetime, limit: int) -> int:
+        locked = (
+            select(self.model.id)
+            .where(
+                or_(
+                    self.model.revoked == True,
+                    self.model.expired_at < expired_before,
+                )
+            )
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = delete(self.model).where(self.model.id.in_(locked))
+        count = (await self._session.execute(stmt)).rowcount
+        await self._session.commit()
+        return count
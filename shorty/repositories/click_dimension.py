@@ -0,0 +1,46 @@
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shorty.db.models.referrer_domain import ReferrerDomain
+from shorty.db.models.user_agent_family import UserAgentFamily
+from shorty.repositories.base import SQLAlchemyRepository
+
+
+class ClickDimensionRepository(SQLAlchemyRepository):
+
+    def __init__(self, session: AsyncSession) -> None:
+        super().__init__(session)
+
+    async def get_ids(self, names: set[str]) -> dict[str, int]:
+        if not names:
+            return {}
+        stmt = select(self.model.name, self.model.id).where(self.model.name.in_(names))
+        ids = dict((await self._session.execute(stmt)).all())
+
+        missing = names - ids.keys()
+        if missing:
+            # concurrent writers may insert the same name, those rows are
+            # skipped here and picked up by the select below
+            stmt = (
+                insert(self.model)
+                .values([{"name": name} for name in sorted(missing)])
+                .on_conflict_do_nothing(index_elements=[self.model.name])
+                .returning(self.model.name, self.model.id)
+            )
+            ids.update((await self._session.execute(stmt)).all())
+            missing -= ids.keys()
+        if missing:
+            stmt = select(self.model.name, self.model.id).where(
+                self.model.name.in_(missing)
+            )
+            ids.update((await self._session.execute(stmt)).all())
+        return ids
+
+
+class UserAgentFamilyRepository(ClickDimensionRepository):
+    model = UserAgentFamily
+
+
+class ReferrerDomainRepository(ClickDimensionRepository):
+    model = ReferrerDomain
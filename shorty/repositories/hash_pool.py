@@ -0,0 +1,69 @@
+import uuid
+
+from sqlalchemy import Delete, Select, delete, exists, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shorty.db.models.hash_pool import HashPool
+from shorty.db.models.url import Url
+from shorty.repositories.base import SQLAlchemyRepository
+
+
+class HashPoolRepository(SQLAlchemyRepository):
+    model = HashPool
+
+    def __init__(self, session: AsyncSession) -> None:
+        super().__init__(session)
+
+    @classmethod
+    def _unused(cls) -> Select:
+        # a hash may end up both pooled and used, it is never handed out and
+        # discard_used removes it
+        return select(cls.model.id).where(~exists().where(Url.hash == cls.model.hash))
+
+    @classmethod
+    def claim_stmt(cls) -> Delete:
+        locked = (
+            cls._unused().limit(1).with_for_update(skip_locked=True).scalar_subquery()
+        )
+        return delete(cls.model).where(cls.model.id == locked).returning(cls.model.hash)
+
+    async def claim_many(self, count: int) -> list[str]:
+        locked = self._unused().limit(count).with_for_update(skip_locked=True)
+        stmt = (
+            delete(self.model)
+            .where(self.model.id.in_(locked))
+            .returning(self.model.hash)
+        )
+        return list((await self._session.scalars(stmt)).all())
+
+    async def get_count(self) -> int:
+        stmt = select(func.count()).select_from(self.model)
+        return await self._session.scalar(stmt)
+
+    async def fill(self, hashes: list[str]) -> int:
+        stmt1 = select(Url.hash).where(Url.hash.in_(hashes))
+        taken = set((await self._session.scalars(stmt1)).all())
+        free = [url_hash for url_hash in hashes if url_hash not in taken]
+        if not free:
+            return 0
+
+        stmt2 = (
+            insert(self.model)
+            .values([{"id": uuid.uuid4(), "hash": url_hash} for url_hash in free])
+            .on_conflict_do_nothing(index_elements=[self.model.hash])
+            .returning(self.model.id)
+        )
+        inserted = len((await self._session.scalars(stmt2)).all())
+        await self._session.commit()
+        return inserted
+
+    async def discard_used(self) -> int:
+        stmt = (
+            delete(self.model)
+            .where(exists().where(Url.hash == self.model.hash))
+            .returning(self.model.id)
+        )
+        discarded = len((await self._session.scalars(stmt)).all())
+        await self._session.commit()
+        return discarded
@@ -0,0 +1,49 @@
+from sqlalchemy import Double, cast, delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shorty.db.models.rate_limit import RateLimit
+from shorty.repositories.base import SQLAlchemyRepository
+
+
+class RateLimitRepository(SQLAlchemyRepository):
+    model = RateLimit
+
+    def __init__(self, session: AsyncSession) -> None:
+        super().__init__(session)
+
+    @staticmethod
+    def _now():
+        # the database clock is shared by every node
+        return cast(func.extract("epoch", func.now()), Double)
+
+    async def acquire(
+        self, key: str, interval: float, tolerance: float, cost: int
+    ) -> float:
+        # GCRA in one round trip, returns 0 when allowed, otherwise the
+        # seconds to wait; cost * interval must not exceed the tolerance
+        now = self._now()
+        increment = cost * interval
+        tat = func.greatest(self.model.tat, now) + increment
+        stmt = insert(self.model).values(id=key, tat=now + increment)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[self.model.id],
+            set_={"tat": tat},
+            where=tat - now <= tolerance,
+        ).returning(self.model.tat)
+        allowed = await self._session.scalar(stmt)
+        if allowed is not None:
+            await self._session.commit()
+            return 0.0
+        wait = await self._session.scalar(
+            select(tat - now - tolerance).where(self.model.id == key)
+        )
+        await self._session.commit()
+        # the row is only purged once its tat has passed, it cannot be gone
+        return wait if wait and wait > 0 else interval
+
+    async def purge(self) -> int:
+        stmt = delete(self.model).where(self.model.tat < self._now())
+        result = await self._session.execute(stmt)
+        await self._session.commit()
+        return result.rowcount
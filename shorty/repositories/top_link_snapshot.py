@@ -0,0 +1,58 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import delete, insert, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shorty.db.models.top_link_snapshot import TopLinkSnapshot
+from shorty.repositories.base import SQLAlchemyRepository
+
+
+class TopLinkSnapshotRepository(SQLAlchemyRepository):
+    model = TopLinkSnapshot
+
+    def __init__(self, session: AsyncSession) -> None:
+        super().__init__(session)
+
+    async def replace(self, instance_id: UUID, data: list[dict]) -> None:
+        await self._session.execute(
+            delete(self.model).where(self.model.instance_id == instance_id)
+        )
+        if data:
+            await self._session.execute(insert(self.model), data)
+        await self._session.commit()
+
+    async def get_others(
+        self, instance_id: UUID, user_id: UUID | None, window: str
+    ) -> list[bytes]:
+        if user_id is None:
+            user_filter = self.model.user_id.is_(None)
+        else:
+            user_filter = self.model.user_id == user_id
+        stmt = (
+            select(self.model.data)
+            .where(user_filter)
+            .where(self.model.window == window)
+            .where(self.model.instance_id != instance_id)
+        )
+        return list((await self._session.scalars(stmt)).all())
+
+    async def claim_orphaned(
+        self, instance_id: UUID, stale_before: datetime
+    ) -> list[TopLinkSnapshot]:
+        # each orphaned row is handed to exactly one claiming process
+        locked = (
+            select(self.model.id)
+            .where(self.model.instance_id != instance_id)
+            .where(
+                or_(
+                    self.model.released.is_(True),
+                    self.model.taken_at < stale_before,
+                )
+            )
+            .with_for_update(skip_locked=True)
+        )
+        stmt = delete(self.model).where(self.model.id.in_(locked)).returning(self.model)
+        result = (await self._session.scalars(stmt)).all()
+        await self._session.commit()
+        return list(result)
@@ -1,10 +1,14 @@
+import uuid
+from datetime import datetime
+from typing import AsyncIterator, Sequence
 from uuid import UUID
 
-from sqlalchemy import desc, func, select
+from sqlalchemy import delete, desc, func, insert, literal, or_, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from shorty.db.models.url import Url
+from shorty.db.models.url import Url, url_hash_seq
 from shorty.repositories.base import SQLAlchemyRepository
+from shorty.repositories.hash_pool import HashPoolRepository
 
 
 class UrlRepository(SQLAlchemyRepository):
@@ -17,11 +21,87 @@ class UrlRepository(SQLAlchemyRepository):
         stmt = select(self.model).where(self.model.hash == hash)
         return await self._session.scalar(stmt)
 
+    async def create_with_pooled_hash(self, data: dict) -> Url | None:
+        claimed = HashPoolRepository.claim_stmt().cte("claimed")
+        columns = self.model.__table__.c
+        stmt = (
+            insert(self.model)
+            .from_select(
+                ["id", *data, "hash"],
+                select(
+                    literal(uuid.uuid4(), columns.id.type),
+                    *(literal(value, columns[key].type) for key, value in data.items()),
+                    claimed.c.hash,
+                ),
+            )
+            .returning(self.model)
+        )
+        obj = await self._session.scalar(stmt)
+        await self._session.commit()
+        return obj
+
+    async def create_many(self, data: list[dict]) -> list[Url]:
+        stmt = insert(self.model).returning(self.model, sort_by_parameter_order=True)
+        result = (await self._session.scalars(stmt, data)).all()
+        await self._session.commit()
+        return list(result)
+
+    async def get_existing_hashes(self, hashes: list[str]) -> set[str]:
+        stmt = select(self.model.hash).where(self.model.hash.in_(hashes))
+        return set((await self._session.scalars(stmt)).all())
+
+    async def get_count(self) -> int:
+        stmt = select(func.count()).select_from(self.model)
+        return await self._session.scalar(stmt)
+
+    async def stream_hashes(
+        self, batch_size: int = 1000
+    ) -> AsyncIterator[Sequence[str]]:
+        stmt = select(self.model.hash).execution_options(yield_per=batch_size)
+        result = await self._session.stream_scalars(stmt)
+        async for partition in result.partitions():
+            yield partition
+
+    async def lock_existing_ids(self, ids: set[UUID]) -> set[UUID]:
+        stmt = (
+            select(self.model.id)
+            .where(self.model.id.in_(ids))
+            .with_for_update(key_share=True)
+        )
+        return set((await self._session.scalars(stmt)).all())
+
+    async def lease_hash_ids(self, count: int) -> list[int]:
+        stmt = select(url_hash_seq.next_value()).select_from(
+            func.generate_series(1, count)
+        )
+        return list((await self._session.scalars(stmt)).all())
+
+    async def delete_expired(self, expired_before: datetime, limit: int) -> list[str]:
+        locked = (
+            select(self.model.id)
+            .where(self.model.expired_at < expired_before)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            delete(self.model)
+            .where(self.model.id.in_(locked))
+            .returning(self.model.hash)
+        )
+        result = (await self._session.scalars(stmt)).all()
+        await self._session.commit()
+        return list(result)
+
     async def get_reserved_count(self) -> int:
         stmt = (
             select(func.count())
             .select_from(self.model)
-            .where(self.model.expired_at > func.now())
+            .where(
+                or_(
+                    self.model.expired_at.is_(None),
+                    self.model.expired_at > func.now(),
+                )
+            )
         )
         result = await self._session.scalar(stmt)
         return result
@@ -32,15 +112,33 @@ class UrlRepository(SQLAlchemyRepository):
         stmt1 = (
             select(self.model)
             .where(self.model.user_id == user_id)
-            .order_by(desc(self.model.updated_at))
+            .order_by(desc(self.model.updated_at), desc(self.model.id))
             .offset((page - 1) * size)
             .limit(size)
         )
-        stmt2 = (
+        result = await self._session.scalars(stmt1)
+        count = await self.get_count_by_user(user_id)
+        return count, result.all()
+
+    async def get_page_after(
+        self, user_id: UUID, size: int, after: tuple[datetime, UUID] | None = None
+    ) -> list[Url]:
+        stmt = (
+            select(self.model)
+            .where(self.model.user_id == user_id)
+            .order_by(desc(self.model.updated_at), desc(self.model.id))
+            .limit(size)
+        )
+        if after is not None:
+            stmt = stmt.where(
+                tuple_(self.model.updated_at, self.model.id) < tuple_(*after)
+            )
+        return (await self._session.scalars(stmt)).all()
+
+    async def get_count_by_user(self, user_id: UUID) -> int:
+        stmt = (
             select(func.count())
             .select_from(self.model)
             .where(self.model.user_id == user_id)
         )
-        result = await self._session.scalars(stmt1)
-        count = await self._session.scalar(stmt2)
-        return count, result.all()
+        return await self._session.scalar(stmt)
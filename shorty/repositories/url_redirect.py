@@ -1,11 +1,73 @@
-from datetime import datetime
+import re
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Sequence
 from uuid import UUID
 
-from sqlalchemy import desc, select
+from sqlalchemy import (
+    DateTime,
+    Row,
+    String,
+    and_,
+    column,
+    desc,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    text,
+    true,
+    values,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
+from shorty.db.models.referrer_domain import ReferrerDomain
+from shorty.db.models.url import Url
 from shorty.db.models.url_redirect import UrlRedirect
+from shorty.db.models.url_redirect_rollup import UrlRedirectRollup
+from shorty.db.models.user_agent_family import UserAgentFamily
 from shorty.repositories.base import SQLAlchemyRepository
+from shorty.utils.enums import RollupGranularity
+
+_PARTITION_LOCK_KEY = 0x75726C72
+_PARTITION_BOUND = re.compile(r"FOR VALUES FROM \('([^']+)'\) TO \('([^']+)'\)")
+
+
+def _split_window(
+    started_at: datetime,
+    ended_at: datetime,
+    granularities: tuple[RollupGranularity, ...] = (
+        RollupGranularity.day,
+        RollupGranularity.hour,
+        RollupGranularity.minute,
+    ),
+) -> tuple[
+    list[tuple[RollupGranularity, datetime, datetime]], list[tuple[datetime, datetime]]
+]:
+    """Splits [started_at, ended_at) into the fewest whole rollup buckets.
+
+    Returns the (granularity, start, end) ranges of buckets and the raw
+    ranges left over at the edges, each shorter than a minute.
+    """
+    if started_at >= ended_at:
+        return [], []
+    if not granularities:
+        return [], [(started_at, ended_at)]
+    granularity, finer = granularities[0], granularities[1:]
+    start = granularity.truncate(started_at)
+    if start < started_at:
+        start += granularity.interval
+    end = granularity.truncate(ended_at)
+    if start >= end:
+        return _split_window(started_at, ended_at, finer)
+    head_buckets, head_raw = _split_window(started_at, start, finer)
+    tail_buckets, tail_raw = _split_window(end, ended_at, finer)
+    return (
+        [*head_buckets, (granularity, start, end), *tail_buckets],
+        [*head_raw, *tail_raw],
+    )
 
 
 class UrlRedirectRepository(SQLAlchemyRepository):
@@ -15,15 +77,218 @@ class UrlRedirectRepository(SQLAlchemyRepository):
         super().__init__(session)
 
     async def get_redirections_by_url_id(
-        self, url_id: UUID, started_at: datetime, ended_at: datetime
+        self,
+        url_id: UUID,
+        started_at: datetime,
+        ended_at: datetime,
+        page: int | None = None,
+        size: int | None = None,
     ) -> tuple[int, list[UrlRedirect]]:
-        stmt1 = (
+        count = await self.count_redirections(url_id, started_at, ended_at)
+        if page is None or size is None:
+            return count, []
+
+        stmt2 = (
             select(self.model)
             .where(self.model.url_id == url_id)
             .where(self.model.created_at <= ended_at)
             .where(self.model.created_at >= started_at)
             .order_by(desc(self.model.created_at))
+            .offset((page - 1) * size)
+            .limit(size)
+        )
+        result = (await self._session.scalars(stmt2)).all()
+
+        return count, result
+
+    async def count_redirections(
+        self, url_id: UUID, started_at: datetime, ended_at: datetime
+    ) -> int:
+        # whole minutes, hours and days are read from the rollups, only the
+        # seconds at the edges of the window from the redirects themselves;
+        # the end is inclusive, timestamps have microsecond precision
+        buckets, edges = _split_window(started_at, ended_at + timedelta(microseconds=1))
+        total = literal(0)
+        if buckets:
+            rollups = (
+                select(func.coalesce(func.sum(UrlRedirectRollup.count), 0))
+                .where(UrlRedirectRollup.url_id == url_id)
+                .where(
+                    or_(
+                        *(
+                            and_(
+                                UrlRedirectRollup.granularity == granularity,
+                                UrlRedirectRollup.bucket >= start,
+                                UrlRedirectRollup.bucket < end,
+                            )
+                            for granularity, start, end in buckets
+                        )
+                    )
+                )
+            )
+            total = total + rollups.scalar_subquery()
+        if edges:
+            redirects = (
+                select(func.count())
+                .select_from(self.model)
+                .where(self.model.url_id == url_id)
+                .where(
+                    or_(
+                        *(
+                            and_(
+                                self.model.created_at >= start,
+                                self.model.created_at < end,
+                            )
+                            for start, end in edges
+                        )
+                    )
+                )
+            )
+            total = total + redirects.scalar_subquery()
+        return int(await self._session.scalar(select(total)))
+
+    async def stream_redirections(
+        self,
+        started_at: datetime,
+        ended_at: datetime,
+        url_id: UUID | None = None,
+        user_id: UUID | None = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[Sequence[Row]]:
+        # server side cursor: only one batch of rows is held in memory at a time
+        stmt = (
+            select(
+                self.model.id,
+                self.model.url_id,
+                self.model.created_at,
+                self.model.country,
+                UserAgentFamily.name,
+                ReferrerDomain.name,
+            )
+            .outerjoin(UserAgentFamily)
+            .outerjoin(ReferrerDomain)
+            .where(self.model.created_at <= ended_at)
+            .where(self.model.created_at >= started_at)
+            .order_by(self.model.created_at, self.model.id)
+            .execution_options(yield_per=batch_size)
+        )
+        if url_id is not None:
+            stmt = stmt.where(self.model.url_id == url_id)
+        if user_id is not None:
+            stmt = stmt.join(Url, Url.id == self.model.url_id).where(
+                Url.user_id == user_id
+            )
+        result = await self._session.stream(stmt)
+        async for partition in result.partitions():
+            yield partition
+
+    async def resolve_and_record(self, url_hash: str, now: datetime) -> Url | None:
+        # resolves the hash and, unless the url has expired, records the
+        # redirect and bumps its rollups in a single round trip
+        url = select(Url).where(Url.hash == url_hash).cte("resolved")
+        live = (
+            select(url.c.id)
+            .where(or_(url.c.expired_at.is_(None), url.c.expired_at > now))
+            .cte("live")
+        )
+        redirect = (
+            insert(self.model)
+            .from_select(
+                ["id", "url_id", "created_at", "updated_at"],
+                select(func.gen_random_uuid(), live.c.id, literal(now), literal(now)),
+            )
+            .cte("redirect")
+        )
+        buckets = values(
+            column("granularity", String), column("bucket", DateTime), name="buckets"
+        ).data([(g.value, g.truncate(now)) for g in RollupGranularity])
+        rollup_insert = pg_insert(UrlRedirectRollup).from_select(
+            ["id", "url_id", "granularity", "bucket", "count"],
+            select(
+                func.gen_random_uuid(),
+                live.c.id,
+                buckets.c.granularity,
+                buckets.c.bucket,
+                literal(1),
+            )
+            .select_from(live)
+            .join(buckets, true()),
+        )
+        rollup = rollup_insert.on_conflict_do_update(
+            index_elements=[
+                UrlRedirectRollup.url_id,
+                UrlRedirectRollup.granularity,
+                UrlRedirectRollup.bucket,
+            ],
+            set_={"count": UrlRedirectRollup.count + rollup_insert.excluded.count},
+        ).cte("rollup")
+        stmt = select(aliased(Url, url)).add_cte(redirect).add_cte(rollup)
+        return await self._session.scalar(stmt)
+
+    async def create_many(self, data: list[dict]) -> None:
+        await self._session.execute(insert(self.model), data)
+
+    async def get_partitions(self) -> list[tuple[str, datetime, datetime]]:
+        stmt = text(
+            "SELECT child.relname, pg_get_expr(child.relpartbound, child.oid) "
+            "FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = :table"
+        )
+        partitions = []
+        for name, bound in await self._session.execute(
+            stmt, {"table": self.model.__tablename__}
+        ):
+            # the default partition has no range and is never returned
+            match = _PARTITION_BOUND.match(bound)
+            if match:
+                start, end = match.groups()
+                partitions.append(
+                    (name, datetime.fromisoformat(start), datetime.fromisoformat(end))
+                )
+        return sorted(partitions, key=lambda partition: partition[1])
+
+    async def create_partition(self, name: str, start: datetime, end: datetime) -> None:
+        table = self.model.__tablename__
+        default = f"{table}_default"
+        start, end = start.isoformat(" "), end.isoformat(" ")
+        in_range = f"created_at >= '{start}' AND created_at < '{end}'"
+        create = (
+            f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{start}') TO ('{end}')"
+        )
+        # serializes the partition maintenance of concurrent workers
+        await self._session.execute(
+            select(func.pg_advisory_xact_lock(_PARTITION_LOCK_KEY))
+        )
+        misplaced = await self._session.scalar(
+            text(f"SELECT EXISTS (SELECT 1 FROM {default} WHERE {in_range})")
+        )
+        if not misplaced:
+            await self._session.execute(text(create))
+            await self._session.commit()
+            return
+
+        # the range cannot be created while the default partition holds rows
+        # of it, they are moved to the new partition in the same transaction
+        columns = ", ".join(column.name for column in self.model.__table__.columns)
+        await self._session.execute(
+            text(f"ALTER TABLE {table} DETACH PARTITION {default}")
+        )
+        await self._session.execute(text(create))
+        await self._session.execute(
+            text(
+                f"WITH moved AS (DELETE FROM {default} WHERE {in_range} "
+                f"RETURNING {columns}) "
+                f"INSERT INTO {name} ({columns}) SELECT {columns} FROM moved"
+            )
+        )
+        await self._session.execute(
+            text(f"ALTER TABLE {table} ATTACH PARTITION {default} DEFAULT")
         )
-        result = (await self._session.scalars(stmt1)).all()
+        await self._session.commit()
 
-        return len(result), result
+    async def drop_partition(self, name: str) -> None:
+        await self._session.execute(text(f"DROP TABLE IF EXISTS {name}"))
+        await self._session.commit()
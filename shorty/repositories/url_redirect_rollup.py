@@ -0,0 +1,46 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shorty.db.models.url_redirect_rollup import UrlRedirectRollup
+from shorty.repositories.base import SQLAlchemyRepository
+from shorty.utils.enums import RollupGranularity
+
+
+class UrlRedirectRollupRepository(SQLAlchemyRepository):
+    model = UrlRedirectRollup
+
+    def __init__(self, session: AsyncSession) -> None:
+        super().__init__(session)
+
+    async def increment_many(self, data: list[dict]) -> None:
+        stmt = insert(self.model).values(data)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                self.model.url_id,
+                self.model.granularity,
+                self.model.bucket,
+            ],
+            set_={"count": self.model.count + stmt.excluded.count},
+        )
+        await self._session.execute(stmt)
+
+    async def get_buckets(
+        self,
+        url_id: UUID,
+        granularity: RollupGranularity,
+        started_at: datetime,
+        ended_at: datetime,
+    ) -> list[UrlRedirectRollup]:
+        stmt = (
+            select(self.model)
+            .where(self.model.url_id == url_id)
+            .where(self.model.granularity == granularity)
+            .where(self.model.bucket >= granularity.truncate(started_at))
+            .where(self.model.bucket <= ended_at)
+            .order_by(self.model.bucket)
+        )
+        return (await self._session.scalars(stmt)).all()
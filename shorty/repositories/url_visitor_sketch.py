@@ -0,0 +1,81 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shorty.db.models.url_visitor_sketch import UrlVisitorSketch
+from shorty.repositories.base import SQLAlchemyRepository
+from shorty.utils.hyperloglog import HyperLogLog
+
+
+class UrlVisitorSketchRepository(SQLAlchemyRepository):
+    model = UrlVisitorSketch
+
+    def __init__(self, session: AsyncSession) -> None:
+        super().__init__(session)
+
+    async def merge_many(
+        self, sketches: dict[tuple[UUID, datetime], HyperLogLog]
+    ) -> None:
+        if not sketches:
+            return
+        # sorted so that concurrent flushes lock sketch rows in the same order
+        keys = sorted(sketches, key=lambda key: (str(key[0]), key[1]))
+        stmt = (
+            insert(self.model)
+            .values(
+                [
+                    {
+                        "url_id": url_id,
+                        "day": day,
+                        "sketch": sketches[url_id, day].to_bytes(),
+                    }
+                    for url_id, day in keys
+                ]
+            )
+            .on_conflict_do_nothing(index_elements=[self.model.url_id, self.model.day])
+            .returning(self.model.url_id, self.model.day)
+        )
+        inserted = set((await self._session.execute(stmt)).tuples().all())
+
+        existing = [key for key in keys if key not in inserted]
+        if not existing:
+            return
+        # sketches cannot be merged in sql, existing rows are locked, merged
+        # here and written back
+        stmt = (
+            select(self.model.id, self.model.url_id, self.model.day, self.model.sketch)
+            .where(tuple_(self.model.url_id, self.model.day).in_(existing))
+            .order_by(self.model.url_id, self.model.day)
+            .with_for_update()
+        )
+        rows = (await self._session.execute(stmt)).all()
+        await self._session.execute(
+            update(self.model),
+            [
+                {
+                    "id": id,
+                    "sketch": HyperLogLog.from_bytes(sketch)
+                    .merge(sketches[url_id, day])
+                    .to_bytes(),
+                }
+                for id, url_id, day, sketch in rows
+            ],
+        )
+
+    async def get_sketches(
+        self, url_id: UUID, started_at: datetime, ended_at: datetime
+    ) -> list[tuple[datetime, HyperLogLog]]:
+        stmt = (
+            select(self.model.day, self.model.sketch)
+            .where(self.model.url_id == url_id)
+            .where(self.model.day >= started_at)
+            .where(self.model.day <= ended_at)
+            .order_by(self.model.day)
+        )
+        return [
+            (day, HyperLogLog.from_bytes(sketch))
+            for day, sketch in await self._session.execute(stmt)
+        ]
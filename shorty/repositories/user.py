@@ -1,4 +1,6 @@
-from sqlalchemy import select
+from uuid import UUID
+
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from shorty.db.models.user import User
@@ -14,3 +16,14 @@ class UserRepository(SQLAlchemyRepository):
     async def get_by_email(self, email: str) -> User | None:
         stmt = select(self.model).where(self.model.email == email)
         return await self._session.scalar(stmt)
+
+    async def increment_token_version(self, user_id: UUID) -> int | None:
+        stmt = (
+            update(self.model)
+            .where(self.model.id == user_id)
+            .values(token_version=self.model.token_version + 1)
+            .returning(self.model.token_version)
+        )
+        version = await self._session.scalar(stmt)
+        await self._session.commit()
+        return version
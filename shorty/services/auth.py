@@ -2,7 +2,6 @@ from datetime import datetime, timedelta
 from uuid import UUID
 
 import jwt
-from passlib.context import CryptContext
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from shorty.config import config
@@ -12,31 +11,39 @@ from shorty.db.schemas.auth import (
     RevokedTokensSchema,
     TokensSchema,
 )
-from shorty.db.schemas.user import UserSchema
+from shorty.db.schemas.user import UserInDB, UserSchema
 from shorty.repositories.auth import AuthRepository
 from shorty.repositories.user import UserRepository
+from shorty.services.cache_invalidation import cache_invalidator
+from shorty.services.security import security_context
+from shorty.utils.cache import TTLCache
 from shorty.utils.enums import TokenType
 from shorty.utils.exceptions import GoneError, NotFoundError, UnauthorizedError
-from shorty.utils.singleton import SingletonMeta
+
+user_cache: TTLCache[UUID, UserInDB] = TTLCache(
+    maxsize=config.app.user_cache_size, ttl=config.app.user_cache_ttl
+)
+cache_invalidator.register("user", user_cache, UUID)
 
 
-class AuthService(metaclass=SingletonMeta):
+class AuthService:
 
     def __init__(self, session: AsyncSession):
-        self._context = CryptContext(
-            schemes=[config.app.encrypt_type], deprecated="auto"
-        )
         self._session = session
         self._repository = AuthRepository(self._session)
 
-    def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        return self._context.verify(plain_password, hashed_password)
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        return await security_context.verify_password(plain_password, hashed_password)
 
-    def get_hash_password(self, plain_password: str) -> str:
-        return self._context.hash(plain_password)
+    async def get_hash_password(self, plain_password: str) -> str:
+        return await security_context.hash_password(plain_password)
 
     def _emit_new_token(
-        self, username: str, token_type: TokenType, exp: datetime | None = None
+        self,
+        username: str,
+        token_type: TokenType,
+        exp: datetime | None = None,
+        claims: dict | None = None,
     ) -> str:
         if not exp:
             if token_type == TokenType.access:
@@ -52,14 +59,18 @@ class AuthService(metaclass=SingletonMeta):
             "sub": username,
             "exp": exp,
             "type": token_type,
+            **(claims or {}),
         }
-        encoded_jwt = jwt.encode(
-            data, config.app.secret_key, algorithm=config.app.hash_algorithm
-        )
-        return encoded_jwt
+        return security_context.encode_token(data)
 
-    def emit_access_token(self, username: str) -> str:
-        return self._emit_new_token(username, TokenType.access.value)
+    def emit_access_token(
+        self, username: str, user_id: UUID, token_version: int = 0
+    ) -> str:
+        return self._emit_new_token(
+            username,
+            TokenType.access.value,
+            claims={"uid": str(user_id), "ver": token_version},
+        )
 
     async def revoke_refresh_token(self, token: str) -> None:
         if not await self._repository.get_by_token(token):
@@ -68,13 +79,23 @@ class AuthService(metaclass=SingletonMeta):
 
     async def revoke_tokens_by_user_id(self, user: UserSchema) -> RevokedTokensSchema:
         count = await self._repository.revoke_tokens_by_user_id(user.id)
+        # outstanding access tokens carry the old version and stop validating
+        await UserRepository(self._session).increment_token_version(user.id)
+        await cache_invalidator.invalidate(self._session, "user", [user.id])
         return RevokedTokensSchema(revoked_count=count)
 
-    async def emit_refresh_token(self, username: str, user_id: UUID) -> str:
+    async def emit_refresh_token(
+        self, username: str, user_id: UUID, token_version: int = 0
+    ) -> str:
         exp = datetime.now() + timedelta(seconds=config.app.refresh_token_expire)
         token = RefreshTokenCreateSchema(
             expired_at=exp,
-            refresh_token=self._emit_new_token(username, TokenType.refresh.value, exp),
+            refresh_token=self._emit_new_token(
+                username,
+                TokenType.refresh.value,
+                exp,
+                claims={"uid": str(user_id), "ver": token_version},
+            ),
             user_id=user_id,
         )
         await self.create_refresh_token(token)
@@ -108,7 +129,7 @@ class AuthService(metaclass=SingletonMeta):
         if not user:
             raise NotFoundError(f"user not found by id: {data.user_id}")
 
-        return self.emit_access_token(user.email)
+        return self.emit_access_token(user.email, user.id, user.token_version)
 
     async def create_tokens(self, username: str, password: str) -> TokensSchema:
         user_repository = UserRepository(self._session)
@@ -117,31 +138,54 @@ class AuthService(metaclass=SingletonMeta):
         if not user or not user.password:
             raise NotFoundError(f"user not found with username: {username}")
 
-        if not self.verify_password(password, user.password):
+        if not await self.verify_password(password, user.password):
             raise UnauthorizedError(f"incorrect password: {password}")
 
-        access_token = self.emit_access_token(username)
-        refresh_token = await self.emit_refresh_token(username, user.id)
+        access_token = self.emit_access_token(username, user.id, user.token_version)
+        refresh_token = await self.emit_refresh_token(
+            username, user.id, user.token_version
+        )
 
         return TokensSchema(access_token=access_token, refresh_token=refresh_token)
 
+    async def get_user_in_db(self, user_id: UUID) -> UserInDB:
+        user = user_cache.get(user_id)
+        if user is not None:
+            return user
+        user_repository = UserRepository(self._session)
+        db_user = await user_repository.get_by_id(user_id)
+        if not db_user:
+            raise NotFoundError(f"user not found by id: {user_id}")
+        user = UserInDB.model_validate(db_user, from_attributes=True)
+        user_cache.set(user_id, user)
+        return user
+
     async def validate_token(self, token: str, token_type: TokenType) -> UserSchema:
         try:
-            payload = jwt.decode(
-                token, config.app.secret_key, algorithms=[config.app.hash_algorithm]
-            )
+            payload = security_context.decode_token(token)
             username = payload.get("sub")
             token_scope = payload.get("type")
             if username is None:
                 raise UnauthorizedError("username not provided")
             if token_scope != token_type:
                 raise UnauthorizedError("Incorrect token type")
+            user_id = UUID(payload["uid"]) if "uid" in payload else None
 
-        except jwt.InvalidTokenError:
+        except (jwt.InvalidTokenError, ValueError):
             raise UnauthorizedError("invalid jwt token")
 
-        user_repository = UserRepository(self._session)
-        user = await user_repository.get_by_email(username)
-        if not user:
-            raise NotFoundError(f"user not found with email: {username}")
+        if config.app.stateless_auth and token_type == TokenType.access and user_id:
+            # served from the user cache, a revocation made by another process
+            # is picked up with its invalidation notification, within
+            # user_cache_ttl at the latest
+            user = await self.get_user_in_db(user_id)
+        else:
+            user_repository = UserRepository(self._session)
+            db_user = await user_repository.get_by_email(username)
+            if not db_user:
+                raise NotFoundError(f"user not found with email: {username}")
+            user = UserInDB.model_validate(db_user, from_attributes=True)
+
+        if payload.get("ver", 0) != user.token_version:
+            raise UnauthorizedError("token has been revoked")
         return UserSchema.model_validate(user, from_attributes=True)
@@ -0,0 +1,190 @@
+import asyncio
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Iterable
+
+import asyncpg
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shorty.config import config
+from shorty.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# NOTIFY payloads are limited to 8000 bytes
+_KEYS_PER_NOTIFICATION = 100
+_APPLICATION_NAME = "shorty-cache-listener"
+
+
+@dataclass
+class CacheInvalidatorStats:
+    connected: bool
+    received: int
+    reconnects: int
+    resyncs: int
+
+
+class CacheInvalidator:
+    """Keeps the in-process caches of every worker coherent.
+
+    A background task holds one dedicated connection that LISTENs on the
+    invalidation `channel` and on every subscribed channel, e.g. the
+    `url_changed` channel fed by the trigger on the url table. When the
+    connection is lost it reconnects with exponential backoff, and since
+    notifications sent in the meantime are gone, every registered cache is
+    flushed, and the resync listeners called, once the listener is connected
+    again.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        channel: str,
+        min_backoff: float,
+        max_backoff: float,
+        ping_interval: float,
+    ):
+        self._dsn = dsn
+        self.channel = channel
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.ping_interval = ping_interval
+        self._caches: dict[str, tuple[TTLCache, Callable[[str], Hashable]]] = {}
+        self._subscribers: dict[str, list[Callable[[str], None]]] = {
+            channel: [self._on_invalidation]
+        }
+        self._resync_listeners: list[Callable[[], None]] = []
+        self._task: asyncio.Task | None = None
+        self._backoff = min_backoff
+        self.connected = asyncio.Event()
+        self.received = 0
+        self.reconnects = 0
+        self.resyncs = 0
+
+    def register(
+        self, name: str, cache: TTLCache, parse_key: Callable[[str], Hashable] = str
+    ) -> None:
+        self._caches[name] = (cache, parse_key)
+
+    def subscribe(self, channel: str, callback: Callable[[str], None]) -> None:
+        self._subscribers.setdefault(channel, []).append(callback)
+
+    def add_resync_listener(self, callback: Callable[[], None]) -> None:
+        self._resync_listeners.append(callback)
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def stats(self) -> CacheInvalidatorStats:
+        return CacheInvalidatorStats(
+            connected=self.connected.is_set(),
+            received=self.received,
+            reconnects=self.reconnects,
+            resyncs=self.resyncs,
+        )
+
+    async def invalidate(
+        self, session: AsyncSession, name: str, keys: Iterable[Any]
+    ) -> None:
+        keys = [str(key) for key in keys]
+        # a process without the cache, e.g. the standalone worker, still has
+        # to tell the others
+        if name in self._caches:
+            cache, parse_key = self._caches[name]
+            for key in keys:
+                cache.invalidate(parse_key(key))
+        for i in range(0, len(keys), _KEYS_PER_NOTIFICATION):
+            payload = json.dumps(
+                {"cache": name, "keys": keys[i : i + _KEYS_PER_NOTIFICATION]}
+            )
+            await session.execute(select(func.pg_notify(self.channel, payload)))
+        # notifications are only delivered once the transaction commits
+        await session.commit()
+
+    def resync(self) -> None:
+        for cache, _ in self._caches.values():
+            cache.clear()
+        for callback in self._resync_listeners:
+            callback()
+        self.resyncs += 1
+
+    def _on_invalidation(self, payload: str) -> None:
+        message = json.loads(payload)
+        if message["cache"] not in self._caches:
+            return
+        cache, parse_key = self._caches[message["cache"]]
+        for key in message["keys"]:
+            cache.invalidate(parse_key(key))
+
+    def _dispatch(self, connection, pid: int, channel: str, payload: str) -> None:
+        self.received += 1
+        for callback in self._subscribers.get(channel, []):
+            try:
+                callback(payload)
+            except Exception:
+                logger.exception(
+                    "failed to handle %s notification: %s", channel, payload
+                )
+
+    async def start(self) -> None:
+        if self.is_running:
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        task, self._task = self._task, None
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def _run(self) -> None:
+        self._backoff = self.min_backoff
+        while True:
+            try:
+                await self._listen()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("cache invalidation listener failed")
+            self.reconnects += 1
+            await asyncio.sleep(self._backoff)
+            self._backoff = min(self._backoff * 2, self.max_backoff)
+
+    async def _listen(self) -> None:
+        connection = await asyncpg.connect(
+            self._dsn, server_settings={"application_name": _APPLICATION_NAME}
+        )
+        lost = asyncio.Event()
+        connection.add_termination_listener(lambda _: lost.set())
+        try:
+            for channel in self._subscribers:
+                await connection.add_listener(channel, self._dispatch)
+            # anything published before we listened is unknown, start clean
+            self.resync()
+            self.connected.set()
+            self._backoff = self.min_backoff
+            while not lost.is_set():
+                try:
+                    await asyncio.wait_for(lost.wait(), timeout=self.ping_interval)
+                except asyncio.TimeoutError:
+                    # a silently dropped connection only shows up on use
+                    await connection.execute("SELECT 1", timeout=self.ping_interval)
+        finally:
+            self.connected.clear()
+            connection.terminate()
+
+
+cache_invalidator = CacheInvalidator(
+    config.postgres.get_dsn_plain,
+    channel=config.app.cache_invalidation_channel,
+    min_backoff=config.app.cache_listener_min_backoff,
+    max_backoff=config.app.cache_listener_max_backoff,
+    ping_interval=config.app.cache_listener_ping_interval,
+)
@@ -0,0 +1,84 @@
+import asyncio
+import logging
+from datetime import datetime
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shorty.config import config
+from shorty.db.schemas.capacity import CapacitySchema
+from shorty.db.session import SessionManager, session_manager
+from shorty.repositories.url import UrlRepository
+
+logger = logging.getLogger(__name__)
+
+
+class ReservationCounter:
+    """Approximate number of reserved hashes.
+
+    Incremented by every create in this process and reconciled with a
+    COUNT(*) on the url table every `refresh_interval` seconds.
+    """
+
+    def __init__(self, session_manager: SessionManager, refresh_interval: float):
+        self._session_manager = session_manager
+        self.refresh_interval = refresh_interval
+        self.value: int | None = None
+        self.refreshed_at: datetime | None = None
+        self._task: asyncio.Task | None = None
+
+    def increment(self, count: int = 1) -> None:
+        if self.value is not None:
+            self.value += count
+
+    async def get(self, session: AsyncSession) -> int:
+        if self.value is None:
+            await self.refresh(session)
+        return self.value
+
+    async def refresh(self, session: AsyncSession) -> None:
+        self.value = await UrlRepository(session).get_reserved_count()
+        self.refreshed_at = datetime.now()
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        task, self._task = self._task, None
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                async with self._session_manager.session() as session:
+                    await self.refresh(session)
+            except Exception:
+                logger.exception("reservation count refresh failed")
+            await asyncio.sleep(self.refresh_interval)
+
+
+class CapacityService:
+
+    def __init__(self, session: AsyncSession):
+        self._session = session
+
+    async def get_capacity(self) -> CapacitySchema:
+        reserved = await reservation_counter.get(self._session)
+        total = config.app.get_combinations_count
+        return CapacitySchema(
+            reserved_count=reserved,
+            total_count=total,
+            utilisation=reserved / total,
+            refreshed_at=reservation_counter.refreshed_at,
+        )
+
+
+reservation_counter = ReservationCounter(
+    session_manager, refresh_interval=config.app.capacity_refresh_interval
+)
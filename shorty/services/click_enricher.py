@@ -0,0 +1,108 @@
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shorty.config import config
+from shorty.repositories.click_dimension import (
+    ClickDimensionRepository,
+    ReferrerDomainRepository,
+    UserAgentFamilyRepository,
+)
+from shorty.utils.cache import TTLCache
+from shorty.utils.clicks import hash_ip, parse_referrer_domain, parse_user_agent_family
+from shorty.utils.geoip import GeoIPDatabase
+
+logger = logging.getLogger(__name__)
+
+
+class ClickEnricher:
+    """Turns the raw request data recorded with a click into compact columns.
+
+    Runs in the click ingestor before a batch is written, so parsing and
+    dictionary lookups never happen on the redirect path.
+    """
+
+    def __init__(
+        self,
+        geoip: GeoIPDatabase | None,
+        ip_hash_key: bytes,
+        dimension_cache_size: int,
+    ):
+        self._geoip = geoip
+        self._ip_hash_key = ip_hash_key
+        # dictionary ids never change, entries only leave the cache by eviction
+        self.user_agent_families: TTLCache[str, int] = TTLCache(
+            maxsize=dimension_cache_size, ttl=float("inf")
+        )
+        self.referrer_domains: TTLCache[str, int] = TTLCache(
+            maxsize=dimension_cache_size, ttl=float("inf")
+        )
+
+    async def enrich(self, session: AsyncSession, batch: list[dict]) -> None:
+        for row in batch:
+            ip = row.pop("client_ip", None)
+            row["user_agent_family_id"] = parse_user_agent_family(
+                row.pop("user_agent", None)
+            )
+            row["referrer_domain_id"] = parse_referrer_domain(row.pop("referrer", None))
+            row["country"] = self._geoip.lookup(ip) if self._geoip and ip else None
+            row["ip_hash"] = hash_ip(ip, self._ip_hash_key) if ip else None
+
+        await self._encode(
+            batch,
+            "user_agent_family_id",
+            self.user_agent_families,
+            UserAgentFamilyRepository(session),
+        )
+        await self._encode(
+            batch,
+            "referrer_domain_id",
+            self.referrer_domains,
+            ReferrerDomainRepository(session),
+        )
+
+    @staticmethod
+    async def _encode(
+        batch: list[dict],
+        key: str,
+        cache: TTLCache[str, int],
+        repository: ClickDimensionRepository,
+    ) -> None:
+        ids = {}
+        missing = set()
+        for name in {row[key] for row in batch if row[key] is not None}:
+            id = cache.get(name)
+            if id is None:
+                missing.add(name)
+            else:
+                ids[name] = id
+        for name, id in (await repository.get_ids(missing)).items():
+            cache.set(name, id)
+            ids[name] = id
+        for row in batch:
+            if row[key] is not None:
+                row[key] = ids[row[key]]
+
+
+def _load_geoip() -> GeoIPDatabase | None:
+    if not config.app.geoip_path:
+        return None
+    try:
+        geoip = GeoIPDatabase.from_csv(config.app.geoip_path)
+    except (OSError, ValueError):
+        logger.exception("failed to load geoip database %s", config.app.geoip_path)
+        return None
+    if geoip.skipped:
+        logger.warning(
+            "skipped %s malformed rows of geoip database %s",
+            geoip.skipped,
+            config.app.geoip_path,
+        )
+    return geoip
+
+
+click_enricher = ClickEnricher(
+    _load_geoip(),
+    ip_hash_key=config.app.secret_key.encode()[:64],
+    dimension_cache_size=config.app.click_dimension_cache_size,
+)
@@ -0,0 +1,211 @@
+import asyncio
+import logging
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shorty.config import config
+from shorty.db.schemas.url_redirect import UrlRedirectCreateSchema
+from shorty.db.session import SessionManager, session_manager
+from shorty.repositories.url import UrlRepository
+from shorty.repositories.url_redirect import UrlRedirectRepository
+from shorty.repositories.url_redirect_rollup import UrlRedirectRollupRepository
+from shorty.repositories.url_visitor_sketch import UrlVisitorSketchRepository
+from shorty.services.click_enricher import ClickEnricher, click_enricher
+from shorty.utils.enums import RollupGranularity
+from shorty.utils.hyperloglog import HyperLogLog
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+@dataclass
+class ClickIngestorStats:
+    queued: int
+    flushed: int
+    dropped: int
+    failed: int
+
+
+class ClickIngestor:
+    """Buffers redirect clicks in memory and writes them to the database in batches.
+
+    `record` never waits for the database: when the queue is full the click is
+    dropped and counted, so redirect latency does not depend on write latency.
+    Raw request data is parsed by the enricher when the batch is flushed.
+    """
+
+    def __init__(
+        self,
+        session_manager: SessionManager,
+        enricher: ClickEnricher,
+        max_batch_size: int,
+        max_delay: float,
+        max_queue_size: int,
+        drain_timeout: float,
+    ):
+        self._session_manager = session_manager
+        self._enricher = enricher
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.drain_timeout = drain_timeout
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self._task: asyncio.Task | None = None
+        self.flushed = 0
+        self.dropped = 0
+        self.failed = 0
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def record(self, data: UrlRedirectCreateSchema) -> None:
+        if not self.is_running:
+            self.dropped += 1
+            return
+        now = datetime.now()
+        row = data.model_dump()
+        row["created_at"] = now
+        row["updated_at"] = now
+        try:
+            self._queue.put_nowait(row)
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    async def start(self) -> None:
+        if self.is_running:
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if not self.is_running:
+            return
+        task, self._task = self._task, None
+        try:
+            # the whole shutdown, including waiting for room in a full queue,
+            # is bounded by the drain timeout
+            async with asyncio.timeout(self.drain_timeout):
+                try:
+                    self._queue.put_nowait(_STOP)
+                except asyncio.QueueFull:
+                    await self._queue.put(_STOP)
+                await task
+        except TimeoutError:
+            logger.error(
+                "click ingestor drain timed out, %s clicks lost", self._queue.qsize()
+            )
+            self.dropped += self._queue.qsize()
+            task.cancel()
+
+    def stats(self) -> ClickIngestorStats:
+        return ClickIngestorStats(
+            queued=self._queue.qsize(),
+            flushed=self.flushed,
+            dropped=self.dropped,
+            failed=self.failed,
+        )
+
+    async def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch, stopping = await self._collect_batch()
+            if batch:
+                await self._flush(batch)
+
+    async def _collect_batch(self) -> tuple[list[dict], bool]:
+        item = await self._queue.get()
+        if item is _STOP:
+            return [], True
+
+        batch = [item]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_delay
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self._queue.get(), timeout=timeout)
+            except asyncio.TimeoutError:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    @staticmethod
+    def _build_rollups(batch: list[dict]) -> list[dict]:
+        counter = Counter(
+            (row["url_id"], granularity.value, granularity.truncate(row["created_at"]))
+            for row in batch
+            for granularity in RollupGranularity
+        )
+        # sorted so that concurrent flushes lock rollup rows in the same order
+        return [
+            {
+                "url_id": url_id,
+                "granularity": granularity,
+                "bucket": bucket,
+                "count": count,
+            }
+            for (url_id, granularity, bucket), count in sorted(
+                counter.items(), key=lambda item: (str(item[0][0]), *item[0][1:])
+            )
+        ]
+
+    @staticmethod
+    def _build_sketches(batch: list[dict]) -> dict[tuple, HyperLogLog]:
+        sketches = {}
+        for row in batch:
+            if row["ip_hash"] is None:
+                continue
+            key = (row["url_id"], RollupGranularity.day.truncate(row["created_at"]))
+            if key not in sketches:
+                sketches[key] = HyperLogLog()
+            sketches[key].add(row["ip_hash"])
+        return sketches
+
+    async def _drop_deleted_urls(
+        self, session: AsyncSession, batch: list[dict]
+    ) -> list[dict]:
+        # a url may be deleted after its click was queued, the rows are key
+        # share locked so that it cannot go away before the batch commits
+        existing = await UrlRepository(session).lock_existing_ids(
+            {row["url_id"] for row in batch}
+        )
+        kept = [row for row in batch if row["url_id"] in existing]
+        self.dropped += len(batch) - len(kept)
+        return kept
+
+    async def _flush(self, batch: list[dict]) -> None:
+        try:
+            async with self._session_manager.session() as session:
+                batch = await self._drop_deleted_urls(session, batch)
+                if not batch:
+                    return
+                await self._enricher.enrich(session, batch)
+                await UrlRedirectRepository(session).create_many(batch)
+                await UrlRedirectRollupRepository(session).increment_many(
+                    self._build_rollups(batch)
+                )
+                await UrlVisitorSketchRepository(session).merge_many(
+                    self._build_sketches(batch)
+                )
+                await session.commit()
+            self.flushed += len(batch)
+        except Exception:
+            logger.exception("failed to flush %s clicks", len(batch))
+            self.failed += len(batch)
+
+
+click_ingestor = ClickIngestor(
+    session_manager,
+    click_enricher,
+    max_batch_size=config.app.redirect_batch_size,
+    max_delay=config.app.redirect_batch_delay,
+    max_queue_size=config.app.redirect_queue_size,
+    drain_timeout=config.app.redirect_drain_timeout,
+)
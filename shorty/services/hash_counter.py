@@ -0,0 +1,59 @@
+import asyncio
+import time
+from collections import deque
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shorty.config import config
+from shorty.repositories.url import UrlRepository
+from shorty.utils.hashing import HashPermutation
+
+
+class CounterHashAllocator:
+    """Hands out hashes for ids leased in blocks from the `url_hash_seq` sequence.
+
+    Ids are mapped onto hashes with a keyed permutation, so allocated hashes
+    never collide and only one create per block has to lease new ids. Once
+    the sequence has passed the keyspace no hash is handed out, and no block
+    leased, for `recheck_interval` seconds.
+    """
+
+    def __init__(
+        self,
+        permutation: HashPermutation,
+        block_size: int,
+        recheck_interval: float = 300.0,
+    ):
+        self._permutation = permutation
+        self.block_size = block_size
+        self.recheck_interval = recheck_interval
+        self._ids: deque[int] = deque()
+        self._lock = asyncio.Lock()
+        self._exhausted_until = 0.0
+        self.leases = 0
+
+    async def allocate(self, session: AsyncSession) -> str | None:
+        if time.monotonic() < self._exhausted_until:
+            return None
+        if not self._ids:
+            async with self._lock:
+                if not self._ids:
+                    ids = await UrlRepository(session).lease_hash_ids(self.block_size)
+                    self._ids.extend(ids)
+                    self.leases += 1
+
+        index = self._ids.popleft()
+        if index >= self._permutation.size:
+            self._ids.clear()
+            self._exhausted_until = time.monotonic() + self.recheck_interval
+            return None
+        return self._permutation.encode(index)
+
+
+counter_hash_allocator = CounterHashAllocator(
+    HashPermutation(
+        config.app.hash_counter_key or config.app.secret_key, config.app.hash_len
+    ),
+    block_size=config.app.hash_counter_block_size,
+    recheck_interval=config.app.hash_counter_recheck_interval,
+)
@@ -0,0 +1,158 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+
+from shorty.config import config
+from shorty.db.models.url import URL_CREATED_CHANNEL
+from shorty.db.session import SessionManager, session_manager
+from shorty.repositories.url import UrlRepository
+from shorty.services.cache_invalidation import CacheInvalidator, cache_invalidator
+from shorty.utils.bloom import BloomFilter
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class HashFilterStats:
+    active: bool
+    items: int
+    capacity: int
+    size_bytes: int
+    estimated_fp_rate: float
+    rejected: int
+    false_positives: int
+    rebuilds: int
+
+
+class HashFilter:
+    """Bloom filter of every url hash, answers definite misses without a query.
+
+    Built by streaming the hash column, then kept up to date by the
+    `url_created` notifications of the cache listener. Deleted hashes stay in
+    the filter, they only cost a query, until the next rebuild every
+    `rebuild_interval` seconds. The filter is bypassed until it has been
+    built and whenever the listener is disconnected, since notifications may
+    have been missed; a reconnect triggers a rebuild.
+    """
+
+    def __init__(
+        self,
+        session_manager: SessionManager,
+        invalidator: CacheInvalidator,
+        fp_rate: float,
+        min_capacity: int,
+        rebuild_interval: float,
+        batch_size: int,
+    ):
+        self._session_manager = session_manager
+        self._invalidator = invalidator
+        self.fp_rate = fp_rate
+        self.min_capacity = min_capacity
+        self.rebuild_interval = rebuild_interval
+        self.batch_size = batch_size
+        self._filter = BloomFilter(min_capacity, fp_rate)
+        self._ready = False
+        # hashes created while a rebuild streams the table
+        self._pending: list[str] | None = None
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self.rejected = 0
+        self.false_positives = 0
+        self.rebuilds = 0
+        invalidator.subscribe(URL_CREATED_CHANNEL, self.add)
+        invalidator.add_resync_listener(self._on_resync)
+
+    @property
+    def is_active(self) -> bool:
+        return self._ready and self._invalidator.connected.is_set()
+
+    def might_contain(self, hash: str) -> bool:
+        if not self.is_active or hash in self._filter:
+            return True
+        self.rejected += 1
+        return False
+
+    def record_false_positive(self) -> None:
+        if self.is_active:
+            self.false_positives += 1
+
+    def add(self, hash: str) -> None:
+        self._filter.add(hash)
+        if self._pending is not None:
+            self._pending.append(hash)
+        if self._filter.items > self._filter.capacity:
+            self._wakeup.set()
+
+    def _on_resync(self) -> None:
+        self._ready = False
+        self._wakeup.set()
+
+    def stats(self) -> HashFilterStats:
+        return HashFilterStats(
+            active=self.is_active,
+            items=self._filter.items,
+            capacity=self._filter.capacity,
+            size_bytes=self._filter.size_bytes,
+            estimated_fp_rate=self._filter.estimated_fp_rate(),
+            rejected=self.rejected,
+            false_positives=self.false_positives,
+            rebuilds=self.rebuilds,
+        )
+
+    async def rebuild(self) -> None:
+        self._pending = []
+        try:
+            async with self._session_manager.session() as session:
+                repository = UrlRepository(session)
+                count = await repository.get_count()
+                bloom = BloomFilter(max(self.min_capacity, 2 * count), self.fp_rate)
+                async for batch in repository.stream_hashes(self.batch_size):
+                    for hash in batch:
+                        bloom.add(hash)
+            for hash in self._pending:
+                bloom.add(hash)
+        finally:
+            self._pending = None
+        self._filter = bloom
+        self._ready = True
+        self.rebuilds += 1
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        task, self._task = self._task, None
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def _run(self) -> None:
+        while True:
+            # the first rebuild follows the listener's first connect
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(), timeout=self.rebuild_interval
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.rebuild()
+                logger.debug("hash filter rebuilt with %s hashes", self._filter.items)
+            except Exception:
+                logger.exception("hash filter rebuild failed")
+
+
+hash_filter = HashFilter(
+    session_manager,
+    cache_invalidator,
+    fp_rate=config.app.hash_filter_fp_rate,
+    min_capacity=config.app.hash_filter_min_capacity,
+    rebuild_interval=config.app.hash_filter_rebuild_interval,
+    batch_size=config.app.hash_filter_batch_size,
+)
@@ -0,0 +1,101 @@
+import asyncio
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shorty.config import config
+from shorty.db.session import SessionManager, session_manager
+from shorty.repositories.hash_pool import HashPoolRepository
+from shorty.utils.hashing import generate_random_hash
+
+logger = logging.getLogger(__name__)
+
+
+class HashPoolService:
+
+    def __init__(self, session: AsyncSession):
+        self._session = session
+        self._repository = HashPoolRepository(session)
+
+    async def refill(self, size: int, batch_size: int) -> int:
+        discarded = await self._repository.discard_used()
+        if discarded:
+            logger.warning("discarded %s used hashes from the hash pool", discarded)
+        missing = size - await self._repository.get_count()
+        filled = 0
+        while filled < missing:
+            candidates = {
+                generate_random_hash(config.app.hash_len)
+                for _ in range(min(batch_size, missing - filled))
+            }
+            inserted = await self._repository.fill(list(candidates))
+            if not inserted:
+                logger.warning("hash pool refill found no free hashes")
+                break
+            filled += inserted
+        return filled
+
+
+class HashPoolRefiller:
+    """Keeps the hash pool topped up in the background.
+
+    Runs every `interval` seconds, or right away after `wake` is called by a
+    creator that found the pool empty.
+    """
+
+    def __init__(
+        self,
+        session_manager: SessionManager,
+        size: int,
+        batch_size: int,
+        interval: float,
+    ):
+        self._session_manager = session_manager
+        self.size = size
+        self.batch_size = batch_size
+        self.interval = interval
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def wake(self) -> None:
+        self._wakeup.set()
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        task, self._task = self._task, None
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                async with self._session_manager.session() as session:
+                    filled = await HashPoolService(session).refill(
+                        self.size, self.batch_size
+                    )
+                if filled:
+                    logger.debug("hash pool refilled with %s hashes", filled)
+            except Exception:
+                logger.exception("hash pool refill failed")
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+
+hash_pool_refiller = HashPoolRefiller(
+    session_manager,
+    size=config.app.hash_pool_size,
+    batch_size=config.app.hash_pool_batch_size,
+    interval=config.app.hash_pool_refill_interval,
+)
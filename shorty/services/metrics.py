@@ -0,0 +1,44 @@
+from dataclasses import asdict
+
+from shorty.db.schemas.metrics import (
+    CacheInvalidatorStatsSchema,
+    CacheStatsSchema,
+    ClickIngestorStatsSchema,
+    HashFilterStatsSchema,
+    MetricsSchema,
+    PasswordHashStatsSchema,
+    PoolStatsSchema,
+    RateLimiterStatsSchema,
+    TopLinksStatsSchema,
+)
+from shorty.db.session import session_manager
+from shorty.services.auth import user_cache
+from shorty.services.cache_invalidation import cache_invalidator
+from shorty.services.click_ingestor import click_ingestor
+from shorty.services.hash_filter import hash_filter
+from shorty.services.rate_limit import rate_limiter
+from shorty.services.security import security_context
+from shorty.services.top_links import top_links_tracker
+from shorty.services.url import url_cache
+
+
+class MetricsService:
+
+    def get_metrics(self) -> MetricsSchema:
+        return MetricsSchema(
+            pool=PoolStatsSchema(**asdict(session_manager.pool_stats())),
+            url_cache=CacheStatsSchema(**asdict(url_cache.stats())),
+            user_cache=CacheStatsSchema(**asdict(user_cache.stats())),
+            click_ingestor=ClickIngestorStatsSchema(**asdict(click_ingestor.stats())),
+            password_hash=PasswordHashStatsSchema(
+                pending=security_context.pending,
+                max_pending=security_context.max_pending,
+                rejected=security_context.rejected,
+            ),
+            top_links=TopLinksStatsSchema(**asdict(top_links_tracker.stats())),
+            cache_invalidation=CacheInvalidatorStatsSchema(
+                **asdict(cache_invalidator.stats())
+            ),
+            hash_filter=HashFilterStatsSchema(**asdict(hash_filter.stats())),
+            rate_limit=RateLimiterStatsSchema(**asdict(rate_limiter.stats())),
+        )
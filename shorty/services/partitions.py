@@ -0,0 +1,106 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shorty.config import config
+from shorty.db.session import SessionManager, session_manager
+from shorty.repositories.url_redirect import UrlRedirectRepository
+from shorty.utils.enums import PartitionInterval
+
+logger = logging.getLogger(__name__)
+
+
+class RedirectPartitionManager:
+    """Maintains the range partitions of `url_redirect`.
+
+    Partitions are created `ahead` intervals in advance so that clicks never
+    land in the default partition, and whole partitions are dropped once they
+    are older than `retention` seconds (0 keeps them forever). Once started,
+    partitions are ensured every `check_interval` seconds, whether or not the
+    reaper runs in this process.
+    """
+
+    def __init__(
+        self,
+        interval: PartitionInterval,
+        ahead: int,
+        retention: int,
+        session_manager: SessionManager | None = None,
+        check_interval: float = 3600.0,
+    ):
+        self.interval = interval
+        self.ahead = ahead
+        self.retention = retention
+        self._session_manager = session_manager
+        self.check_interval = check_interval
+        self._task: asyncio.Task | None = None
+
+    def partition_name(self, start: datetime) -> str:
+        return f"url_redirect_p{self.interval.suffix(start)}"
+
+    async def ensure_partitions(self, session: AsyncSession, now: datetime) -> int:
+        repository = UrlRedirectRepository(session)
+        existing = await repository.get_partitions()
+        created = 0
+        start = self.interval.truncate(now)
+        for _ in range(self.ahead + 1):
+            end = self.interval.next(start)
+            # ranges created with another interval must not overlap new ones
+            if not any(s < end and start < e for _, s, e in existing):
+                await repository.create_partition(
+                    self.partition_name(start), start, end
+                )
+                created += 1
+            start = end
+        return created
+
+    async def drop_expired_partitions(
+        self, session: AsyncSession, now: datetime
+    ) -> int:
+        if not self.retention:
+            return 0
+        created_before = now - timedelta(seconds=self.retention)
+        repository = UrlRedirectRepository(session)
+        dropped = 0
+        for name, _, end in await repository.get_partitions():
+            if end <= created_before:
+                logger.info("dropping redirect partition %s", name)
+                await repository.drop_partition(name)
+                dropped += 1
+        return dropped
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        task, self._task = self._task, None
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                async with self._session_manager.session() as session:
+                    created = await self.ensure_partitions(session, datetime.now())
+                if created:
+                    logger.info("created %s redirect partitions", created)
+            except Exception:
+                logger.exception("failed to create url_redirect partitions")
+            await asyncio.sleep(self.check_interval)
+
+
+redirect_partition_manager = RedirectPartitionManager(
+    interval=config.app.redirect_partition_interval,
+    ahead=config.app.redirect_partitions_ahead,
+    retention=config.app.reaper_redirect_retention,
+    session_manager=session_manager,
+    check_interval=config.app.redirect_partition_check_interval,
+)
@@ -0,0 +1,159 @@
+import asyncio
+import logging
+import math
+import time
+from dataclasses import dataclass
+
+from shorty.config import config
+from shorty.db.session import SessionManager, session_manager
+from shorty.repositories.rate_limit import RateLimitRepository
+from shorty.utils.enums import RateLimitBackend, RateLimitScope
+from shorty.utils.exceptions import BadRequestError, TooManyRequestsError
+from shorty.utils.rate_limit import GCRA
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RateLimiterStats:
+    allowed: int
+    rejected: int
+    errors: int
+    keys: int
+
+
+class RateLimiter:
+    """Per client GCRA rate limits of the scopes given in `limits`.
+
+    `limits` maps a scope to its sustained rate per second and its burst, a
+    scope without a limit is not limited. A request costing more than the
+    burst could never be admitted and is rejected outright. The memory backend limits each
+    process on its own, the postgres backend shares the limits between nodes
+    at the cost of a query per request and lets requests through while the
+    database is unavailable. Expired state is purged every `purge_interval`
+    seconds.
+    """
+
+    def __init__(
+        self,
+        session_manager: SessionManager,
+        backend: RateLimitBackend,
+        limits: dict[RateLimitScope, tuple[float, int]],
+        max_keys: int,
+        purge_interval: float,
+    ):
+        self._session_manager = session_manager
+        self.backend = backend
+        self.purge_interval = purge_interval
+        # scope: (interval, burst)
+        self._limits = {
+            scope: (1 / rate, burst)
+            for scope, (rate, burst) in limits.items()
+            if rate > 0 and burst > 0
+        }
+        self._memory: GCRA[str] = GCRA(max_keys)
+        self._task: asyncio.Task | None = None
+        self.allowed = 0
+        self.rejected = 0
+        self.errors = 0
+
+    async def check(self, scope: RateLimitScope, client: str, cost: int = 1) -> None:
+        limit = self._limits.get(scope)
+        if limit is None:
+            return
+        interval, burst = limit
+        if cost > burst:
+            self.rejected += 1
+            raise BadRequestError(
+                f"request of {cost} exceeds the rate limit burst of {burst} for {scope}"
+            )
+        key = f"{scope}:{client}"
+        if self.backend == RateLimitBackend.memory:
+            wait = self._memory.acquire(
+                key, interval, interval * burst, cost, time.monotonic()
+            )
+        else:
+            wait = await self._acquire_shared(key, interval, interval * burst, cost)
+        if not wait:
+            self.allowed += 1
+            return
+        self.rejected += 1
+        raise TooManyRequestsError(
+            f"rate limit exceeded for {scope}", retry_after=math.ceil(wait)
+        )
+
+    async def _acquire_shared(
+        self, key: str, interval: float, tolerance: float, cost: int
+    ) -> float:
+        try:
+            async with self._session_manager.session() as session:
+                return await RateLimitRepository(session).acquire(
+                    key, interval, tolerance, cost
+                )
+        except Exception:
+            logger.exception("rate limit check failed, letting the request through")
+            self.errors += 1
+            return 0.0
+
+    def stats(self) -> RateLimiterStats:
+        return RateLimiterStats(
+            allowed=self.allowed,
+            rejected=self.rejected,
+            errors=self.errors,
+            keys=len(self._memory),
+        )
+
+    async def purge(self) -> int:
+        if self.backend == RateLimitBackend.memory:
+            return self._memory.purge(time.monotonic())
+        async with self._session_manager.session() as session:
+            return await RateLimitRepository(session).purge()
+
+    async def start(self) -> None:
+        if self._task is None and self._limits:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        task, self._task = self._task, None
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.purge_interval)
+            try:
+                purged = await self.purge()
+                logger.debug("purged %s rate limit keys", purged)
+            except Exception:
+                logger.exception("rate limit purge failed")
+
+
+rate_limiter = RateLimiter(
+    session_manager,
+    backend=config.app.rate_limit_backend,
+    limits=(
+        {
+            RateLimitScope.url_create: (
+                config.app.rate_limit_url_create_rate,
+                config.app.rate_limit_url_create_burst,
+            ),
+            RateLimitScope.token: (
+                config.app.rate_limit_token_rate,
+                config.app.rate_limit_token_burst,
+            ),
+            RateLimitScope.redirect: (
+                config.app.rate_limit_redirect_rate,
+                config.app.rate_limit_redirect_burst,
+            ),
+        }
+        if config.app.rate_limit_enabled
+        else {}
+    ),
+    max_keys=config.app.rate_limit_max_keys,
+    purge_interval=config.app.rate_limit_purge_interval,
+)
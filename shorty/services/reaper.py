@@ -0,0 +1,134 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from shorty.config import config
+from shorty.db.session import SessionManager, session_manager
+from shorty.repositories.auth import AuthRepository
+from shorty.repositories.hash_pool import HashPoolRepository
+from shorty.repositories.url import UrlRepository
+from shorty.services.partitions import (
+    RedirectPartitionManager,
+    redirect_partition_manager,
+)
+from shorty.services.url import url_cache
+from shorty.utils.enums import HashStrategy
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ReaperStats:
+    urls: int = 0
+    recycled_hashes: int = 0
+    auths: int = 0
+    created_partitions: int = 0
+    dropped_partitions: int = 0
+
+
+class ExpiryReaper:
+    """Deletes expired urls and stale refresh tokens in small batches.
+
+    Every batch is its own short transaction followed by `batch_pause` seconds
+    of sleep, so the reaper never holds locks or connections for long. Old
+    redirections are removed by dropping whole `url_redirect` partitions.
+    """
+
+    def __init__(
+        self,
+        session_manager: SessionManager,
+        interval: float,
+        batch_size: int,
+        batch_pause: float,
+        url_grace: int,
+        partition_manager: RedirectPartitionManager,
+    ):
+        self._session_manager = session_manager
+        self.interval = interval
+        self.batch_size = batch_size
+        self.batch_pause = batch_pause
+        self.url_grace = url_grace
+        self.partition_manager = partition_manager
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.run_forever())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        task, self._task = self._task, None
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def run_forever(self) -> None:
+        while True:
+            try:
+                stats = await self.run_once()
+                logger.info("reaper pass finished: %s", stats)
+            except Exception:
+                logger.exception("reaper pass failed")
+            await asyncio.sleep(self.interval)
+
+    async def run_once(self) -> ReaperStats:
+        stats = ReaperStats()
+        stats.urls, stats.recycled_hashes = await self._reap_urls()
+        stats.auths = await self._reap_batches(self._delete_auths)
+        stats.created_partitions, stats.dropped_partitions = (
+            await self._maintain_partitions()
+        )
+        return stats
+
+    async def _reap_batches(self, delete_batch) -> int:
+        total = 0
+        while True:
+            async with self._session_manager.session() as session:
+                count = await delete_batch(session)
+            total += count
+            if count < self.batch_size:
+                return total
+            await asyncio.sleep(self.batch_pause)
+
+    async def _reap_urls(self) -> tuple[int, int]:
+        deleted, recycled = 0, 0
+        while True:
+            expired_before = datetime.now() - timedelta(seconds=self.url_grace)
+            async with self._session_manager.session() as session:
+                hashes = await UrlRepository(session).delete_expired(
+                    expired_before, self.batch_size
+                )
+                if hashes and config.app.hash_strategy == HashStrategy.pool:
+                    recycled += await HashPoolRepository(session).fill(hashes)
+            for url_hash in hashes:
+                url_cache.invalidate(url_hash)
+            deleted += len(hashes)
+            if len(hashes) < self.batch_size:
+                return deleted, recycled
+            await asyncio.sleep(self.batch_pause)
+
+    async def _delete_auths(self, session) -> int:
+        return await AuthRepository(session).delete_stale(
+            datetime.now(), self.batch_size
+        )
+
+    async def _maintain_partitions(self) -> tuple[int, int]:
+        now = datetime.now()
+        async with self._session_manager.session() as session:
+            created = await self.partition_manager.ensure_partitions(session, now)
+            dropped = await self.partition_manager.drop_expired_partitions(session, now)
+        return created, dropped
+
+
+expiry_reaper = ExpiryReaper(
+    session_manager,
+    interval=config.app.reaper_interval,
+    batch_size=config.app.reaper_batch_size,
+    batch_pause=config.app.reaper_batch_pause,
+    url_grace=config.app.reaper_url_grace,
+    partition_manager=redirect_partition_manager,
+)
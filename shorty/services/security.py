@@ -0,0 +1,82 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+import jwt
+from passlib.context import CryptContext
+
+from shorty.config import config
+from shorty.utils.exceptions import UnAvailableError
+
+Result = TypeVar("Result")
+
+
+class SecurityContext:
+    """Password hashing context and JWT key material shared by the process.
+
+    Building a `CryptContext` is expensive, so it is done once here while
+    `AuthService` instances stay bound to the session of a single request.
+    Argon2 runs on a small thread pool so that it does not block the event
+    loop; once `max_workers + max_queue_size` calls are in flight new ones
+    are rejected with `UnAvailableError`.
+    """
+
+    def __init__(
+        self,
+        encrypt_type: str,
+        secret_key: str,
+        algorithm: str,
+        max_workers: int,
+        max_queue_size: int,
+        **hash_settings: int,
+    ):
+        self._crypt_context = CryptContext(
+            schemes=[encrypt_type],
+            deprecated="auto",
+            **{f"{encrypt_type}__{key}": value for key, value in hash_settings.items()},
+        )
+        self._secret_key = secret_key
+        self._algorithm = algorithm
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="password-hash"
+        )
+        self.max_pending = max_workers + max_queue_size
+        self.pending = 0
+        self.rejected = 0
+
+    async def hash_password(self, plain_password: str) -> str:
+        return await self._run(self._crypt_context.hash, plain_password)
+
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(
+            self._crypt_context.verify, plain_password, hashed_password
+        )
+
+    def encode_token(self, payload: dict) -> str:
+        return jwt.encode(payload, self._secret_key, algorithm=self._algorithm)
+
+    def decode_token(self, token: str) -> dict:
+        return jwt.decode(token, self._secret_key, algorithms=[self._algorithm])
+
+    async def _run(self, func: Callable[..., Result], *args) -> Result:
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise UnAvailableError("too many password hashing requests, retry later")
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            self.pending -= 1
+
+
+security_context = SecurityContext(
+    config.app.encrypt_type,
+    config.app.secret_key,
+    config.app.hash_algorithm,
+    max_workers=config.app.password_hash_workers,
+    max_queue_size=config.app.password_hash_queue_size,
+    time_cost=config.app.argon2_time_cost,
+    memory_cost=config.app.argon2_memory_cost,
+    parallelism=config.app.argon2_parallelism,
+)
@@ -0,0 +1,244 @@
+import asyncio
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from shorty.config import config
+from shorty.db.schemas.url_redirect import UrlTopItemSchema, UrlTopSchema
+from shorty.db.session import SessionManager, session_manager
+from shorty.repositories.top_link_snapshot import TopLinkSnapshotRepository
+from shorty.utils.cache import TTLCache
+from shorty.utils.enums import TopWindow
+from shorty.utils.heavy_hitters import SlidingTopK
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TopLinksStats:
+    tracked_users: int
+    tracked_urls: int
+    snapshots: int
+    snapshot_failures: int
+    peer_failures: int
+
+
+class TopLinksTracker:
+    """In-memory leaderboard of the most redirected urls, global and per user.
+
+    Fed by every redirect in this process. The counters are written to the
+    database under this process' own instance id every `snapshot_interval`
+    seconds and on stop. Answers add the latest snapshots of every other
+    process to the own counters, so they cover all workers and replicas with
+    the others lagging by up to a snapshot interval, and are cached for
+    `result_ttl` seconds. Rows of processes that have stopped, or missed three
+    snapshots, are claimed by one running process and merged into its
+    counters, so that workers never overwrite nor double count each other.
+    """
+
+    def __init__(
+        self,
+        session_manager: SessionManager,
+        capacity: int,
+        user_capacity: int,
+        max_users: int,
+        snapshot_interval: float,
+        result_ttl: float,
+    ):
+        self._session_manager = session_manager
+        self.capacity = capacity
+        self.user_capacity = user_capacity
+        self.max_users = max_users
+        self.snapshot_interval = snapshot_interval
+        self._global = self._new_trackers(capacity)
+        self._users: OrderedDict[UUID, dict[TopWindow, SlidingTopK]] = OrderedDict()
+        self._results: TTLCache[tuple, list[tuple[UUID, int]]] = TTLCache(
+            maxsize=1000, ttl=result_ttl
+        )
+        self.instance_id = uuid.uuid4()
+        self._task: asyncio.Task | None = None
+        self.snapshots = 0
+        self.snapshot_failures = 0
+        self.peer_failures = 0
+
+    @staticmethod
+    def _new_trackers(capacity: int) -> dict[TopWindow, SlidingTopK]:
+        return {
+            window: SlidingTopK(window.seconds, window.slots, capacity)
+            for window in TopWindow
+        }
+
+    def _get_user_trackers(self, user_id: UUID) -> dict[TopWindow, SlidingTopK]:
+        trackers = self._users.get(user_id)
+        if trackers is None:
+            trackers = self._users[user_id] = self._new_trackers(self.user_capacity)
+            if len(self._users) > self.max_users:
+                self._users.popitem(last=False)
+        else:
+            self._users.move_to_end(user_id)
+        return trackers
+
+    def record(
+        self, url_id: UUID, user_id: UUID | None, now: float | None = None
+    ) -> None:
+        now = time.time() if now is None else now
+        for tracker in self._global.values():
+            tracker.add(url_id, now)
+        if user_id is not None:
+            for tracker in self._get_user_trackers(user_id).values():
+                tracker.add(url_id, now)
+
+    async def top(
+        self, window: TopWindow, size: int, user_id: UUID | None = None
+    ) -> list[tuple[UUID, int]]:
+        key = (window, size, user_id)
+        result = self._results.get(key)
+        if result is not None:
+            return result
+        if user_id is None:
+            trackers = self._global
+        else:
+            trackers = self._users.get(user_id)
+        tracker = trackers[window] if trackers else None
+        if tracker is None:
+            tracker = SlidingTopK(window.seconds, window.slots, self.user_capacity)
+        others = await self._get_others(window, user_id)
+        result = tracker.top(size, time.time(), others)
+        self._results.set(key, result)
+        return result
+
+    async def _get_others(
+        self, window: TopWindow, user_id: UUID | None
+    ) -> list[dict[int, dict[UUID, int]]]:
+        try:
+            async with self._session_manager.session() as session:
+                snapshots = await TopLinkSnapshotRepository(session).get_others(
+                    self.instance_id, user_id, window.value
+                )
+        except Exception:
+            logger.exception("failed to read top links of other processes")
+            self.peer_failures += 1
+            return []
+        return [self._decode(data) for data in snapshots]
+
+    def stats(self) -> TopLinksStats:
+        return TopLinksStats(
+            tracked_users=len(self._users),
+            tracked_urls=len(self._global[TopWindow.day]),
+            snapshots=self.snapshots,
+            snapshot_failures=self.snapshot_failures,
+            peer_failures=self.peer_failures,
+        )
+
+    @staticmethod
+    def _encode(tracker: SlidingTopK) -> bytes:
+        return json.dumps(
+            {
+                slot: {str(url_id): count for url_id, count in counts.items()}
+                for slot, counts in tracker.dump().items()
+            }
+        ).encode()
+
+    @staticmethod
+    def _decode(data: bytes) -> dict[int, dict[UUID, int]]:
+        return {
+            int(slot): {UUID(url_id): count for url_id, count in counts.items()}
+            for slot, counts in json.loads(data).items()
+        }
+
+    async def snapshot(self, released: bool = False) -> None:
+        rows = [
+            {
+                "id": uuid.uuid4(),
+                "user_id": user_id,
+                "window": window.value,
+                "data": self._encode(tracker),
+                "instance_id": self.instance_id,
+                "released": released,
+                "taken_at": datetime.now(),
+            }
+            for user_id, trackers in [(None, self._global), *self._users.items()]
+            for window, tracker in trackers.items()
+            if len(tracker)
+        ]
+        async with self._session_manager.session() as session:
+            await TopLinkSnapshotRepository(session).replace(self.instance_id, rows)
+        self.snapshots += 1
+
+    async def restore(self) -> None:
+        stale_before = datetime.now() - timedelta(seconds=3 * self.snapshot_interval)
+        async with self._session_manager.session() as session:
+            snapshots = await TopLinkSnapshotRepository(session).claim_orphaned(
+                self.instance_id, stale_before
+            )
+        for snapshot in snapshots:
+            if snapshot.user_id is None:
+                trackers = self._global
+            else:
+                trackers = self._get_user_trackers(snapshot.user_id)
+            trackers[TopWindow(snapshot.window)].load(self._decode(snapshot.data))
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        try:
+            await self.restore()
+        except Exception:
+            logger.exception("failed to restore top links snapshot")
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        task, self._task = self._task, None
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        await self._snapshot(released=True)
+
+    async def _snapshot(self, released: bool = False) -> None:
+        try:
+            await self.snapshot(released)
+        except Exception:
+            logger.exception("top links snapshot failed")
+            self.snapshot_failures += 1
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.snapshot_interval)
+            try:
+                await self.restore()
+            except Exception:
+                logger.exception("failed to claim orphaned top links snapshots")
+            await self._snapshot()
+
+
+class TopLinksService:
+
+    async def get_top(
+        self, window: TopWindow, size: int, user_id: UUID | None = None
+    ) -> UrlTopSchema:
+        top = await top_links_tracker.top(window, size, user_id)
+        return UrlTopSchema(
+            window=window,
+            urls=[
+                UrlTopItemSchema(url_id=url_id, count=count) for url_id, count in top
+            ],
+        )
+
+
+top_links_tracker = TopLinksTracker(
+    session_manager,
+    capacity=config.app.top_links_capacity,
+    user_capacity=config.app.top_links_user_capacity,
+    max_users=config.app.top_links_max_users,
+    snapshot_interval=config.app.top_links_snapshot_interval,
+    result_ttl=config.app.top_links_result_ttl,
+)
@@ -1,28 +1,52 @@
-import random
-import string
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from uuid import UUID
 
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from shorty.config import config
+from shorty.db.models.url import URL_CHANGED_CHANNEL
 from shorty.db.schemas.url import (
+    UrlBulkCreateResultSchema,
+    UrlBulkErrorSchema,
     UrlCreateSchema,
     UrlInDB,
     UrlPaginatedSchema,
     UrlSchema,
     UrlUpdateSchema,
 )
+from shorty.db.schemas.url_redirect import UrlRedirectCreateSchema
 from shorty.db.schemas.user import UserSchema
+from shorty.repositories.hash_pool import HashPoolRepository
 from shorty.repositories.url import UrlRepository
+from shorty.repositories.url_redirect import UrlRedirectRepository
+from shorty.services.cache_invalidation import cache_invalidator
+from shorty.services.capacity import reservation_counter
+from shorty.services.click_ingestor import click_ingestor
+from shorty.services.hash_counter import counter_hash_allocator
+from shorty.services.hash_filter import hash_filter
+from shorty.services.hash_pool import hash_pool_refiller
+from shorty.services.top_links import top_links_tracker
 from shorty.services.user import UserService
+from shorty.utils.cache import TTLCache
+from shorty.utils.cursor import decode_cursor, encode_cursor
+from shorty.utils.enums import HashStrategy
 from shorty.utils.exceptions import (
+    AlreadyExistError,
+    BaseAPIException,
     GoneError,
     InsufficientStorage,
     NotFoundError,
     UserNotAuthorised,
 )
+from shorty.utils.hashing import generate_random_hash
+
+url_cache: TTLCache[str, UrlSchema] = TTLCache(
+    maxsize=config.app.url_cache_size, ttl=config.app.url_cache_ttl
+)
+cache_invalidator.register("url", url_cache)
+cache_invalidator.subscribe(URL_CHANGED_CHANNEL, url_cache.invalidate)
 
 
 @dataclass
@@ -40,9 +64,7 @@ class UrlService:
 
     @staticmethod
     def _generate_random_hash(length: int = config.app.hash_len) -> str:
-        characters = string.ascii_letters.upper()
-        random_hash = "".join(random.choices(characters, k=length))
-        return random_hash
+        return generate_random_hash(length)
 
     async def _generate_available_hash(self) -> AvailableHashDTO:
         url_hash = self._generate_random_hash()
@@ -78,11 +100,39 @@ class UrlService:
                     UrlSchema.model_validate(url, from_attributes=True) for url in urls
                 ],
                 total_count=count,
+                next_cursor=(
+                    encode_cursor(urls[-1].updated_at, urls[-1].id)
+                    if page * size < count
+                    else None
+                ),
             )
         return UrlPaginatedSchema(urls=[], total_count=count)
 
+    async def get_urls_by_user_after(
+        self, user_id: UUID, cursor: str, size: int, with_total: bool = False
+    ) -> UrlPaginatedSchema:
+        after = decode_cursor(cursor)
+        user_service = UserService(self._session)
+        await user_service.get_user_by_id(user_id)
+
+        # one extra row tells whether there is a next page without a COUNT(*)
+        urls = await self._repository.get_page_after(user_id, size + 1, after)
+        next_cursor = None
+        if len(urls) > size:
+            urls = urls[:size]
+            next_cursor = encode_cursor(urls[-1].updated_at, urls[-1].id)
+        return UrlPaginatedSchema(
+            urls=[UrlSchema.model_validate(url, from_attributes=True) for url in urls],
+            total_count=(
+                await self._repository.get_count_by_user(user_id)
+                if with_total
+                else None
+            ),
+            next_cursor=next_cursor,
+        )
+
     async def _get_reserved_url_count(self) -> int:
-        return await self._repository.get_reserved_count()
+        return await reservation_counter.get(self._session)
 
     async def update_url_by_id(
         self, url_id: UUID, new_url: UrlUpdateSchema
@@ -92,11 +142,13 @@ class UrlService:
         updated_url_dict = updated_url.model_dump()
         updated_url_dict["url"] = str(updated_url_dict["url"])
         updated_url = UrlInDB.model_validate(updated_url_dict)
-        return await self._repository.update_by_id(url_id, updated_url.model_dump())
+        result = await self._repository.update_by_id(url_id, updated_url.model_dump())
+        # other processes are notified by the url_changed trigger
+        url_cache.invalidate(url.hash)
+        return result
 
-    async def create_url(
-        self, url: UrlCreateSchema, user: UserSchema | None
-    ) -> UrlSchema:
+    @staticmethod
+    def _validate_new_url(url: UrlCreateSchema, user: UserSchema | None) -> None:
         if not user and not url.expiration_time:
             raise UserNotAuthorised(
                 "cannot create unlimited time without provided user"
@@ -112,6 +164,30 @@ class UrlService:
                 "cannot create url with expiration time above than temporary_url_lifetime"
             )
 
+    async def create_url(
+        self, url: UrlCreateSchema, user: UserSchema | None
+    ) -> UrlSchema:
+        self._validate_new_url(url, user)
+
+        created_url = await self._allocate_url(url, user)
+        reservation_counter.increment()
+        # other processes learn about it from the url_created trigger
+        hash_filter.add(created_url.hash)
+        return created_url
+
+    async def _allocate_url(
+        self, url: UrlCreateSchema, user: UserSchema | None
+    ) -> UrlSchema:
+        if config.app.hash_strategy == HashStrategy.pool:
+            pooled_url = await self._create_url_with_pooled_hash(url, user)
+            if pooled_url:
+                return pooled_url
+
+        if config.app.hash_strategy == HashStrategy.counter:
+            counter_url = await self._create_url_with_counter_hash(url, user)
+            if counter_url:
+                return counter_url
+
         if await self._get_reserved_url_count() >= config.app.get_combinations_count:
             raise InsufficientStorage("cannot allocate new hash at this time")
 
@@ -132,16 +208,192 @@ class UrlService:
         url = await self._repository.create(url.model_dump())
         return UrlSchema.model_validate(url, from_attributes=True)
 
+    async def _create_url_with_pooled_hash(
+        self, url: UrlCreateSchema, user: UserSchema | None
+    ) -> UrlSchema | None:
+        try:
+            created_url = await self._repository.create_with_pooled_hash(
+                {
+                    "url": str(url.url),
+                    "expired_at": url.expiration_time,
+                    "user_id": user.id if user else None,
+                }
+            )
+        except IntegrityError:
+            await self._session.rollback()
+            # the claimed hash is used already, drop it so that it is not
+            # claimed again by every following create
+            await HashPoolRepository(self._session).discard_used()
+            created_url = None
+
+        if not created_url:
+            hash_pool_refiller.wake()
+            return None
+        return UrlSchema.model_validate(created_url, from_attributes=True)
+
+    async def _create_url_with_counter_hash(
+        self, url: UrlCreateSchema, user: UserSchema | None
+    ) -> UrlSchema | None:
+        # a collision is only possible with urls created by another strategy
+        for _ in range(3):
+            url_hash = await counter_hash_allocator.allocate(self._session)
+            if not url_hash:
+                return None
+            new_url = UrlInDB(
+                url=str(url.url),
+                hash=url_hash,
+                expired_at=url.expiration_time,
+                user_id=user.id if user else None,
+            )
+            try:
+                created_url = await self._repository.create(new_url.model_dump())
+            except IntegrityError:
+                await self._session.rollback()
+                continue
+            return UrlSchema.model_validate(created_url, from_attributes=True)
+        return None
+
+    async def create_urls(
+        self, urls: list[UrlCreateSchema], user: UserSchema | None
+    ) -> UrlBulkCreateResultSchema:
+        valid_urls, errors = [], []
+        for index, url in enumerate(urls):
+            try:
+                self._validate_new_url(url, user)
+            except BaseAPIException as e:
+                errors.append(UrlBulkErrorSchema(index=index, detail=e.detail))
+            else:
+                valid_urls.append(url)
+
+        if not valid_urls:
+            return UrlBulkCreateResultSchema(urls=[], errors=errors)
+
+        # a concurrent single create may take one of the random hashes first
+        for attempt in range(3):
+            hashes = await self._allocate_hashes(len(valid_urls))
+            new_urls = [
+                {
+                    "url": str(url.url),
+                    "hash": url_hash,
+                    "expired_at": url.expiration_time,
+                    "user_id": user.id if user else None,
+                }
+                for url, url_hash in zip(valid_urls, hashes)
+            ]
+            try:
+                created_urls = await self._repository.create_many(new_urls)
+                break
+            except IntegrityError:
+                await self._session.rollback()
+                if attempt == 2:
+                    raise AlreadyExistError("cannot allocate unique hashes, try again")
+
+        reservation_counter.increment(len(created_urls))
+        for created_url in created_urls:
+            hash_filter.add(created_url.hash)
+        return UrlBulkCreateResultSchema(
+            urls=[
+                UrlSchema.model_validate(url, from_attributes=True)
+                for url in created_urls
+            ],
+            errors=errors,
+        )
+
+    async def _allocate_hashes(self, count: int) -> list[str]:
+        hashes = []
+        if config.app.hash_strategy == HashStrategy.pool:
+            hashes = await HashPoolRepository(self._session).claim_many(count)
+            if len(hashes) < count:
+                hash_pool_refiller.wake()
+        elif config.app.hash_strategy == HashStrategy.counter:
+            while len(hashes) < count:
+                url_hash = await counter_hash_allocator.allocate(self._session)
+                if not url_hash:
+                    break
+                hashes.append(url_hash)
+
+        missing = count - len(hashes)
+        if missing:
+            reserved = await self._get_reserved_url_count()
+            if reserved + missing > config.app.get_combinations_count:
+                raise InsufficientStorage("cannot allocate new hashes at this time")
+            hashes += await self._generate_available_hashes(missing, set(hashes))
+        return hashes
+
+    async def _generate_available_hashes(
+        self, count: int, taken: set[str]
+    ) -> list[str]:
+        hashes = []
+        for _ in range(10):
+            candidates = {
+                self._generate_random_hash() for _ in range(count - len(hashes))
+            } - taken
+            existing = await self._repository.get_existing_hashes(list(candidates))
+            free = candidates - existing
+            hashes += free
+            taken |= candidates
+            if len(hashes) == count:
+                return hashes
+        raise InsufficientStorage("cannot allocate new hashes at this time")
+
     async def get_url_by_hash(self, hash: str) -> UrlSchema:
-        url = await self._repository.get_url_by_hash(hash)
-        if not url:
+        url = url_cache.get(hash)
+        if url is None:
+            if not hash_filter.might_contain(hash):
+                raise NotFoundError(f"url not found by hash: {hash}")
+            db_url = await self._repository.get_url_by_hash(hash)
+            if not db_url:
+                hash_filter.record_false_positive()
+                raise NotFoundError(f"url not found by hash: {hash}")
+            url = UrlSchema.model_validate(db_url, from_attributes=True)
+            url_cache.set(hash, url)
+        self._check_url_is_active(url)
+        return url
+
+    async def resolve_redirect(
+        self,
+        hash: str,
+        referrer: str | None = None,
+        user_agent: str | None = None,
+        client_ip: str | None = None,
+    ) -> UrlSchema:
+        if click_ingestor.is_running:
+            url = await self.get_url_by_hash(hash)
+            click_ingestor.record(
+                UrlRedirectCreateSchema(
+                    url_id=url.id,
+                    referrer=referrer,
+                    user_agent=user_agent,
+                    client_ip=client_ip,
+                )
+            )
+            top_links_tracker.record(url.id, url.user_id)
+            return url
+
+        # without the ingestor there is no enrichment stage, only the click
+        # itself is recorded
+
+        if not hash_filter.might_contain(hash):
+            raise NotFoundError(f"url not found by hash: {hash}")
+        url_redirect_repository = UrlRedirectRepository(self._session)
+        db_url = await url_redirect_repository.resolve_and_record(hash, datetime.now())
+        await self._session.commit()
+        if not db_url:
+            hash_filter.record_false_positive()
             raise NotFoundError(f"url not found by hash: {hash}")
+        url = UrlSchema.model_validate(db_url, from_attributes=True)
+        self._check_url_is_active(url)
+        top_links_tracker.record(url.id, url.user_id)
+        return url
+
+    @staticmethod
+    def _check_url_is_active(url: UrlSchema) -> None:
         if url.expired_at and url.expired_at <= datetime.now():
             raise GoneError(
                 f"url hash has been expired, id: {url.id}, hash: {url.hash}"
             )
-        return UrlSchema.model_validate(url, from_attributes=True)
 
     async def delete_url_by_id(self, url_id: UUID) -> None:
-        await self.get_url_by_id(url_id)
+        url = await self.get_url_by_id(url_id)
         await self._repository.delete_by_id(url_id)
+        url_cache.invalidate(url.hash)
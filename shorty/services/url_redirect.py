@@ -1,15 +1,40 @@
+from datetime import datetime
+from typing import AsyncIterator, Sequence
 from uuid import UUID
 
+from sqlalchemy import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from shorty.config import config
 from shorty.db.schemas.url_redirect import (
-    UrlRedirectCreateSchema,
+    UrlRedirectBucketRequestSchema,
+    UrlRedirectBucketSchema,
+    UrlRedirectBucketStatisticSchema,
     UrlRedirectRequestSchema,
     UrlRedirectSchema,
     UrlRedirectStatisticSchema,
+    UrlVisitorDaySchema,
+    UrlVisitorStatisticSchema,
 )
+from shorty.db.session import session_manager
 from shorty.repositories.url_redirect import UrlRedirectRepository
+from shorty.repositories.url_redirect_rollup import UrlRedirectRollupRepository
+from shorty.repositories.url_visitor_sketch import UrlVisitorSketchRepository
 from shorty.services.url import UrlService
+from shorty.services.user import UserService
+from shorty.utils.enums import ExportFormat, RollupGranularity
+from shorty.utils.exceptions import BadRequestError
+from shorty.utils.export import encode_rows, gzip_chunks
+from shorty.utils.hyperloglog import HyperLogLog
+
+EXPORT_COLUMNS = (
+    "id",
+    "url_id",
+    "created_at",
+    "country",
+    "user_agent_family",
+    "referrer_domain",
+)
 
 
 class UrlRedirectService:
@@ -19,13 +44,17 @@ class UrlRedirectService:
         self._repository = UrlRedirectRepository(session)
 
     async def get_redirects_by_url_id(
-        self, url_id: UUID, data: UrlRedirectRequestSchema
+        self,
+        url_id: UUID,
+        data: UrlRedirectRequestSchema,
+        page: int | None = None,
+        size: int | None = None,
     ) -> UrlRedirectStatisticSchema:
         url_service = UrlService(self._session)
         await url_service.get_url_by_id(url_id)
 
         res = await self._repository.get_redirections_by_url_id(
-            url_id, data.started_at, data.ended_at
+            url_id, data.started_at, data.ended_at, page, size
         )
         count, redirections = res[0], res[1]
 
@@ -39,9 +68,94 @@ class UrlRedirectService:
             )
         return UrlRedirectStatisticSchema(url_redirections=[], count=count)
 
-    async def create_redirection(
-        self, data: UrlRedirectCreateSchema
-    ) -> UrlRedirectSchema:
-        return UrlRedirectSchema.model_validate(
-            await self._repository.create(data.model_dump()), from_attributes=True
+    async def get_redirect_buckets_by_url_id(
+        self, url_id: UUID, data: UrlRedirectBucketRequestSchema
+    ) -> UrlRedirectBucketStatisticSchema:
+        buckets_count = (data.ended_at - data.started_at) / data.granularity.interval
+        if buckets_count > config.app.statistic_max_buckets:
+            raise BadRequestError(
+                f"too many buckets requested: {int(buckets_count)}, "
+                f"max: {config.app.statistic_max_buckets}"
+            )
+
+        url_service = UrlService(self._session)
+        await url_service.get_url_by_id(url_id)
+
+        rollup_repository = UrlRedirectRollupRepository(self._session)
+        rollups = await rollup_repository.get_buckets(
+            url_id, data.granularity, data.started_at, data.ended_at
+        )
+        return UrlRedirectBucketStatisticSchema(
+            granularity=data.granularity,
+            buckets=[
+                UrlRedirectBucketSchema.model_validate(rollup, from_attributes=True)
+                for rollup in rollups
+            ],
+            count=sum(rollup.count for rollup in rollups),
         )
+
+    async def get_unique_visitors_by_url_id(
+        self, url_id: UUID, data: UrlRedirectRequestSchema
+    ) -> UrlVisitorStatisticSchema:
+        started_at = RollupGranularity.day.truncate(data.started_at)
+        days_count = (data.ended_at - started_at) / RollupGranularity.day.interval
+        if days_count > config.app.statistic_max_buckets:
+            raise BadRequestError(
+                f"too many days requested: {int(days_count)}, "
+                f"max: {config.app.statistic_max_buckets}"
+            )
+
+        url_service = UrlService(self._session)
+        await url_service.get_url_by_id(url_id)
+
+        sketch_repository = UrlVisitorSketchRepository(self._session)
+        sketches = await sketch_repository.get_sketches(
+            url_id, started_at, data.ended_at
+        )
+        total = HyperLogLog()
+        days = []
+        for day, sketch in sketches:
+            days.append(UrlVisitorDaySchema(day=day, unique_visitors=sketch.count()))
+            total.merge(sketch)
+        return UrlVisitorStatisticSchema(days=days, unique_visitors=total.count())
+
+    async def export_redirects(
+        self,
+        data: UrlRedirectRequestSchema,
+        format: ExportFormat,
+        compress: bool = False,
+        url_id: UUID | None = None,
+        user_id: UUID | None = None,
+    ) -> AsyncIterator[bytes]:
+        if url_id is not None:
+            await UrlService(self._session).get_url_by_id(url_id)
+        if user_id is not None:
+            await UserService(self._session).get_user_by_id(user_id)
+
+        batches = self._stream_redirections(
+            data.started_at, data.ended_at, url_id, user_id
+        )
+        chunks = encode_rows(batches, EXPORT_COLUMNS, format)
+        if compress:
+            return gzip_chunks(chunks)
+        return chunks
+
+    @staticmethod
+    async def _stream_redirections(
+        started_at: datetime,
+        ended_at: datetime,
+        url_id: UUID | None,
+        user_id: UUID | None,
+    ) -> AsyncIterator[Sequence[Row]]:
+        # the body is streamed after the request session has been closed,
+        # so the export reads through a session of its own
+        async with session_manager.session() as session:
+            repository = UrlRedirectRepository(session)
+            async for batch in repository.stream_redirections(
+                started_at,
+                ended_at,
+                url_id=url_id,
+                user_id=user_id,
+                batch_size=config.app.export_batch_size,
+            ):
+                yield batch
@@ -6,6 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from shorty.db.schemas.user import UserCreateSchema, UserSchema, UserUpdateSchema
 from shorty.repositories.user import UserRepository
 from shorty.services.auth import AuthService
+from shorty.services.cache_invalidation import cache_invalidator
 from shorty.utils.exceptions import AlreadyExistError, NotFoundError
 
 
@@ -16,9 +17,7 @@ class UserService:
         self._repository = UserRepository(session)
 
     async def get_user_by_id(self, user_id: UUID) -> UserSchema:
-        user = await self._repository.get_by_id(user_id)
-        if user is None:
-            raise NotFoundError(f"user_id: {user_id}")
+        user = await AuthService(self._session).get_user_in_db(user_id)
         return UserSchema.model_validate(user, from_attributes=True)
 
     async def get_user_by_email(self, email: EmailStr) -> UserSchema:
@@ -33,17 +32,21 @@ class UserService:
             raise AlreadyExistError(f"user already exist. email: {user.email}")
         auth_service = AuthService(self._session)
 
-        user.password = auth_service.get_hash_password(user.password)
+        user.password = await auth_service.get_hash_password(user.password)
         user = await self._repository.create(user.model_dump())
         return UserSchema.model_validate(user, from_attributes=True)
 
     async def update_user_by_id(
         self, user_id: UUID, new_user: UserUpdateSchema
     ) -> UserSchema:
-        user = await self.get_user_by_id(user_id)
+        user = await self._repository.get_by_id(user_id)
+        if user is None:
+            raise NotFoundError(f"user_id: {user_id}")
+        user = UserSchema.model_validate(user, from_attributes=True)
 
         for key, value in new_user.model_dump(exclude_unset=True).items():
             setattr(user, key, value)
 
         user = await self._repository.update_by_id(user_id, user.model_dump())
+        await cache_invalidator.invalidate(self._session, "user", [user_id])
         return UserSchema.model_validate(user, from_attributes=True)
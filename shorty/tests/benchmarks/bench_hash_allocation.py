@@ -0,0 +1,125 @@
+"""Creates/sec of the random-retry and counter hash strategies at several keyspace fills.
+
+Drops and recreates all tables of the configured database, so run it against
+the test database only:
+
+    python -m shorty.tests.benchmarks.bench_hash_allocation --hash-len 3
+"""
+
+import argparse
+import os
+import sys
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--hash-len", type=int, default=3)
+    parser.add_argument("--creates", type=int, default=300)
+    parser.add_argument("--fills", type=float, nargs="+", default=[0.1, 0.5, 0.9])
+    return parser.parse_args()
+
+
+args = parse_args()
+# config reads the hash length on import
+os.environ["APP_HASH_LEN"] = str(args.hash_len)
+
+import asyncio  # noqa: E402
+import random  # noqa: E402
+import string  # noqa: E402
+import time  # noqa: E402
+from datetime import datetime, timedelta  # noqa: E402
+from unittest import mock  # noqa: E402
+
+from sqlalchemy import insert, text  # noqa: E402
+
+from shorty.config import config  # noqa: E402
+from shorty.db.models.base import Base  # noqa: E402
+from shorty.db.models.url import Url  # noqa: E402
+from shorty.db.schemas.url import UrlCreateSchema  # noqa: E402
+from shorty.db.session import SessionManager  # noqa: E402
+from shorty.services import url as url_module  # noqa: E402
+from shorty.services.hash_counter import CounterHashAllocator  # noqa: E402
+from shorty.services.url import UrlService  # noqa: E402
+from shorty.utils.enums import HashStrategy  # noqa: E402
+from shorty.utils.hashing import HashPermutation  # noqa: E402
+
+
+def to_hash(index: int, length: int) -> str:
+    chars = []
+    for _ in range(length):
+        index, position = divmod(index, 26)
+        chars.append(string.ascii_uppercase[position])
+    return "".join(chars)
+
+
+async def seed(session_manager, strategy, permutation, count) -> None:
+    if strategy == HashStrategy.counter:
+        hashes = [permutation.encode(index) for index in range(count)]
+    else:
+        hashes = [
+            to_hash(index, permutation.length)
+            for index in random.sample(range(permutation.size), count)
+        ]
+
+    expired_at = datetime.now() + timedelta(days=1)
+    async with session_manager.session() as session:
+        for start in range(0, count, 5000):
+            await session.execute(
+                insert(Url),
+                [
+                    {
+                        "url": "https://example.com/",
+                        "hash": url_hash,
+                        "expired_at": expired_at,
+                    }
+                    for url_hash in hashes[start : start + 5000]
+                ],
+            )
+        if strategy == HashStrategy.counter:
+            await session.execute(text(f"SELECT setval('url_hash_seq', {count})"))
+        await session.commit()
+
+
+async def run(session_manager, strategy, fill, creates) -> float:
+    async with session_manager._engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    permutation = HashPermutation(config.app.secret_key, args.hash_len)
+    await seed(session_manager, strategy, permutation, int(permutation.size * fill))
+
+    allocator = CounterHashAllocator(
+        permutation, block_size=config.app.hash_counter_block_size
+    )
+    data = UrlCreateSchema(
+        url="https://example.com/", expiration_time=datetime.now() + timedelta(hours=1)
+    )
+    with (
+        mock.patch.object(config.app, "hash_strategy", strategy),
+        mock.patch.object(url_module, "counter_hash_allocator", allocator),
+    ):
+        async with session_manager.session() as session:
+            url_service = UrlService(session)
+            started_at = time.perf_counter()
+            for _ in range(creates):
+                await url_service.create_url(data, None)
+            elapsed = time.perf_counter() - started_at
+    return creates / elapsed
+
+
+async def main() -> None:
+    session_manager = SessionManager(config.postgres.get_dsn)
+    print(f"keyspace: 26^{args.hash_len}, creates per run: {args.creates}")
+    print(f"{'fill':>6} {'random, creates/s':>18} {'counter, creates/s':>19}")
+    for fill in args.fills:
+        results = [
+            await run(session_manager, strategy, fill, args.creates)
+            for strategy in (HashStrategy.random, HashStrategy.counter)
+        ]
+        print(f"{fill:>6.0%} {results[0]:>18.1f} {results[1]:>19.1f}")
+        sys.stdout.flush()
+    await session_manager._engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
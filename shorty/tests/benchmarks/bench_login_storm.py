@@ -0,0 +1,118 @@
+"""Redirect latency while many users log in at once.
+
+Runs the app in-process and compares argon2 running inline on the event loop
+with the bounded password hashing pool. Drops and recreates all tables of the
+configured database, so run it against the test database only:
+
+    python -m shorty.tests.benchmarks.bench_login_storm --logins 16
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime, timedelta
+from unittest import mock
+
+import httpx
+
+from shorty.__main__ import app
+from shorty.config import config
+from shorty.db.models.base import Base
+from shorty.db.schemas.url import UrlCreateSchema
+from shorty.db.schemas.user import UserCreateSchema
+from shorty.db.session import session_manager
+from shorty.services.security import security_context
+from shorty.services.url import UrlService
+from shorty.services.user import UserService
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=16, help="concurrent logins")
+    parser.add_argument("--redirects", type=int, default=4, help="redirect clients")
+    parser.add_argument("--duration", type=float, default=5.0)
+    return parser.parse_args()
+
+
+async def prepare() -> str:
+    async with session_manager._engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    async with session_manager.session() as session:
+        await UserService(session).create_user(
+            UserCreateSchema(name="user", email="user@example.com", password="pw")
+        )
+        url = await UrlService(session).create_url(
+            UrlCreateSchema(
+                url="https://example.com/",
+                expiration_time=datetime.now() + timedelta(hours=1),
+            ),
+            None,
+        )
+    return url.hash
+
+
+async def run(url_hash: str, logins: int, redirects: int, duration: float) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    latencies: list[float] = []
+    statuses: list[int] = []
+    deadline = time.perf_counter() + duration
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+
+        async def login() -> None:
+            while time.perf_counter() < deadline:
+                response = await client.post(
+                    "/api/token/",
+                    data={"username": "user@example.com", "password": "pw"},
+                )
+                statuses.append(response.status_code)
+
+        async def redirect() -> None:
+            while time.perf_counter() < deadline:
+                started_at = time.perf_counter()
+                await client.get(f"/{url_hash}/", follow_redirects=False)
+                latencies.append(time.perf_counter() - started_at)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(
+            *(login() for _ in range(logins)), *(redirect() for _ in range(redirects))
+        )
+
+    latencies.sort()
+    return {
+        "p50": statistics.median(latencies) * 1000,
+        "p99": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "logins": statuses.count(201) / duration,
+        "shed": statuses.count(503),
+    }
+
+
+async def inline(func, *args):
+    return func(*args)
+
+
+async def main() -> None:
+    args = parse_args()
+    url_hash = await prepare()
+    print(
+        f"{args.logins} concurrent logins, {args.redirects} redirect clients, "
+        f"{config.app.password_hash_workers} hash workers"
+    )
+    print(f"{'mode':>8} {'p50, ms':>8} {'p99, ms':>8} {'logins/s':>9} {'503s':>5}")
+    for mode in ("inline", "pool"):
+        if mode == "inline":
+            with mock.patch.object(security_context, "_run", inline):
+                result = await run(url_hash, args.logins, args.redirects, args.duration)
+        else:
+            result = await run(url_hash, args.logins, args.redirects, args.duration)
+        print(
+            f"{mode:>8} {result['p50']:>8.1f} {result['p99']:>8.1f} "
+            f"{result['logins']:>9.1f} {result['shed']:>5}"
+        )
+    await session_manager._engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+
+from shorty.config import config
+from shorty.db.schemas.user import UserCreateSchema
+from shorty.db.session import SessionManager
+from shorty.services.auth import AuthService, user_cache
+from shorty.services.user import UserService
+from shorty.utils.enums import TokenType
+from shorty.utils.exceptions import UnauthorizedError
+
+
+@pytest.fixture(autouse=True)
+def clear_user_cache():
+    user_cache.clear()
+    yield
+    user_cache.clear()
+
+
+async def create_user(session):
+    return await UserService(session).create_user(
+        UserCreateSchema(name="user", email="user@example.com", password="password")
+    )
+
+
+class TestAuthService:
+
+    async def test_stateless_access_token_uses_user_cache(
+        self, get_session, monkeypatch
+    ):
+        monkeypatch.setattr(config.app, "stateless_auth", True)
+        user = await create_user(get_session)
+        auth_service = AuthService(get_session)
+        token = auth_service.emit_access_token(user.email, user.id)
+
+        assert (
+            await auth_service.validate_token(token, TokenType.access)
+        ).id == user.id
+        hits = user_cache.stats().hits
+        assert (
+            await auth_service.validate_token(token, TokenType.access)
+        ).id == user.id
+        assert user_cache.stats().hits == hits + 1
+
+    @pytest.mark.parametrize("stateless_auth", [False, True])
+    async def test_revoked_token_is_rejected(
+        self, get_session, monkeypatch, stateless_auth
+    ):
+        monkeypatch.setattr(config.app, "stateless_auth", stateless_auth)
+        user = await create_user(get_session)
+        auth_service = AuthService(get_session)
+        token = auth_service.emit_access_token(user.email, user.id)
+        await auth_service.validate_token(token, TokenType.access)
+
+        await auth_service.revoke_tokens_by_user_id(user)
+
+        with pytest.raises(UnauthorizedError):
+            await auth_service.validate_token(token, TokenType.access)
+        token = auth_service.emit_access_token(user.email, user.id, token_version=1)
+        assert (
+            await auth_service.validate_token(token, TokenType.access)
+        ).id == user.id
+
+    async def test_concurrent_requests_use_own_sessions(self, get_session):
+        user = await create_user(get_session)
+        token = AuthService(get_session).emit_access_token(user.email, user.id)
+        session_manager = SessionManager(config.postgres.get_dsn)
+
+        async def request():
+            async with session_manager.session() as session:
+                auth_service = AuthService(session)
+                assert auth_service._session is session
+                return await auth_service.validate_token(token, TokenType.access)
+
+        users = await asyncio.gather(*(request() for _ in range(10)))
+        assert {u.id for u in users} == {user.id}
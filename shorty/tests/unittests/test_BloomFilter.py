@@ -0,0 +1,42 @@
+import random
+import string
+
+import pytest
+
+from shorty.utils.bloom import BloomFilter
+
+
+def random_hashes(count: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    return ["".join(rng.choices(string.ascii_uppercase, k=5)) for _ in range(count)]
+
+
+class TestBloomFilter:
+
+    def test_no_false_negatives(self):
+        bloom = BloomFilter(10000, 0.01)
+        hashes = random_hashes(10000, seed=1)
+        for url_hash in hashes:
+            bloom.add(url_hash)
+        assert all(url_hash in bloom for url_hash in hashes)
+
+    def test_false_positive_rate(self):
+        bloom = BloomFilter(10000, 0.01)
+        added = set(random_hashes(10000, seed=1))
+        for url_hash in added:
+            bloom.add(url_hash)
+        probes = [h for h in random_hashes(20000, seed=2) if h not in added]
+        false_positives = sum(url_hash in bloom for url_hash in probes)
+        assert false_positives / len(probes) < 0.02
+        assert bloom.estimated_fp_rate() == pytest.approx(0.01, rel=0.2)
+
+    def test_items_are_counted_once(self):
+        bloom = BloomFilter(100, 0.01)
+        assert bloom.add("ABCDE")
+        assert not bloom.add("ABCDE")
+        assert bloom.items == 1
+        assert "ABCDF" not in bloom
+
+    def test_invalid_fp_rate(self):
+        with pytest.raises(ValueError):
+            BloomFilter(100, 1)
@@ -0,0 +1,103 @@
+import asyncio
+import uuid
+
+from sqlalchemy import text
+
+from shorty.config import config
+from shorty.db.models.url import URL_CHANGED_CHANNEL
+from shorty.repositories.url import UrlRepository
+from shorty.services.cache_invalidation import CacheInvalidator
+from shorty.tests.unittests.factories import UrlFactory
+from shorty.utils.cache import TTLCache
+
+
+def new_worker(cache: TTLCache) -> CacheInvalidator:
+    invalidator = CacheInvalidator(
+        config.postgres.get_dsn_plain,
+        channel="test_cache",
+        min_backoff=0.05,
+        max_backoff=0.2,
+        ping_interval=0.2,
+    )
+    invalidator.register("user", cache, uuid.UUID)
+    return invalidator
+
+
+async def wait_for(condition) -> None:
+    for _ in range(100):
+        if condition():
+            return
+        await asyncio.sleep(0.02)
+
+
+class TestCacheInvalidator:
+
+    async def test_invalidation_reaches_other_workers(self, get_session):
+        key = uuid.uuid4()
+        first_cache, second_cache = TTLCache(10, 60), TTLCache(10, 60)
+        first, second = new_worker(first_cache), new_worker(second_cache)
+        await first.start()
+        await second.start()
+        try:
+            await wait_for(
+                lambda: first.connected.is_set() and second.connected.is_set()
+            )
+            first_cache.set(key, "A")
+            second_cache.set(key, "A")
+            await first.invalidate(get_session, "user", [key])
+            assert first_cache.get(key) is None
+
+            await wait_for(lambda: second.received)
+            assert second_cache.get(key) is None
+        finally:
+            await first.stop()
+            await second.stop()
+
+    async def test_url_trigger_notifies(self, get_session):
+        url = UrlFactory(hash_len=5)
+        cache = TTLCache(10, 60)
+        worker = new_worker(TTLCache(10, 60))
+        worker.subscribe(URL_CHANGED_CHANNEL, cache.invalidate)
+        await worker.start()
+        try:
+            await wait_for(worker.connected.is_set)
+            cache.set(url.hash, "url")
+            await UrlRepository(get_session).update_by_id(
+                url.id, {"url": "https://example.com/"}
+            )
+            await wait_for(lambda: worker.received)
+            assert cache.get(url.hash) is None
+        finally:
+            await worker.stop()
+
+    async def test_reconnect_resyncs(self, get_session):
+        cache = TTLCache(10, 60)
+        worker = new_worker(cache)
+        await worker.start()
+        try:
+            await wait_for(worker.connected.is_set)
+            cache.set(uuid.uuid4(), "A")
+            await get_session.execute(
+                text(
+                    "SELECT pg_terminate_backend(pid) FROM pg_stat_activity "
+                    "WHERE application_name = 'shorty-cache-listener'"
+                )
+            )
+            await get_session.commit()
+            await wait_for(lambda: worker.resyncs == 2 and worker.connected.is_set())
+            assert worker.stats().reconnects >= 1
+            assert worker.stats().connected
+            assert len(cache) == 0
+        finally:
+            await worker.stop()
+
+    async def test_malformed_payload_is_ignored(self):
+        worker = new_worker(TTLCache(10, 60))
+        worker._dispatch(None, 0, "test_cache", "not json")
+        worker._dispatch(None, 0, "test_cache", '{"cache": "url", "keys": []}')
+        assert worker.received == 2
+
+    async def test_unregistered_cache_is_only_published(self, get_session):
+        worker = new_worker(TTLCache(10, 60))
+        await worker.invalidate(get_session, "url", ["ABCDE"])
+        worker._on_invalidation('{"cache": "url", "keys": ["ABCDE"]}')
@@ -0,0 +1,68 @@
+from sqlalchemy import select
+
+from shorty.db.models.referrer_domain import ReferrerDomain
+from shorty.db.models.user_agent_family import UserAgentFamily
+from shorty.services.click_enricher import ClickEnricher
+from shorty.utils.clicks import parse_referrer_domain, parse_user_agent_family
+from shorty.utils.geoip import GeoIPDatabase
+
+CHROME = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
+)
+FIREFOX = "Mozilla/5.0 (X11; Linux x86_64; rv:125.0) Gecko/20100101 Firefox/125.0"
+
+
+class TestClickEnricher:
+
+    def test_parse(self):
+        assert parse_user_agent_family(CHROME) == "chrome"
+        assert parse_user_agent_family(FIREFOX) == "firefox"
+        assert parse_user_agent_family("Googlebot/2.1") == "bot"
+        assert parse_user_agent_family("something") == "other"
+        assert parse_user_agent_family(None) is None
+        assert parse_referrer_domain("https://www.Example.com/a?b=c") == "example.com"
+        assert parse_referrer_domain("not a url") is None
+
+    async def test_enrich(self, get_session):
+        enricher = ClickEnricher(
+            GeoIPDatabase([("10.0.0.0/8", "RU")]), b"key", dimension_cache_size=10
+        )
+        batch = [
+            {
+                "user_agent": CHROME,
+                "referrer": "https://t.me/x",
+                "client_ip": "10.1.1.1",
+            },
+            {"user_agent": CHROME, "referrer": None, "client_ip": "10.1.1.1"},
+            {"user_agent": FIREFOX, "referrer": None, "client_ip": None},
+        ]
+        await enricher.enrich(get_session, batch)
+
+        families = dict(
+            (
+                await get_session.execute(
+                    select(UserAgentFamily.name, UserAgentFamily.id)
+                )
+            )
+            .tuples()
+            .all()
+        )
+        domain_id = await get_session.scalar(
+            select(ReferrerDomain.id).where(ReferrerDomain.name == "t.me")
+        )
+        assert [row["user_agent_family_id"] for row in batch] == [
+            families["chrome"],
+            families["chrome"],
+            families["firefox"],
+        ]
+        assert [row["referrer_domain_id"] for row in batch] == [domain_id, None, None]
+        assert [row["country"] for row in batch] == ["RU", "RU", None]
+        assert batch[0]["ip_hash"] == batch[1]["ip_hash"] is not None
+        assert batch[2]["ip_hash"] is None
+        assert "user_agent" not in batch[0]
+
+        batch = [{"user_agent": CHROME, "referrer": None, "client_ip": None}]
+        await enricher.enrich(get_session, batch)
+        assert batch[0]["user_agent_family_id"] == families["chrome"]
+        assert enricher.user_agent_families.stats().hits == 1
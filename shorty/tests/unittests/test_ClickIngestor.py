@@ -0,0 +1,125 @@
+from sqlalchemy import func, select
+
+from shorty.config import config
+from shorty.db.models.url_redirect import UrlRedirect
+from shorty.db.models.url_redirect_rollup import UrlRedirectRollup
+from shorty.db.models.url_visitor_sketch import UrlVisitorSketch
+from shorty.db.schemas.url_redirect import UrlRedirectCreateSchema
+from shorty.db.session import SessionManager
+from shorty.repositories.url import UrlRepository
+from shorty.services.click_enricher import ClickEnricher
+from shorty.services.click_ingestor import ClickIngestor
+from shorty.tests.unittests.factories import UrlFactory
+from shorty.utils.enums import RollupGranularity
+from shorty.utils.hyperloglog import HyperLogLog
+
+
+class TestClickIngestor:
+
+    async def test_flush_on_stop(self, get_session):
+        url = UrlFactory(hash_len=5)
+        ingestor = ClickIngestor(
+            SessionManager(config.postgres.get_dsn),
+            ClickEnricher(None, b"key", dimension_cache_size=100),
+            max_batch_size=3,
+            max_delay=60,
+            max_queue_size=100,
+            drain_timeout=5,
+        )
+        await ingestor.start()
+        for _ in range(10):
+            ingestor.record(UrlRedirectCreateSchema(url_id=url.id))
+        await ingestor.stop()
+
+        count = await get_session.scalar(select(func.count()).select_from(UrlRedirect))
+        assert count == 10
+        assert ingestor.stats().flushed == 10
+        assert ingestor.stats().queued == 0
+
+    async def test_overflow_is_counted(self, get_session):
+        url = UrlFactory(hash_len=5)
+        ingestor = ClickIngestor(
+            SessionManager(config.postgres.get_dsn),
+            ClickEnricher(None, b"key", dimension_cache_size=100),
+            max_batch_size=10,
+            max_delay=60,
+            max_queue_size=2,
+            drain_timeout=5,
+        )
+        await ingestor.start()
+        for _ in range(5):
+            ingestor.record(UrlRedirectCreateSchema(url_id=url.id))
+        await ingestor.stop()
+
+        assert ingestor.stats().dropped == 3
+        assert ingestor.stats().flushed == 2
+
+    async def test_rollups_are_incremented(self, get_session):
+        url = UrlFactory(hash_len=5)
+        ingestor = ClickIngestor(
+            SessionManager(config.postgres.get_dsn),
+            ClickEnricher(None, b"key", dimension_cache_size=100),
+            max_batch_size=4,
+            max_delay=60,
+            max_queue_size=100,
+            drain_timeout=5,
+        )
+        await ingestor.start()
+        for _ in range(10):
+            ingestor.record(UrlRedirectCreateSchema(url_id=url.id))
+        await ingestor.stop()
+
+        rollups = (
+            await get_session.scalars(
+                select(UrlRedirectRollup).where(UrlRedirectRollup.url_id == url.id)
+            )
+        ).all()
+        for granularity in RollupGranularity:
+            assert sum(r.count for r in rollups if r.granularity == granularity) == 10
+
+    async def test_visitor_sketches_are_merged(self, get_session):
+        url = UrlFactory(hash_len=5)
+        ingestor = ClickIngestor(
+            SessionManager(config.postgres.get_dsn),
+            ClickEnricher(None, b"key", dimension_cache_size=100),
+            max_batch_size=7,
+            max_delay=60,
+            max_queue_size=1000,
+            drain_timeout=5,
+        )
+        await ingestor.start()
+        for i in range(300):
+            ingestor.record(
+                UrlRedirectCreateSchema(url_id=url.id, client_ip=f"10.0.0.{i % 100}")
+            )
+        await ingestor.stop()
+
+        sketches = (
+            await get_session.scalars(
+                select(UrlVisitorSketch).where(UrlVisitorSketch.url_id == url.id)
+            )
+        ).all()
+        assert len(sketches) == 1
+        assert abs(HyperLogLog.from_bytes(sketches[0].sketch).count() - 100) <= 3
+
+    async def test_clicks_of_deleted_urls_are_dropped(self, get_session):
+        url, deleted = UrlFactory(hash_len=5), UrlFactory(hash_len=5)
+        ingestor = ClickIngestor(
+            SessionManager(config.postgres.get_dsn),
+            ClickEnricher(None, b"key", dimension_cache_size=100),
+            max_batch_size=10,
+            max_delay=60,
+            max_queue_size=100,
+            drain_timeout=5,
+        )
+        await ingestor.start()
+        ingestor.record(UrlRedirectCreateSchema(url_id=url.id))
+        ingestor.record(UrlRedirectCreateSchema(url_id=deleted.id))
+        await UrlRepository(get_session).delete_by_id(deleted.id)
+        await ingestor.stop()
+
+        count = await get_session.scalar(select(func.count()).select_from(UrlRedirect))
+        assert count == 1
+        assert ingestor.stats().flushed == 1
+        assert ingestor.stats().dropped == 1
+        assert ingestor.stats().failed == 0
@@ -0,0 +1,61 @@
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+from starlette.requests import Request
+
+from shorty.__main__ import app
+from shorty.config import config
+from shorty.db.schemas.url import UrlCreateSchema
+from shorty.db.schemas.user import UserCreateSchema
+from shorty.db.session import session_manager
+from shorty.endpoints.dependencies import check_admin, check_auth
+from shorty.services.auth import AuthService
+from shorty.services.click_ingestor import click_ingestor
+from shorty.services.url import UrlService
+from shorty.services.user import UserService
+from shorty.utils.exceptions import ForbiddenError
+
+
+class TestDependencies:
+
+    async def test_cached_redirect_does_not_checkout_connection(self, get_session):
+        url = await UrlService(get_session).create_url(
+            UrlCreateSchema(
+                url="https://ya.ru/",
+                expiration_time=datetime.now() + timedelta(hours=1),
+            ),
+            None,
+        )
+        transport = httpx.ASGITransport(app=app)
+        await click_ingestor.start()
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as c:
+            await c.get(f"/{url.hash}/")
+            checkouts = session_manager.pool_stats().checkouts
+            for _ in range(5):
+                response = await c.get(f"/{url.hash}/")
+                assert response.status_code == 307
+        assert session_manager.pool_stats().checkouts == checkouts
+        await click_ingestor.stop()
+        await session_manager._engine.dispose()
+
+    async def test_check_auth_releases_connection(self, get_session):
+        user = await UserService(get_session).create_user(
+            UserCreateSchema(name="user", email="user@example.com", password="pw")
+        )
+        token = AuthService(get_session).emit_access_token(user.email, user.id)
+        request = Request(
+            {"type": "http", "headers": [(b"cookie", f"access_token={token}".encode())]}
+        )
+
+        assert (await check_auth(request, get_session)).id == user.id
+        assert not get_session.in_transaction()
+
+    async def test_check_admin(self, get_session, monkeypatch):
+        user = await UserService(get_session).create_user(
+            UserCreateSchema(name="user", email="user@example.com", password="pw")
+        )
+        with pytest.raises(ForbiddenError):
+            await check_admin(user)
+        monkeypatch.setattr(config.app, "admin_user_ids", [user.id])
+        assert await check_admin(user) == user
@@ -0,0 +1,44 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+
+from shorty.config import config
+from shorty.db.models.url import Url
+from shorty.db.session import SessionManager
+from shorty.repositories.hash_pool import HashPoolRepository
+from shorty.services.partitions import RedirectPartitionManager
+from shorty.services.reaper import ExpiryReaper
+from shorty.tests.unittests.factories import UrlFactory
+from shorty.utils.enums import PartitionInterval
+
+
+class TestExpiryReaper:
+
+    async def test_reap_expired_urls(self, get_session):
+        expired = [
+            UrlFactory(hash_len=5, expired_at=datetime.now() - timedelta(days=2))
+            for _ in range(5)
+        ]
+        UrlFactory(hash_len=5, expired_at=datetime.now() - timedelta(minutes=1))
+        UrlFactory(hash_len=5)
+        reaper = ExpiryReaper(
+            SessionManager(config.postgres.get_dsn),
+            interval=60,
+            batch_size=2,
+            batch_pause=0,
+            url_grace=86400,
+            partition_manager=RedirectPartitionManager(
+                PartitionInterval.month, ahead=1, retention=0
+            ),
+        )
+
+        stats = await reaper.run_once()
+
+        assert stats.urls == 5
+        assert stats.recycled_hashes == 5
+        assert stats.created_partitions == 2
+        assert await get_session.scalar(select(func.count()).select_from(Url)) == 2
+        assert (
+            await HashPoolRepository(get_session).fill([url.hash for url in expired])
+            == 0
+        )
@@ -0,0 +1,43 @@
+from shorty.utils.geoip import GeoIPDatabase
+
+
+class TestGeoIPDatabase:
+
+    def test_lookup(self, tmp_path):
+        path = tmp_path / "geoip.csv"
+        path.write_text(
+            "network,country\n"
+            "1.0.0.0/24,au\n"
+            "5.255.255.0/24,RU\n"
+            "2a02:6b8::/32,RU\n"
+        )
+        geoip = GeoIPDatabase.from_csv(path)
+        assert len(geoip) == 3
+        assert geoip.lookup("1.0.0.1") == "AU"
+        assert geoip.lookup("5.255.255.77") == "RU"
+        assert geoip.lookup("::ffff:5.255.255.77") == "RU"
+        assert geoip.lookup("2a02:6b8::1") == "RU"
+        assert geoip.lookup("1.0.1.1") is None
+        assert geoip.lookup("0.0.0.1") is None
+        assert geoip.lookup("not an ip") is None
+
+    def test_nested_networks_and_bad_rows(self, tmp_path):
+        path = tmp_path / "geoip.csv"
+        path.write_text(
+            "network,country\n"
+            "10.0.0.0/8,AA\n"
+            "10.1.0.0/16,BB\n"
+            "10.1.2.0/24,CC\n"
+            "10.3.0.0/16,DD\n"
+            "10.300.0.0/16,XX\n"
+        )
+        geoip = GeoIPDatabase.from_csv(path)
+        assert geoip.skipped == 1
+        assert geoip.lookup("10.0.0.1") == "AA"
+        assert geoip.lookup("10.1.0.1") == "BB"
+        assert geoip.lookup("10.1.2.1") == "CC"
+        assert geoip.lookup("10.1.3.1") == "BB"
+        assert geoip.lookup("10.2.0.1") == "AA"
+        assert geoip.lookup("10.3.0.1") == "DD"
+        assert geoip.lookup("10.255.255.255") == "AA"
+        assert geoip.lookup("11.0.0.1") is None
@@ -0,0 +1,73 @@
+import asyncio
+
+from shorty.config import config
+from shorty.db.session import SessionManager
+from shorty.services.cache_invalidation import CacheInvalidator
+from shorty.services.hash_filter import HashFilter
+from shorty.tests.unittests.factories import UrlFactory
+
+
+def new_filter() -> tuple[HashFilter, CacheInvalidator]:
+    invalidator = CacheInvalidator(
+        config.postgres.get_dsn_plain,
+        channel="test_cache",
+        min_backoff=0.05,
+        max_backoff=0.2,
+        ping_interval=0.2,
+    )
+    hash_filter = HashFilter(
+        SessionManager(config.postgres.get_dsn),
+        invalidator,
+        fp_rate=0.01,
+        min_capacity=1000,
+        rebuild_interval=60,
+        batch_size=2,
+    )
+    return hash_filter, invalidator
+
+
+async def wait_for(condition) -> None:
+    for _ in range(100):
+        if condition():
+            return
+        await asyncio.sleep(0.02)
+
+
+class TestHashFilter:
+
+    async def test_rebuild(self, get_session):
+        urls = [UrlFactory(hash_len=5) for _ in range(5)]
+        hash_filter, invalidator = new_filter()
+        invalidator.connected.set()
+        assert hash_filter.might_contain("ZZZZZ")
+
+        await hash_filter.rebuild()
+        assert all(hash_filter.might_contain(url.hash) for url in urls)
+        assert not hash_filter.might_contain("ZZZZZ")
+        stats = hash_filter.stats()
+        assert stats.items == 5
+        assert stats.rejected == 1
+        assert stats.rebuilds == 1
+
+    async def test_bypassed_while_disconnected(self, get_session):
+        hash_filter, invalidator = new_filter()
+        invalidator.connected.set()
+        await hash_filter.rebuild()
+        invalidator.connected.clear()
+        assert hash_filter.might_contain("ZZZZZ")
+        hash_filter.record_false_positive()
+        assert hash_filter.stats().false_positives == 0
+
+    async def test_new_urls_are_added(self, get_session):
+        hash_filter, invalidator = new_filter()
+        await invalidator.start()
+        await hash_filter.start()
+        try:
+            await wait_for(lambda: hash_filter.is_active)
+            assert hash_filter.is_active
+            url = UrlFactory(hash_len=5)
+            await wait_for(lambda: hash_filter.stats().items)
+            assert hash_filter.might_contain(url.hash)
+        finally:
+            await hash_filter.stop()
+            await invalidator.stop()
@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta
+from unittest import mock
+
+import pytest
+
+from shorty.config import config
+from shorty.db.schemas.url import UrlCreateSchema
+from shorty.services.hash_counter import CounterHashAllocator
+from shorty.services.url import UrlService
+from shorty.utils.enums import HashStrategy
+from shorty.utils.hashing import HashPermutation
+
+
+class TestHashPermutation:
+
+    @pytest.mark.parametrize("length", [1, 2, 3])
+    def test_is_bijective(self, length: int):
+        permutation = HashPermutation("secret", length)
+        hashes = [permutation.encode(index) for index in range(permutation.size)]
+
+        assert len(set(hashes)) == permutation.size
+        assert all(len(url_hash) == length for url_hash in hashes)
+        assert all(url_hash.isupper() for url_hash in hashes)
+        assert [permutation.decode(url_hash) for url_hash in hashes] == list(
+            range(permutation.size)
+        )
+
+    def test_depends_on_key(self):
+        first = HashPermutation("first", 5)
+        second = HashPermutation("second", 5)
+        assert [first.encode(i) for i in range(10)] != [
+            second.encode(i) for i in range(10)
+        ]
+
+    def test_out_of_range(self):
+        with pytest.raises(ValueError):
+            HashPermutation("secret", 2).encode(26**2)
+
+    async def test_counter_allocator(self, get_session):
+        allocator = CounterHashAllocator(HashPermutation("secret", 5), block_size=10)
+        hashes = [await allocator.allocate(get_session) for _ in range(25)]
+
+        assert len(set(hashes)) == 25
+        assert allocator.leases == 3
+
+    async def test_counter_allocator_exhausted(self, get_session):
+        allocator = CounterHashAllocator(HashPermutation("secret", 1), block_size=10)
+        hashes = [await allocator.allocate(get_session) for _ in range(30)]
+
+        assert len(set(hashes) - {None}) == 26
+        assert hashes[-4:] == [None] * 4
+        # the exhausted keyspace is remembered instead of leased again
+        assert allocator.leases == 3
+
+        rechecking = CounterHashAllocator(
+            HashPermutation("secret", 1), block_size=10, recheck_interval=0
+        )
+        for _ in range(2):
+            assert await rechecking.allocate(get_session) is None
+        assert rechecking.leases == 2
+
+    async def test_create_url_with_counter_strategy(self, get_session):
+        url_service = UrlService(get_session)
+        data = UrlCreateSchema(
+            url="https://ya.ru/", expiration_time=datetime.now() + timedelta(hours=1)
+        )
+        with mock.patch.object(config.app, "hash_strategy", HashStrategy.counter):
+            first = await url_service.create_url(data, None)
+            second = await url_service.create_url(data, None)
+
+        assert first.hash != second.hash
@@ -0,0 +1,73 @@
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+
+from shorty.config import config
+from shorty.db.models.hash_pool import HashPool
+from shorty.db.schemas.url import UrlCreateSchema
+from shorty.repositories.hash_pool import HashPoolRepository
+from shorty.services.hash_pool import HashPoolService
+from shorty.services.url import UrlService
+from shorty.tests.unittests.factories import UrlFactory
+from shorty.utils.enums import HashStrategy
+
+
+class TestHashPoolService:
+
+    async def test_refill(self, get_session):
+        hash_pool_service = HashPoolService(get_session)
+        filled = await hash_pool_service.refill(size=50, batch_size=20)
+        assert filled == 50
+        assert await hash_pool_service.refill(size=50, batch_size=20) == 0
+        assert await HashPoolRepository(get_session).get_count() == 50
+
+    async def test_fill_skips_used_hashes(self, get_session):
+        url = UrlFactory(hash_len=5)
+        repo = HashPoolRepository(get_session)
+        assert await repo.fill([url.hash, "ZZZZZ"]) == 1
+        assert await repo.fill(["ZZZZZ"]) == 0
+
+    async def test_create_url_claims_pooled_hash(self, get_session):
+        await HashPoolRepository(get_session).fill(["QQQQQ"])
+        url_service = UrlService(get_session)
+        data = UrlCreateSchema(
+            url="https://ya.ru/", expiration_time=datetime.now() + timedelta(hours=1)
+        )
+
+        url = await url_service.create_url(data, None)
+        assert url.hash == "QQQQQ"
+        assert await HashPoolRepository(get_session).get_count() == 0
+
+        url = await url_service.create_url(data, None)
+        assert url.hash != "QQQQQ"
+
+    async def test_used_pooled_hash_is_discarded(self, get_session):
+        url = UrlFactory(hash_len=5)
+        await HashPoolRepository(get_session).fill(["QQQQQ"])
+        # a hash that got used without going through the pool
+        await get_session.execute(
+            insert(HashPool).values(id=uuid.uuid4(), hash=url.hash)
+        )
+        await get_session.commit()
+        assert await HashPoolRepository(get_session).claim_many(5) == ["QQQQQ"]
+        await get_session.rollback()
+
+        assert await HashPoolRepository(get_session).discard_used() == 1
+        assert await HashPoolRepository(get_session).get_count() == 1
+
+    async def test_used_random_hash_is_not_claimed(self, get_session, monkeypatch):
+        monkeypatch.setattr(config.app, "hash_strategy", HashStrategy.random)
+        url_service = UrlService(get_session)
+        url_service._generate_random_hash = lambda: "QQQQQ"
+        await HashPoolRepository(get_session).fill(["QQQQQ"])
+        data = UrlCreateSchema(
+            url="https://ya.ru/", expiration_time=datetime.now() + timedelta(hours=1)
+        )
+
+        url = await url_service._allocate_url(data, None)
+        assert url.hash == "QQQQQ"
+        # the pool keeps the hash, claims skip it and the refill removes it
+        assert await HashPoolRepository(get_session).claim_many(5) == []
+        await get_session.rollback()
+        assert await HashPoolRepository(get_session).discard_used() == 1
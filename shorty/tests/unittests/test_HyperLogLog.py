@@ -0,0 +1,45 @@
+import random
+
+from shorty.utils.hyperloglog import HyperLogLog
+
+
+def random_hashes(count: int, seed: int) -> list[int]:
+    rng = random.Random(seed)
+    return [rng.getrandbits(64) for _ in range(count)]
+
+
+class TestHyperLogLog:
+
+    def test_count(self):
+        for count in (0, 10, 1000, 100000):
+            sketch = HyperLogLog()
+            for value in random_hashes(count, seed=count):
+                sketch.add(value)
+                sketch.add(value)
+            assert abs(sketch.count() - count) <= max(1, count * 0.03)
+
+    def test_merge(self):
+        values = random_hashes(50000, seed=1)
+        first, second, both = HyperLogLog(), HyperLogLog(), HyperLogLog()
+        for value in values[:30000]:
+            first.add(value)
+        for value in values[20000:]:
+            second.add(value)
+        for value in values:
+            both.add(value)
+        assert first.merge(second).registers == both.registers
+
+    def test_serialization(self):
+        sparse = HyperLogLog()
+        for value in random_hashes(5, seed=2):
+            sparse.add(value)
+        data = sparse.to_bytes()
+        assert len(data) == 2 + 5 * 3
+        assert HyperLogLog.from_bytes(data).registers == sparse.registers
+
+        dense = HyperLogLog()
+        for value in random_hashes(20000, seed=3):
+            dense.add(value)
+        data = dense.to_bytes()
+        assert len(data) == 2 + 8192
+        assert HyperLogLog.from_bytes(data).registers == dense.registers
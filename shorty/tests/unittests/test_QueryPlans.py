@@ -0,0 +1,92 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+
+from shorty.repositories.auth import AuthRepository
+from shorty.repositories.url import UrlRepository
+from shorty.repositories.url_redirect import UrlRedirectRepository
+from shorty.repositories.url_redirect_rollup import UrlRedirectRollupRepository
+from shorty.repositories.url_visitor_sketch import UrlVisitorSketchRepository
+from shorty.repositories.user import UserRepository
+from shorty.utils.enums import RollupGranularity
+
+
+class TestQueryPlans:
+    """Every hot repository query must be answerable without a sequential scan.
+
+    Sequential scans are disabled for the EXPLAIN, so the planner only falls
+    back to one when no index can serve the query.
+    """
+
+    async def seed(self, session):
+        now = datetime.now()
+        user = await UserRepository(session).create(
+            {"name": "user", "email": "user@example.com", "password": "pw"}
+        )
+        url = await UrlRepository(session).create(
+            {
+                "url": "https://ya.ru/",
+                "hash": "AAAAA",
+                "user_id": user.id,
+                "expired_at": now + timedelta(days=1),
+            }
+        )
+        await AuthRepository(session).create(
+            {"refresh_token": "token", "user_id": user.id, "expired_at": now}
+        )
+        return user, url, now
+
+    async def test_no_sequential_scans(self, get_session):
+        user, url, now = await self.seed(get_session)
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if (
+                statement.lstrip()
+                .upper()
+                .startswith(("SELECT", "UPDATE", "DELETE", "WITH"))
+            ):
+                statements.append((statement, parameters))
+
+        engine = get_session.bind.sync_engine
+        event.listen(engine, "before_cursor_execute", capture)
+        try:
+            url_repository = UrlRepository(get_session)
+            await url_repository.get_url_by_hash(url.hash)
+            await url_repository.get_paginated(user.id, 2, 10)
+            await url_repository.get_page_after(user.id, 10, (now, url.id))
+            await url_repository.get_existing_hashes(["AAAAA", "BBBBB"])
+            await url_repository.delete_expired(now - timedelta(days=1), 10)
+
+            url_redirect_repository = UrlRedirectRepository(get_session)
+            await url_redirect_repository.get_redirections_by_url_id(
+                url.id, now - timedelta(days=1), now, 1, 10
+            )
+            await url_redirect_repository.resolve_and_record(url.hash, now)
+            await UrlRedirectRollupRepository(get_session).get_buckets(
+                url.id, RollupGranularity.hour, now - timedelta(days=1), now
+            )
+            await UrlVisitorSketchRepository(get_session).get_sketches(
+                url.id, now - timedelta(days=1), now
+            )
+
+            auth_repository = AuthRepository(get_session)
+            await auth_repository.get_by_token("token")
+            await auth_repository.revoke_refresh_token_by_token("token")
+            await auth_repository.revoke_tokens_by_user_id(user.id)
+            await auth_repository.delete_stale(now, 10)
+
+            user_repository = UserRepository(get_session)
+            await user_repository.get_by_email(user.email)
+            await user_repository.get_by_id(user.id)
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+        await get_session.rollback()
+
+        assert statements
+        async with get_session.bind.connect() as conn:
+            await conn.exec_driver_sql("SET enable_seqscan = off")
+            for statement, parameters in statements:
+                result = await conn.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+                plan = "\n".join(result.scalars().all())
+                assert "Seq Scan" not in plan, f"{statement}\n{plan}"
@@ -0,0 +1,79 @@
+import pytest
+
+from shorty.config import config
+from shorty.db.session import SessionManager
+from shorty.repositories.rate_limit import RateLimitRepository
+from shorty.services.rate_limit import RateLimiter
+from shorty.utils.enums import RateLimitBackend, RateLimitScope
+from shorty.utils.exceptions import BadRequestError, TooManyRequestsError
+from shorty.utils.rate_limit import GCRA
+
+
+def new_limiter(backend: RateLimitBackend) -> RateLimiter:
+    return RateLimiter(
+        SessionManager(config.postgres.get_dsn),
+        backend=backend,
+        limits={RateLimitScope.token: (0.5, 3), RateLimitScope.redirect: (0, 1)},
+        max_keys=100,
+        purge_interval=60,
+    )
+
+
+class TestGCRA:
+
+    def test_burst_then_rate(self):
+        gcra = GCRA(max_keys=10)
+        for _ in range(3):
+            assert gcra.acquire("a", 2.0, 6.0, 1, now=100.0) == 0
+        assert gcra.acquire("a", 2.0, 6.0, 1, now=100.0) == pytest.approx(2.0)
+        assert gcra.acquire("b", 2.0, 6.0, 1, now=100.0) == 0
+        assert gcra.acquire("a", 2.0, 6.0, 1, now=102.0) == 0
+        assert gcra.acquire("a", 2.0, 6.0, 1, now=102.0) == pytest.approx(2.0)
+        assert gcra.acquire("a", 2.0, 6.0, 3, now=106.0) == pytest.approx(2.0)
+
+    def test_purge(self):
+        gcra = GCRA(max_keys=2)
+        gcra.acquire("a", 1.0, 5.0, 1, now=0.0)
+        gcra.acquire("b", 1.0, 5.0, 1, now=10.0)
+        gcra.acquire("c", 1.0, 5.0, 1, now=10.0)
+        assert len(gcra) == 2
+        assert gcra.purge(now=20.0) == 2
+        assert len(gcra) == 0
+
+
+class TestRateLimiter:
+
+    async def test_memory_backend(self):
+        limiter = new_limiter(RateLimitBackend.memory)
+        for _ in range(3):
+            await limiter.check(RateLimitScope.token, "ip:1")
+        with pytest.raises(TooManyRequestsError) as e:
+            await limiter.check(RateLimitScope.token, "ip:1")
+        assert e.value.headers == {"Retry-After": "2"}
+        await limiter.check(RateLimitScope.token, "ip:2")
+        for _ in range(10):
+            await limiter.check(RateLimitScope.redirect, "ip:1")
+            await limiter.check(RateLimitScope.url_create, "ip:1")
+        stats = limiter.stats()
+        assert (stats.allowed, stats.rejected, stats.keys) == (4, 1, 2)
+
+    async def test_postgres_backend(self, get_session):
+        limiter = new_limiter(RateLimitBackend.postgres)
+        for _ in range(3):
+            await limiter.check(RateLimitScope.token, "ip:1")
+        with pytest.raises(TooManyRequestsError) as e:
+            await limiter.check(RateLimitScope.token, "ip:1")
+        assert e.value.headers["Retry-After"] in ("1", "2")
+        await limiter.check(RateLimitScope.token, "ip:2", cost=3)
+        assert limiter.stats().errors == 0
+        assert await RateLimitRepository(get_session).purge() == 0
+        assert len(await RateLimitRepository(get_session).get_all()) == 2
+
+    async def test_cost_over_burst(self):
+        limiter = new_limiter(RateLimitBackend.memory)
+        with pytest.raises(BadRequestError):
+            await limiter.check(RateLimitScope.token, "ip:1", cost=4)
+        await limiter.check(RateLimitScope.token, "ip:1", cost=3)
+        with pytest.raises(TooManyRequestsError):
+            await limiter.check(RateLimitScope.token, "ip:1")
+        assert limiter.stats().rejected == 2
@@ -0,0 +1,98 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from sqlalchemy import func, select, text
+
+from shorty.db.models.url_redirect import UrlRedirect
+from shorty.repositories.url_redirect import UrlRedirectRepository
+from shorty.services.partitions import RedirectPartitionManager
+from shorty.tests.unittests.factories import UrlFactory
+from shorty.utils.enums import PartitionInterval
+
+
+class TestRedirectPartitionManager:
+
+    async def test_ensure_partitions(self, get_session):
+        manager = RedirectPartitionManager(PartitionInterval.day, ahead=2, retention=0)
+        now = datetime(2026, 10, 18, 12, 30)
+
+        assert await manager.ensure_partitions(get_session, now) == 3
+        assert await manager.ensure_partitions(get_session, now) == 0
+        partitions = await UrlRedirectRepository(get_session).get_partitions()
+        assert [name for name, _, _ in partitions] == [
+            "url_redirect_p20261018",
+            "url_redirect_p20261019",
+            "url_redirect_p20261020",
+        ]
+
+        # a monthly partition would overlap the daily ones
+        monthly = RedirectPartitionManager(
+            PartitionInterval.month, ahead=1, retention=0
+        )
+        assert await monthly.ensure_partitions(get_session, now) == 1
+
+    async def test_drop_expired_partitions(self, get_session):
+        url = UrlFactory(hash_len=5)
+        now = datetime.now()
+        manager = RedirectPartitionManager(
+            PartitionInterval.day, ahead=1, retention=86400
+        )
+        await manager.ensure_partitions(get_session, now - timedelta(days=10))
+        await manager.ensure_partitions(get_session, now)
+        repository = UrlRedirectRepository(get_session)
+        await repository.create_many(
+            [
+                {"id": uuid4(), "url_id": url.id, "created_at": created_at}
+                for created_at in (
+                    now - timedelta(days=10),
+                    now - timedelta(days=9),
+                    now,
+                )
+            ]
+        )
+        await get_session.commit()
+
+        plan = "\n".join(
+            (
+                await get_session.execute(
+                    text(
+                        "EXPLAIN SELECT * FROM url_redirect "
+                        "WHERE created_at >= :started AND created_at < :ended"
+                    ),
+                    {"started": now - timedelta(hours=1), "ended": now},
+                )
+            ).scalars()
+        )
+        assert f"url_redirect_p{now:%Y%m%d}" in plan
+        assert "url_redirect_default" not in plan
+
+        assert await manager.drop_expired_partitions(get_session, now) == 2
+        count = await get_session.scalar(select(func.count()).select_from(UrlRedirect))
+        assert count == 1
+
+    async def test_rows_are_moved_out_of_default_partition(self, get_session):
+        url = UrlFactory(hash_len=5)
+        manager = RedirectPartitionManager(PartitionInterval.day, ahead=0, retention=0)
+        now = datetime(2026, 10, 18, 12, 30)
+        repository = UrlRedirectRepository(get_session)
+        await repository.create_many(
+            [
+                {"id": uuid4(), "url_id": url.id, "created_at": created_at}
+                for created_at in (now, now + timedelta(days=1))
+            ]
+        )
+        await get_session.commit()
+
+        assert await manager.ensure_partitions(get_session, now) == 1
+        in_default = await get_session.scalar(
+            text("SELECT count(*) FROM url_redirect_default")
+        )
+        in_partition = await get_session.scalar(
+            text("SELECT count(*) FROM url_redirect_p20261018")
+        )
+        assert (in_default, in_partition) == (1, 1)
+        # the default partition is attached again
+        count = await get_session.scalar(select(func.count()).select_from(UrlRedirect))
+        assert count == 2
+        partitions = await repository.get_partitions()
+        assert [name for name, _, _ in partitions] == ["url_redirect_p20261018"]
@@ -0,0 +1,22 @@
+from shorty.config import config
+from shorty.db.session import SessionManager
+from shorty.services.capacity import ReservationCounter
+from shorty.tests.unittests.factories import UrlFactory
+
+
+class TestReservationCounter:
+
+    async def test_get_and_increment(self, get_session):
+        UrlFactory(hash_len=5)
+        UrlFactory(hash_len=5, expired_at=None)
+        counter = ReservationCounter(
+            SessionManager(config.postgres.get_dsn), refresh_interval=60
+        )
+
+        assert await counter.get(get_session) == 2
+        counter.increment()
+        assert await counter.get(get_session) == 3
+
+        await counter.refresh(get_session)
+        assert counter.value == 2
+        assert counter.refreshed_at is not None
@@ -0,0 +1,45 @@
+import asyncio
+import threading
+
+import pytest
+
+from shorty.services.security import SecurityContext
+from shorty.utils.exceptions import UnAvailableError
+
+
+def make_context(max_workers: int = 1, max_queue_size: int = 1) -> SecurityContext:
+    return SecurityContext(
+        "argon2",
+        "secret",
+        "HS256",
+        max_workers=max_workers,
+        max_queue_size=max_queue_size,
+        time_cost=1,
+        memory_cost=1024,
+        parallelism=1,
+    )
+
+
+class TestSecurityContext:
+
+    async def test_hash_and_verify(self):
+        context = make_context()
+        hashed = await context.hash_password("password")
+        assert await context.verify_password("password", hashed)
+        assert not await context.verify_password("wrong", hashed)
+        assert "t=1" in hashed and "m=1024" in hashed
+
+    async def test_sheds_load_when_queue_is_full(self):
+        context = make_context(max_workers=1, max_queue_size=1)
+        release = threading.Event()
+        busy = [asyncio.create_task(context._run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0)
+
+        with pytest.raises(UnAvailableError):
+            await context.hash_password("password")
+        assert context.rejected == 1
+
+        release.set()
+        await asyncio.gather(*busy)
+        assert context.pending == 0
+        assert await context.hash_password("password")
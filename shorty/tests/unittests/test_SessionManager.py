@@ -0,0 +1,33 @@
+from sqlalchemy import text
+
+from shorty.config import config
+from shorty.db.session import SessionManager
+
+
+class TestSessionManager:
+
+    async def test_isolation_level(self):
+        session_manager = SessionManager(config.postgres.get_dsn)
+        async with session_manager.session(isolation_level="REPEATABLE READ") as s:
+            level = await s.scalar(text("SHOW transaction_isolation"))
+            assert level == "repeatable read"
+        async with session_manager.session() as session:
+            level = await session.scalar(text("SHOW transaction_isolation"))
+            assert level == "read committed"
+        await session_manager._engine.dispose()
+
+    async def test_pool_stats(self):
+        session_manager = SessionManager(
+            config.postgres.get_dsn, pool_size=2, max_overflow=0
+        )
+        async with session_manager.session() as session:
+            await session.execute(text("SELECT 1"))
+            stats = session_manager.pool_stats()
+            assert stats.size == 2
+            assert stats.checked_out == 1
+            assert stats.overflow == 0
+        stats = session_manager.pool_stats()
+        assert stats.checked_out == 0
+        assert stats.checkouts == 1
+        assert stats.wait_time_total >= 0
+        await session_manager._engine.dispose()
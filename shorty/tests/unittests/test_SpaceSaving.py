@@ -0,0 +1,33 @@
+import random
+
+from shorty.utils.heavy_hitters import SlidingTopK, SpaceSaving
+
+
+class TestSpaceSaving:
+
+    def test_heavy_hitters_are_kept(self):
+        rng = random.Random(0)
+        stream = [f"hot{i}" for i in range(5) for _ in range(1000)]
+        stream += [f"cold{rng.randrange(100000)}" for _ in range(20000)]
+        rng.shuffle(stream)
+
+        summary = SpaceSaving(capacity=50)
+        for key in stream:
+            summary.add(key)
+        assert len(summary.counts) == 50
+        top = sorted(summary.counts, key=summary.counts.get, reverse=True)[:5]
+        assert sorted(top) == [f"hot{i}" for i in range(5)]
+        assert all(summary.counts[key] >= 1000 for key in top)
+
+    def test_sliding_window(self):
+        tracker = SlidingTopK(window=300, slots=5, capacity=10)
+        for _ in range(3):
+            tracker.add("A", now=0)
+        tracker.add("B", now=120)
+        tracker.add("B", now=240)
+        assert tracker.top(2, now=240) == [("A", 3), ("B", 2)]
+        assert tracker.top(2, now=300) == [("B", 2)]
+
+        restored = SlidingTopK(window=300, slots=5, capacity=10)
+        restored.load(tracker.dump())
+        assert restored.top(2, now=300) == [("B", 2)]
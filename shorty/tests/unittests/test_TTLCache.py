@@ -0,0 +1,44 @@
+from freezegun import freeze_time
+
+from shorty.utils.cache import TTLCache
+
+
+class TestTTLCache:
+
+    def test_get_set(self):
+        cache = TTLCache(maxsize=2, ttl=10)
+        assert cache.get("A") is None
+        cache.set("A", 1)
+        assert cache.get("A") == 1
+        assert cache.stats().hits == 1
+        assert cache.stats().misses == 1
+
+    def test_lru_eviction(self):
+        cache = TTLCache(maxsize=2, ttl=10)
+        cache.set("A", 1)
+        cache.set("B", 2)
+        cache.get("A")
+        cache.set("C", 3)
+        assert cache.get("B") is None
+        assert cache.get("A") == 1
+        assert cache.get("C") == 3
+        assert cache.stats().evictions == 1
+
+    def test_ttl_expiration(self):
+        with freeze_time("2025-01-01 00:00:00") as frozen:
+            cache = TTLCache(maxsize=2, ttl=10)
+            cache.set("A", 1)
+            cache.set("B", 2, ttl=1)
+            frozen.tick(5)
+            assert cache.get("A") == 1
+            assert cache.get("B") is None
+            frozen.tick(6)
+            assert cache.get("A") is None
+            assert len(cache) == 0
+
+    def test_invalidate(self):
+        cache = TTLCache(maxsize=2, ttl=10)
+        cache.set("A", 1)
+        cache.invalidate("A")
+        cache.invalidate("B")
+        assert cache.get("A") is None
@@ -0,0 +1,89 @@
+import time
+import uuid
+
+from shorty.config import config
+from shorty.db.session import SessionManager
+from shorty.repositories.user import UserRepository
+from shorty.services.top_links import TopLinksTracker
+from shorty.utils.enums import TopWindow
+
+
+def new_tracker() -> TopLinksTracker:
+    return TopLinksTracker(
+        SessionManager(config.postgres.get_dsn),
+        capacity=10,
+        user_capacity=5,
+        max_users=2,
+        snapshot_interval=60,
+        result_ttl=0,
+    )
+
+
+class TestTopLinksTracker:
+
+    async def test_top(self, get_session):
+        tracker = new_tracker()
+        user_id, hot, cold = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+        now = time.time()
+        for _ in range(3):
+            tracker.record(hot, user_id)
+        tracker.record(cold, None)
+        tracker.record(cold, None, now=now - 600)
+
+        assert await tracker.top(TopWindow.five_minutes, 5) == [(hot, 3), (cold, 1)]
+        assert await tracker.top(TopWindow.hour, 5) == [(hot, 3), (cold, 2)]
+        assert await tracker.top(TopWindow.hour, 5, user_id) == [(hot, 3)]
+        assert await tracker.top(TopWindow.hour, 5, uuid.uuid4()) == []
+
+        for _ in range(3):
+            tracker.record(hot, uuid.uuid4())
+        assert tracker.stats().tracked_users == 2
+
+    async def test_snapshot_and_restore(self, get_session):
+        tracker = new_tracker()
+        url_id = uuid.uuid4()
+        for _ in range(4):
+            tracker.record(url_id, None)
+        await tracker.snapshot(released=True)
+
+        restored = new_tracker()
+        await restored.restore()
+        assert await restored.top(TopWindow.day, 1) == [(url_id, 4)]
+
+    async def test_workers_do_not_share_snapshots(self, get_session):
+        first, second = new_tracker(), new_tracker()
+        url_id = uuid.uuid4()
+        first.record(url_id, None)
+        second.record(url_id, None)
+        await first.snapshot()
+        await second.snapshot()
+        # a running worker's counters are neither overwritten nor claimed
+        await second.restore()
+        assert second.stats().tracked_urls == 1
+
+        await first.snapshot(released=True)
+        await second.snapshot(released=True)
+        restarted = [new_tracker(), new_tracker()]
+        for tracker in restarted:
+            await tracker.restore()
+        total = 0
+        for tracker in restarted:
+            total += sum(count for _, count in await tracker.top(TopWindow.day, 1))
+        assert total == 2
+
+    async def test_top_includes_other_workers(self, get_session):
+        first, second = new_tracker(), new_tracker()
+        user = await UserRepository(get_session).create(
+            {"name": "user", "email": "user@example.com", "password": "pw"}
+        )
+        user_id, url_id, other_id = user.id, uuid.uuid4(), uuid.uuid4()
+        first.record(url_id, None)
+        first.record(url_id, user_id)
+        second.record(url_id, None)
+        second.record(other_id, None, now=time.time() - 600)
+        await first.snapshot()
+
+        assert await second.top(TopWindow.hour, 5) == [(url_id, 3), (other_id, 1)]
+        assert await second.top(TopWindow.five_minutes, 5) == [(url_id, 3)]
+        assert await second.top(TopWindow.hour, 5, user_id) == [(url_id, 1)]
+        assert await first.top(TopWindow.hour, 5) == [(url_id, 2)]
@@ -0,0 +1,36 @@
+from datetime import datetime, timedelta
+from unittest import mock
+
+import pytest
+
+from shorty.config import config
+from shorty.db.schemas.url import UrlCreateSchema
+from shorty.repositories.hash_pool import HashPoolRepository
+from shorty.services.url import UrlService
+from shorty.utils.enums import HashStrategy
+
+
+class TestUrlBulkCreate:
+
+    @pytest.mark.parametrize("strategy", list(HashStrategy))
+    async def test_create_urls(self, get_session, strategy: HashStrategy):
+        await HashPoolRepository(get_session).fill(["AAAAA", "BBBBB"])
+        expiration_time = datetime.now() + timedelta(hours=1)
+        urls = [
+            UrlCreateSchema(url=f"https://ya.ru/{i}", expiration_time=expiration_time)
+            for i in range(10)
+        ]
+        urls.insert(3, UrlCreateSchema(url="https://ya.ru/", expiration_time=None))
+
+        url_service = UrlService(get_session)
+        with mock.patch.object(config.app, "hash_strategy", strategy):
+            result = await url_service.create_urls(urls, None)
+
+        assert len(result.urls) == 10
+        assert len({url.hash for url in result.urls}) == 10
+        assert [str(url.url) for url in result.urls] == [
+            f"https://ya.ru/{i}" for i in range(10)
+        ]
+        assert [error.index for error in result.errors] == [3]
+        if strategy == HashStrategy.pool:
+            assert {"AAAAA", "BBBBB"} <= {url.hash for url in result.urls}
@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+
+from shorty.db.models.url_redirect import UrlRedirect
+from shorty.db.models.url_redirect_rollup import UrlRedirectRollup
+from shorty.repositories.url_redirect import UrlRedirectRepository, _split_window
+from shorty.tests.unittests.factories import UrlFactory
+from shorty.utils.enums import RollupGranularity
+
+
+class TestUrlRedirectRepository:
+
+    async def count(self, session, model) -> int:
+        return await session.scalar(select(func.count()).select_from(model))
+
+    async def test_resolve_and_record(self, get_session):
+        url = UrlFactory(hash_len=5)
+        repo = UrlRedirectRepository(get_session)
+
+        for _ in range(2):
+            resolved = await repo.resolve_and_record(url.hash, datetime.now())
+            await get_session.commit()
+            assert resolved.id == url.id
+
+        assert await self.count(get_session, UrlRedirect) == 2
+        rollups = (await get_session.scalars(select(UrlRedirectRollup))).all()
+        assert len(rollups) == 3
+        assert all(rollup.count == 2 for rollup in rollups)
+
+    async def test_resolve_and_record_expired(self, get_session):
+        url = UrlFactory(hash_len=5, expired_at=datetime.now() - timedelta(hours=1))
+        repo = UrlRedirectRepository(get_session)
+
+        resolved = await repo.resolve_and_record(url.hash, datetime.now())
+        assert resolved.id == url.id
+        assert await repo.resolve_and_record("ZZZZZ", datetime.now()) is None
+        assert await self.count(get_session, UrlRedirect) == 0
+        assert await self.count(get_session, UrlRedirectRollup) == 0
+
+    async def test_count_redirections(self, get_session):
+        url = UrlFactory(hash_len=5)
+        repo = UrlRedirectRepository(get_session)
+        base = datetime(2026, 1, 1)
+        clicks = [
+            base + timedelta(days=day, hours=hour, minutes=minute, seconds=second)
+            for day in (0, 1, 2)
+            for hour in (0, 5, 23)
+            for minute in (0, 30, 59)
+            for second in (0, 45)
+        ]
+        for click in clicks:
+            await repo.resolve_and_record(url.hash, click)
+        await get_session.commit()
+
+        windows = [
+            (base, base + timedelta(days=3)),
+            (base + timedelta(minutes=30), base + timedelta(days=2, hours=5)),
+            (base + timedelta(seconds=10), base + timedelta(days=1, seconds=45)),
+            (base + timedelta(hours=5, minutes=59), base + timedelta(hours=6)),
+            (base + timedelta(days=1), base),
+        ]
+        for started_at, ended_at in windows:
+            expected = sum(started_at <= click <= ended_at for click in clicks)
+            count = await repo.count_redirections(url.id, started_at, ended_at)
+            assert count == expected, (started_at, ended_at)
+
+    def test_split_window(self):
+        start = datetime(2026, 1, 1, 22, 59, 30)
+        buckets, edges = _split_window(start, datetime(2026, 1, 3, 1, 2, 15))
+        assert buckets == [
+            (RollupGranularity.hour, datetime(2026, 1, 1, 23), datetime(2026, 1, 2)),
+            (RollupGranularity.day, datetime(2026, 1, 2), datetime(2026, 1, 3)),
+            (RollupGranularity.hour, datetime(2026, 1, 3), datetime(2026, 1, 3, 1)),
+            (
+                RollupGranularity.minute,
+                datetime(2026, 1, 3, 1),
+                datetime(2026, 1, 3, 1, 2),
+            ),
+        ]
+        assert edges == [
+            (start, datetime(2026, 1, 1, 23)),
+            (datetime(2026, 1, 3, 1, 2), datetime(2026, 1, 3, 1, 2, 15)),
+        ]
@@ -0,0 +1,84 @@
+import csv
+import gzip
+import json
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from shorty.config import config
+from shorty.db.schemas.url_redirect import UrlRedirectRequestSchema
+from shorty.db.schemas.user import UserCreateSchema
+from shorty.db.session import session_manager
+from shorty.repositories.url_redirect import UrlRedirectRepository
+from shorty.services.url_redirect import UrlRedirectService
+from shorty.services.user import UserService
+from shorty.tests.unittests.factories import UrlFactory
+from shorty.utils.enums import ExportFormat
+from shorty.utils.exceptions import NotFoundError
+
+
+class TestUrlRedirectService:
+
+    @pytest.fixture
+    async def redirects(self, get_session, monkeypatch):
+        monkeypatch.setattr(config.app, "export_batch_size", 3)
+        user = await UserService(get_session).create_user(
+            UserCreateSchema(name="user", email="user@example.com", password="pw")
+        )
+        url = UrlFactory(hash_len=5, user_id=user.id)
+        now = datetime.now()
+        await UrlRedirectRepository(get_session).create_many(
+            [
+                {
+                    "id": uuid.uuid4(),
+                    "url_id": url.id,
+                    "created_at": now - timedelta(minutes=i),
+                    "updated_at": now,
+                }
+                for i in range(10)
+            ]
+        )
+        await get_session.commit()
+        yield url
+        await session_manager._engine.dispose()
+
+    def window(self, minutes: int) -> UrlRedirectRequestSchema:
+        now = datetime.now()
+        return UrlRedirectRequestSchema(
+            started_at=now - timedelta(minutes=minutes, seconds=30), ended_at=now
+        )
+
+    async def collect(self, chunks) -> bytes:
+        return b"".join([chunk async for chunk in chunks])
+
+    async def test_export_ndjson(self, get_session, redirects):
+        chunks = await UrlRedirectService(get_session).export_redirects(
+            self.window(4), ExportFormat.ndjson, url_id=redirects.id
+        )
+        rows = [json.loads(line) for line in (await self.collect(chunks)).splitlines()]
+        assert len(rows) == 5
+        assert all(row["url_id"] == str(redirects.id) for row in rows)
+        assert rows == sorted(rows, key=lambda row: row["created_at"])
+
+    async def test_export_csv_gzip_by_user(self, get_session, redirects):
+        chunks = await UrlRedirectService(get_session).export_redirects(
+            self.window(60), ExportFormat.csv, compress=True, user_id=redirects.user_id
+        )
+        body = gzip.decompress(await self.collect(chunks)).decode()
+        rows = list(csv.reader(body.splitlines()))
+        assert rows[0] == [
+            "id",
+            "url_id",
+            "created_at",
+            "country",
+            "user_agent_family",
+            "referrer_domain",
+        ]
+        assert len(rows) == 11
+
+    async def test_export_unknown_url(self, get_session):
+        with pytest.raises(NotFoundError):
+            await UrlRedirectService(get_session).export_redirects(
+                self.window(1), ExportFormat.csv, url_id=uuid.uuid4()
+            )
@@ -5,6 +5,8 @@ import pytest
 
 from shorty.db.models.url import Url
 from shorty.repositories.url import UrlRepository
+from shorty.repositories.user import UserRepository
+from shorty.services.url import UrlService
 
 
 class TestUrlRepository:
@@ -30,3 +32,34 @@ class TestUrlRepository:
         assert isinstance(res.id, UUID)
         assert res.created_at <= datetime.now()
         assert res.updated_at <= datetime.now()
+
+    async def test_keyset_pagination(self, get_session):
+        user = await UserRepository(get_session).create(
+            {"name": "user", "email": "user@example.com", "password": "pw"}
+        )
+        repo = UrlRepository(get_session)
+        updated_at = datetime.now()
+        for index in range(7):
+            await repo.create(
+                {
+                    "url": "https://ya.ru/",
+                    "hash": f"AAAA{chr(65 + index)}",
+                    "user_id": user.id,
+                    "updated_at": updated_at - timedelta(seconds=index // 2),
+                }
+            )
+        url_service = UrlService(get_session)
+
+        page = await url_service.get_paginated_urls_by_user(user.id, 1, 3)
+        assert page.total_count == 7
+        seen = [url.id for url in page.urls]
+        while page.next_cursor:
+            page = await url_service.get_urls_by_user_after(
+                user.id, page.next_cursor, 3
+            )
+            assert page.total_count is None
+            seen += [url.id for url in page.urls]
+
+        expected = await repo.get_page_after(user.id, 10)
+        assert seen == [url.id for url in expected]
+        assert len(set(seen)) == 7
@@ -0,0 +1,58 @@
+import math
+from hashlib import blake2b
+
+_MASK64 = (1 << 64) - 1
+
+
+class BloomFilter:
+    """Bloom filter over strings sized for `capacity` items at `fp_rate`.
+
+    Membership answers are either "definitely not added" or "probably added",
+    the false positive rate grows past `fp_rate` once more than `capacity`
+    items are added. Items cannot be removed, rebuild the filter instead.
+    """
+
+    def __init__(self, capacity: int, fp_rate: float):
+        if not 0 < fp_rate < 1:
+            raise ValueError(f"fp_rate must be within (0, 1), got: {fp_rate}")
+        self.capacity = max(capacity, 1)
+        self.fp_rate = fp_rate
+        self.size = math.ceil(-self.capacity * math.log(fp_rate) / math.log(2) ** 2)
+        self.hash_count = max(1, round(self.size / self.capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self.items = 0
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self._bits)
+
+    def _positions(self, item: str) -> list[int]:
+        # double hashing: k positions out of a single 128 bit digest
+        digest = int.from_bytes(blake2b(item.encode(), digest_size=16).digest())
+        first, second = digest & _MASK64, (digest >> 64) | 1
+        size = self.size
+        return [(first + i * second) % size for i in range(self.hash_count)]
+
+    def add(self, item: str) -> bool:
+        bits = self._bits
+        added = False
+        for position in self._positions(item):
+            mask = 1 << (position & 7)
+            if not bits[position >> 3] & mask:
+                bits[position >> 3] |= mask
+                added = True
+        # an item whose bits were all set already is not counted again
+        self.items += added
+        return added
+
+    def __contains__(self, item: str) -> bool:
+        bits = self._bits
+        for position in self._positions(item):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    def estimated_fp_rate(self) -> float:
+        return (
+            1 - math.exp(-self.hash_count * self.items / self.size)
+        ) ** self.hash_count
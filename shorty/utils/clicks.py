@@ -0,0 +1,44 @@
+import hashlib
+import re
+from urllib.parse import urlsplit
+
+# order matters: most browsers also announce the engines they are compatible with
+_USER_AGENT_FAMILIES = (
+    ("bot", re.compile(r"bot|crawl|spider|slurp|preview", re.IGNORECASE)),
+    ("curl", re.compile(r"^curl/")),
+    ("python", re.compile(r"python-requests|aiohttp|httpx|urllib")),
+    ("edge", re.compile(r"Edg(e|A|iOS)?/")),
+    ("opera", re.compile(r"OPR/|Opera")),
+    ("samsung", re.compile(r"SamsungBrowser/")),
+    ("yandex", re.compile(r"YaBrowser/")),
+    ("firefox", re.compile(r"Firefox/|FxiOS/")),
+    ("chrome", re.compile(r"Chrome/|CriOS/")),
+    ("safari", re.compile(r"Safari/")),
+)
+
+
+def parse_user_agent_family(user_agent: str | None) -> str | None:
+    if not user_agent:
+        return None
+    for family, pattern in _USER_AGENT_FAMILIES:
+        if pattern.search(user_agent):
+            return family
+    return "other"
+
+
+def parse_referrer_domain(referrer: str | None) -> str | None:
+    if not referrer:
+        return None
+    try:
+        host = urlsplit(referrer).hostname
+    except ValueError:
+        return None
+    if not host:
+        return None
+    return host.removeprefix("www.")[:255]
+
+
+def hash_ip(ip: str, key: bytes) -> int:
+    # keyed so that stored hashes cannot be reversed by enumerating addresses
+    digest = hashlib.blake2b(ip.encode(), key=key, digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
@@ -0,0 +1,21 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from uuid import UUID
+
+from shorty.utils.exceptions import BadRequestError
+
+
+def encode_cursor(updated_at: datetime, id: UUID) -> str:
+    raw = json.dumps([updated_at.isoformat(), str(id)]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        updated_at, id = json.loads(raw)
+        return datetime.fromisoformat(updated_at), UUID(id)
+    except (binascii.Error, TypeError, ValueError):
+        raise BadRequestError(f"invalid cursor: {cursor}")
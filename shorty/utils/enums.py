@@ -1,6 +1,91 @@
+from datetime import datetime, timedelta
 from enum import StrEnum
 
 
 class TokenType(StrEnum):
     access = "access"
     refresh = "refresh"
+
+
+class HashStrategy(StrEnum):
+    random = "random"
+    pool = "pool"
+    counter = "counter"
+
+
+class RollupGranularity(StrEnum):
+    minute = "minute"
+    hour = "hour"
+    day = "day"
+
+    @property
+    def interval(self) -> timedelta:
+        return timedelta(**{f"{self.value}s": 1})
+
+    def truncate(self, value: datetime) -> datetime:
+        value = value.replace(second=0, microsecond=0)
+        if self is RollupGranularity.minute:
+            return value
+        value = value.replace(minute=0)
+        if self is RollupGranularity.hour:
+            return value
+        return value.replace(hour=0)
+
+
+class PartitionInterval(StrEnum):
+    day = "day"
+    month = "month"
+
+    def truncate(self, value: datetime) -> datetime:
+        value = value.replace(hour=0, minute=0, second=0, microsecond=0)
+        if self is PartitionInterval.day:
+            return value
+        return value.replace(day=1)
+
+    def next(self, value: datetime) -> datetime:
+        value = self.truncate(value)
+        if self is PartitionInterval.day:
+            return value + timedelta(days=1)
+        return (value + timedelta(days=32)).replace(day=1)
+
+    def suffix(self, value: datetime) -> str:
+        if self is PartitionInterval.day:
+            return value.strftime("%Y%m%d")
+        return value.strftime("%Y%m")
+
+
+class ExportFormat(StrEnum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+    @property
+    def media_type(self) -> str:
+        if self is ExportFormat.ndjson:
+            return "application/x-ndjson"
+        return "text/csv"
+
+
+class TopWindow(StrEnum):
+    five_minutes = "5m"
+    hour = "1h"
+    day = "24h"
+
+    @property
+    def seconds(self) -> int:
+        return {"5m": 300, "1h": 3600, "24h": 86400}[self.value]
+
+    @property
+    def slots(self) -> int:
+        # 1 minute, 5 minute and 1 hour slots
+        return {"5m": 5, "1h": 12, "24h": 24}[self.value]
+
+
+class RateLimitBackend(StrEnum):
+    memory = "memory"
+    postgres = "postgres"
+
+
+class RateLimitScope(StrEnum):
+    url_create = "url_create"
+    token = "token"
+    redirect = "redirect"
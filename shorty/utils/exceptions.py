@@ -56,3 +56,17 @@ class InsufficientStorage(BaseAPIException):
 class UnauthorizedError(BaseAPIException):
     status_code = status.HTTP_401_UNAUTHORIZED
     error = "unauthorized"
+
+
+class ForbiddenError(BaseAPIException):
+    status_code = status.HTTP_403_FORBIDDEN
+    error = "forbidden"
+
+
+class TooManyRequestsError(BaseAPIException):
+    status_code = status.HTTP_429_TOO_MANY_REQUESTS
+    error = "too many requests"
+
+    def __init__(self, detail: str, retry_after: int) -> None:
+        super().__init__(detail)
+        self.headers = {"Retry-After": str(retry_after)}
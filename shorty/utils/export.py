@@ -0,0 +1,50 @@
+import csv
+import io
+import json
+import zlib
+from typing import AsyncIterable, AsyncIterator, Sequence
+
+from shorty.utils.enums import ExportFormat
+
+_GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+
+def _to_text(value) -> str | None:
+    if value is None:
+        return None
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+async def encode_rows(
+    batches: AsyncIterable[Sequence[Sequence]],
+    columns: Sequence[str],
+    format: ExportFormat,
+) -> AsyncIterator[bytes]:
+    # one chunk per batch keeps memory bounded by the batch size
+    if format is ExportFormat.csv:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(columns)
+        yield buffer.getvalue().encode()
+        async for batch in batches:
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows([_to_text(value) for value in row] for row in batch)
+            yield buffer.getvalue().encode()
+        return
+
+    async for batch in batches:
+        yield "".join(
+            json.dumps(dict(zip(columns, map(_to_text, row)))) + "\n" for row in batch
+        ).encode()
+
+
+async def gzip_chunks(chunks: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+    compressor = zlib.compressobj(wbits=_GZIP_WBITS)
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
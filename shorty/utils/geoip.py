@@ -0,0 +1,97 @@
+import csv
+import ipaddress
+from bisect import bisect_right
+from pathlib import Path
+
+
+class GeoIPDatabase:
+    """Offline ip to country lookup over a `network,country` CSV file.
+
+    Networks are kept as sorted integer ranges per ip version and looked up
+    with a binary search, so a lookup does no I/O and no allocations beyond
+    parsing the address.
+    """
+
+    def __init__(self, networks: list[tuple[str, str]]):
+        ranges = {4: [], 6: []}
+        # rows with a malformed network are skipped and counted
+        self.skipped = 0
+        for network, country in networks:
+            try:
+                network = ipaddress.ip_network(network, strict=False)
+            except ValueError:
+                self.skipped += 1
+                continue
+            ranges[network.version].append(
+                (
+                    int(network.network_address),
+                    int(network.broadcast_address),
+                    country.upper()[:2],
+                )
+            )
+        self._starts = {}
+        self._ranges = {}
+        for version, items in ranges.items():
+            items = self._flatten(items)
+            self._starts[version] = [start for start, _, _ in items]
+            self._ranges[version] = items
+
+    @staticmethod
+    def _flatten(
+        items: list[tuple[int, int, str]],
+    ) -> list[tuple[int, int, str]]:
+        # networks are either nested or disjoint: split the enclosing ones
+        # around the networks they contain, the most specific network wins
+        flat = []
+        enclosing = []
+        position = 0
+
+        def emit(start: int, end: int, country: str) -> None:
+            if start <= end:
+                flat.append((start, end, country))
+
+        for start, end, country in sorted(items, key=lambda item: (item[0], -item[1])):
+            while enclosing and enclosing[-1][1] < start:
+                _, outer_end, outer_country = enclosing.pop()
+                emit(position, outer_end, outer_country)
+                position = outer_end + 1
+            if enclosing:
+                emit(position, start - 1, enclosing[-1][2])
+            enclosing.append((start, end, country))
+            position = start
+        while enclosing:
+            _, outer_end, outer_country = enclosing.pop()
+            emit(position, outer_end, outer_country)
+            position = outer_end + 1
+        return flat
+
+    def __len__(self) -> int:
+        return sum(len(items) for items in self._ranges.values())
+
+    @classmethod
+    def from_csv(cls, path: str | Path) -> "GeoIPDatabase":
+        with open(path, newline="") as file:
+            rows = [
+                (row[0], row[1])
+                for row in csv.reader(file)
+                if len(row) >= 2 and not row[0].startswith("#")
+            ]
+        if rows and rows[0][0] == "network":
+            rows = rows[1:]
+        return cls(rows)
+
+    def lookup(self, ip: str) -> str | None:
+        try:
+            address = ipaddress.ip_address(ip)
+        except ValueError:
+            return None
+        if address.version == 6 and address.ipv4_mapped:
+            address = address.ipv4_mapped
+        value = int(address)
+        index = bisect_right(self._starts[address.version], value) - 1
+        if index < 0:
+            return None
+        _, end, country = self._ranges[address.version][index]
+        if value > end:
+            return None
+        return country
@@ -0,0 +1,100 @@
+from collections import Counter
+from heapq import heapify, heappop, heappush
+from typing import Generic, Hashable, Iterable, TypeVar
+
+Key = TypeVar("Key", bound=Hashable)
+
+
+class SpaceSaving(Generic[Key]):
+    """Space-Saving heavy hitter summary with at most `capacity` counters.
+
+    When a new key arrives and the summary is full it takes over the counter
+    of the smallest key, so counts are overestimated by at most that minimum
+    and any key with a true count above it is guaranteed to be tracked.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.counts: dict[Key, int] = {}
+        # min-heap over the counters, entries go stale when a count grows and
+        # are refreshed lazily while looking for the minimum
+        self._heap: list[tuple[int, Key]] | None = None
+
+    def add(self, key: Key, count: int = 1) -> None:
+        counts = self.counts
+        if key in counts:
+            counts[key] += count
+            return
+        if len(counts) < self.capacity:
+            counts[key] = count
+            return
+        evicted, minimum = self._pop_min()
+        del counts[evicted]
+        counts[key] = minimum + count
+        heappush(self._heap, (counts[key], key))
+
+    def _pop_min(self) -> tuple[Key, int]:
+        if self._heap is None or len(self._heap) > 2 * self.capacity:
+            self._heap = [(count, key) for key, count in self.counts.items()]
+            heapify(self._heap)
+        while True:
+            count, key = heappop(self._heap)
+            current = self.counts.get(key)
+            if current == count:
+                return key, count
+            if current is not None:
+                heappush(self._heap, (current, key))
+
+
+class SlidingTopK(Generic[Key]):
+    """Heavy hitters over a sliding window of `slots` Space-Saving summaries.
+
+    Time is split in slots of `window / slots` seconds, a query sums the
+    summaries of the slots that are still inside the window, together with
+    the `dump`s of other trackers given as `others`.
+    """
+
+    def __init__(self, window: float, slots: int, capacity: int):
+        self.window = window
+        self.slots = slots
+        self.slot_size = window / slots
+        self.capacity = capacity
+        self._summaries: dict[int, SpaceSaving[Key]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(summary.counts) for summary in self._summaries.values())
+
+    def _expire(self, slot: int) -> None:
+        for expired in [s for s in self._summaries if s <= slot - self.slots]:
+            del self._summaries[expired]
+
+    def add(self, key: Key, now: float, count: int = 1) -> None:
+        slot = int(now // self.slot_size)
+        summary = self._summaries.get(slot)
+        if summary is None:
+            self._expire(slot)
+            summary = self._summaries[slot] = SpaceSaving(self.capacity)
+        summary.add(key, count)
+
+    def top(
+        self, k: int, now: float, others: Iterable[dict[int, dict[Key, int]]] = ()
+    ) -> list[tuple[Key, int]]:
+        slot = int(now // self.slot_size)
+        self._expire(slot)
+        total = Counter()
+        for summary in self._summaries.values():
+            total.update(summary.counts)
+        for other in others:
+            for other_slot, counts in other.items():
+                if other_slot > slot - self.slots:
+                    total.update(counts)
+        return total.most_common(k)
+
+    def dump(self) -> dict[int, dict[Key, int]]:
+        return {slot: dict(summary.counts) for slot, summary in self._summaries.items()}
+
+    def load(self, data: dict[int, dict[Key, int]]) -> None:
+        for slot, counts in data.items():
+            summary = self._summaries.setdefault(slot, SpaceSaving(self.capacity))
+            for key, count in counts.items():
+                summary.add(key, count)
@@ -0,0 +1,46 @@
+from typing import Generic, Hashable, TypeVar
+
+Key = TypeVar("Key", bound=Hashable)
+
+
+class GCRA(Generic[Key]):
+    """Generic cell rate algorithm state of many clients, one float each.
+
+    A limit is given as the `interval` between two requests at the sustained
+    rate and a `tolerance` of `burst * interval`. Each key only stores its
+    theoretical arrival time (tat), a key whose tat has passed is the same as
+    an unknown key, so at most `max_keys` keys are kept and stale ones are
+    dropped when it is reached.
+    """
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._tats: dict[Key, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._tats)
+
+    def acquire(
+        self, key: Key, interval: float, tolerance: float, cost: int, now: float
+    ) -> float:
+        """Returns 0 when allowed, otherwise the seconds to wait."""
+        tats = self._tats
+        tat = tats.get(key, now)
+        if tat < now:
+            tat = now
+        tat += cost * interval
+        wait = tat - now - tolerance
+        if wait > 0:
+            return wait
+        if len(tats) >= self.max_keys and key not in tats:
+            self.purge(now)
+        self._tats[key] = tat
+        return 0.0
+
+    def purge(self, now: float) -> int:
+        size = len(self._tats)
+        self._tats = {key: tat for key, tat in self._tats.items() if tat > now}
+        if len(self._tats) >= self.max_keys:
+            # every key is busy, forgetting them only lets some requests through
+            self._tats.clear()
+        return size - len(self._tats)
@@ -0,0 +1,16 @@
+import asyncio
+import logging
+
+from shorty.services.reaper import expiry_reaper
+
+logger = logging.getLogger(__name__)
+
+
+async def main() -> None:
+    logger.info("starting expiry reaper")
+    await expiry_reaper.run_forever()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())